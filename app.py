@@ -1,16 +1,165 @@
-from datetime import datetime
-from functools import wraps
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from functools import lru_cache, wraps
+import csv
+import gzip
+import hashlib
+import heapq
+import io
+import json
 import os
+import queue
 import re
 import sqlite3
+import sys
+import threading
+import time
+import zlib
 
-from flask import Flask, flash, g, redirect, render_template_string, request, session, url_for
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+import click
+from flask import (
+    Flask,
+    Response,
+    abort,
+    before_render_template,
+    flash,
+    g,
+    has_app_context,
+    has_request_context,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    session,
+    template_rendered,
+    url_for,
+)
+from jinja2 import DictLoader
+from markupsafe import Markup
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.security import check_password_hash, generate_password_hash
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "dev-secret-change-me")
-app.config["DATABASE"] = os.path.join(app.root_path, "hostel_complaints.db")
+app.config["DATABASE"] = os.environ.get(
+    "HOSTEL_DATABASE", os.path.join(app.root_path, "hostel_complaints.db")
+)
+# Connection pool: max open connections, seconds to wait for a free one, and
+# how long a connection may sit idle before it is pinged on checkout.
+app.config["DB_POOL_SIZE"] = 8
+app.config["DB_POOL_TIMEOUT"] = 10.0
+app.config["DB_POOL_HEALTHCHECK_INTERVAL"] = 30.0
+app.config["DB_BUSY_TIMEOUT_MS"] = 5000
+app.config["DB_CACHE_SIZE_KIB"] = 16384
+app.config["DB_MMAP_SIZE"] = 256 * 1024 * 1024
+# sqlite3.Connection subclass used for pooled connections. None picks
+# InstrumentedConnection when instrumentation is on, sqlite3.Connection otherwise.
+app.config["DB_CONNECTION_FACTORY"] = None
+# Live status stream: open streams allowed per process, events buffered per
+# subscriber before it is told to resync, and seconds between keepalives.
+# gunicorn.conf.py lowers the stream limit below the threads per worker.
+app.config["SSE_MAX_SUBSCRIBERS"] = int(os.environ.get("HOSTEL_SSE_MAX_STREAMS", "5000"))
+app.config["SSE_QUEUE_LIMIT"] = 100
+app.config["SSE_KEEPALIVE_SECONDS"] = 25.0
+# Seconds between the dashboards' checks for changes. Pages poll a change
+# version instead of opening a stream, so no worker thread is held between
+# checks and changes made through any worker are seen.
+app.config["LIVE_POLL_SECONDS"] = 30.0
+# Optional group commit for submissions: one writer thread commits up to
+# MAX_BATCH queued complaints at a time, waiting at most MAX_DELAY_MS for a
+# batch to fill. Requests are only acknowledged after their batch commits.
+app.config["GROUP_COMMIT_ENABLED"] = os.environ.get("GROUP_COMMIT_ENABLED") == "1"
+app.config["GROUP_COMMIT_MAX_BATCH"] = 200
+app.config["GROUP_COMMIT_MAX_DELAY_MS"] = 5
+app.config["GROUP_COMMIT_SYNCHRONOUS"] = "FULL"
+app.config["GROUP_COMMIT_TIMEOUT"] = 10.0
+# Opt-in request instrumentation: per-route timing histograms on /metrics,
+# EXPLAIN QUERY PLAN capture for statements slower than SLOW_QUERY_MS, and
+# sampled stacks (collapsed/flamegraph format) written to PROFILE_DIR for
+# requests slower than PROFILE_THRESHOLD_MS.
+app.config["INSTRUMENTATION_ENABLED"] = os.environ.get("INSTRUMENTATION_ENABLED") == "1"
+app.config["SLOW_QUERY_MS"] = 50.0
+app.config["SLOW_QUERY_LOG_SIZE"] = 100
+app.config["PROFILE_THRESHOLD_MS"] = 500.0
+app.config["PROFILE_INTERVAL_MS"] = 5.0
+app.config["PROFILE_DIR"] = os.path.join(app.instance_path, "profiles")
+# Admin login/register throttling: token buckets per client IP and per
+# username (BURST attempts, refilled at PER_MINUTE), checked before any
+# password hashing. At most LIMITER_MAX_KEYS buckets are kept per limiter.
+app.config["ADMIN_AUTH_IP_BURST"] = 10
+app.config["ADMIN_AUTH_IP_PER_MINUTE"] = 10
+app.config["ADMIN_AUTH_USER_BURST"] = 5
+app.config["ADMIN_AUTH_USER_PER_MINUTE"] = 5
+app.config["ADMIN_AUTH_LIMITER_MAX_KEYS"] = 10000
+# Reverse proxies in front of the app whose X-Forwarded-For/-Proto entries are
+# trusted. Behind a proxy remote_addr is the proxy's address, so the per-IP
+# bucket above would be shared by every client; 0 trusts no header, since a
+# client talking to the app directly could forge it.
+app.config["PROXY_FIX_X_FOR"] = int(os.environ.get("HOSTEL_PROXY_HOPS", "0"))
+# werkzeug hash method for admin passwords, with its parameters spelled out.
+# Stored hashes made with other parameters are upgraded on the next login.
+# Hashing runs on at most HASH_WORKERS threads; QUEUE_LIMIT more may wait.
+app.config["PASSWORD_HASH_METHOD"] = "scrypt:32768:8:1"
+app.config["PASSWORD_HASH_WORKERS"] = 2
+app.config["PASSWORD_HASH_QUEUE_LIMIT"] = 16
+app.config["PASSWORD_HASH_TIMEOUT"] = 10.0
+# Complaint export: rows fetched from the cursor per chunk, and the response
+# size past which an export is gzip-compressed for clients that accept it.
+app.config["EXPORT_BATCH_ROWS"] = 1000
+app.config["EXPORT_GZIP_MIN_BYTES"] = 64 * 1024
+# CSV import: rows staged per transaction (each batch is a resume point).
+app.config["IMPORT_BATCH_ROWS"] = 5000
+# Response compression: bodies smaller than MIN_BYTES are sent as they are.
+# The levels apply to per-request compression; bodies computed once (static
+# pages, the stylesheet) always use the strongest settings.
+app.config["COMPRESS_MIN_BYTES"] = 1024
+app.config["COMPRESS_GZIP_LEVEL"] = 6
+app.config["COMPRESS_BROTLI_QUALITY"] = 5
+# Archival: Resolved complaints resolved more than AFTER_DAYS ago move to the
+# archive tables, BATCH_ROWS per transaction with BATCH_PAUSE seconds between
+# batches so submissions and updates are never locked out for long.
+app.config["ARCHIVE_AFTER_DAYS"] = 365
+app.config["ARCHIVE_BATCH_ROWS"] = 500
+app.config["ARCHIVE_BATCH_PAUSE"] = 0.05
+# Student history cache: each student's rendered history table, reused until
+# their change version moves. BACKEND is "memory" (per process), "file" (a
+# SQLite file at PATH, default beside the database, shared by all workers on
+# the host) or "none". MAX_BYTES caps the cached HTML, evicting least
+# recently used students first.
+app.config["HISTORY_CACHE_BACKEND"] = os.environ.get("HOSTEL_HISTORY_CACHE", "memory")
+app.config["HISTORY_CACHE_PATH"] = os.environ.get("HOSTEL_HISTORY_CACHE_PATH")
+app.config["HISTORY_CACHE_MAX_BYTES"] = 32 * 1024 * 1024
+# Reference data (categories, blocks, rooms, staff) is read from an in-memory
+# snapshot. A process that changes it reloads at once; other worker processes
+# check the stored version at most every REFRESH_SECONDS.
+app.config["REFERENCE_REFRESH_SECONDS"] = 5.0
+# Automatic staff assignment (see AssignmentEngine). New complaints go to the
+# least-loaded on-duty staff member with their category's skill, preferring
+# one based in the complaint's block unless they have OTHER_BLOCK_LOAD more
+# open complaints. Staff with MAX_OPEN open complaints get no more until one
+# is resolved. The engine runs in one process per database and checks for
+# changes every POLL_SECONDS (at once for submissions in its own process).
+app.config["AUTO_ASSIGN_ENABLED"] = os.environ.get("AUTO_ASSIGN_ENABLED") == "1"
+app.config["AUTO_ASSIGN_MAX_OPEN"] = 5
+app.config["AUTO_ASSIGN_OTHER_BLOCK_LOAD"] = 2
+app.config["AUTO_ASSIGN_POLL_SECONDS"] = 1.0
+app.config["AUTO_ASSIGN_BATCH_ROWS"] = 1000
 
+# The categories a new database starts with; admins add and retire categories
+# on the Reference Data page.
 ALLOWED_CATEGORIES = [
     "Electrical Fault",
     "Room Related",
@@ -19,9 +168,87 @@ ALLOWED_CATEGORIES = [
     "Bathroom",
 ]
 ALLOWED_STATUSES = ["Pending", "In Progress", "Resolved"]
+ACTIVE_STATUSES = ["Pending", "In Progress"]
 ALLOWED_PRIORITIES = ["Low", "Medium", "High"]
+STATUS_RANKS = {"Pending": 1, "In Progress": 2, "Resolved": 3}
+PRIORITY_RANKS = {"High": 1, "Medium": 2, "Low": 3}
+# complaints stores category, status and priority as small integer codes: the
+# 1-based position in the ALLOWED_* list, so those lists are append-only. The
+# lookup tables named here hold the same codes (plus any legacy values the
+# migration met, and categories added by admins) for SQL that needs the
+# labels back.
+CATEGORY_CODES = {category: code for code, category in enumerate(ALLOWED_CATEGORIES, 1)}
+STATUS_CODES = {status: code for code, status in enumerate(ALLOWED_STATUSES, 1)}
+PRIORITY_CODES = {priority: code for code, priority in enumerate(ALLOWED_PRIORITIES, 1)}
+CODED_COLUMNS = {
+    "category": ("complaint_categories", CATEGORY_CODES),
+    "status": ("complaint_statuses", STATUS_CODES),
+    "priority": ("complaint_priorities", PRIORITY_CODES),
+}
+# complaints.staff_assigned holds a staff id. With the coded columns, these
+# are the columns stored as keys of a table that has the name.
+LABELLED_COLUMNS = {column: (table, "code") for column, (table, _) in CODED_COLUMNS.items()}
+LABELLED_COLUMNS["staff_assigned"] = ("staff", "id")
+# complaints timestamps are stored as integer Unix seconds and shown in local time.
+TIMESTAMP_COLUMNS = ["created_at", "updated_at", "resolved_at"]
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# The admin list is ordered by (status rank, priority rank, id DESC). That
+# ordering is folded into one stored integer so a page is a single index range.
+SORT_KEY_ID_SPAN = 1 << 40
+PAGE_SIZE_OPTIONS = [25, 50, 100]
+DEFAULT_PAGE_SIZE = 50
+# Columns shown to students and admins; roll_number is deliberately absent.
+COMPLAINT_COLUMNS = [
+    "id",
+    "hostel_block",
+    "room_number",
+    "category",
+    "priority",
+    "description",
+    "status",
+    "staff_assigned",
+    "remarks",
+    "created_at",
+    "updated_at",
+]
+EXPORT_FORMATS = {"csv": "text/csv", "jsonl": "application/x-ndjson"}
+UPDATABLE_FIELDS = ["status", "priority", "staff_assigned", "remarks"]
+SEARCH_MAX_LENGTH = 100
+BULK_UPDATE_MAX_ROWS = 1000
+# complaint_rollups bucket widths: the prefix length of the local time as text
+ROLLUP_GRANULARITIES = {"hour": 13, "day": 10}
+ANALYTICS_DEFAULT_DAYS = {"hour": 2, "day": 30}
+ANALYTICS_MAX_DAYS = {"hour": 31, "day": 3660}
+# Backlog age bands: (upper bound in days, label); None is unbounded.
+BACKLOG_AGE_BANDS = [
+    (1, "Under 1 day"),
+    (3, "1-3 days"),
+    (7, "3-7 days"),
+    (30, "1-4 weeks"),
+    (None, "Over 4 weeks"),
+]
+# Archived complaints are grouped by the term they were filed in; terms start
+# in these months, and each has its own complaints_archive_<year>_<month> table.
+ARCHIVE_TERM_START_MONTHS = [1, 7]
 MAX_ACTIVE_COMPLAINTS = 5
+# complaint columns with a materialized per-value row count in complaint_counters
+COUNTER_DIMENSIONS = ["status", "category", "priority", "hostel_block"]
+# Admin-managed tables read through the reference snapshot.
+REFERENCE_TABLES = ["complaint_categories", "hostel_blocks", "hostel_rooms", "staff", "staff_skills"]
 MAX_DESCRIPTION_LENGTH = 500
+# Reference data: longest category, block, room or staff name, and most rooms
+# added by one "101-140" style range.
+REFERENCE_NAME_MAX_LENGTH = 30
+MAX_ROOMS_PER_RANGE = 500
+# The skill each starting category needs for automatic assignment; admins
+# change them, and set skills for new categories, on the Reference Data page.
+DEFAULT_CATEGORY_SKILLS = {
+    "Electrical Fault": "Electrical",
+    "Room Related": "Maintenance",
+    "Food": "Mess",
+    "Water": "Plumbing",
+    "Bathroom": "Plumbing",
+}
 COLLEGE_NAME = "Tagore Engineering College"
 COLLEGE_SYSTEM_NAME = "Hostel Complaint Management System"
 COLLEGE_LOGO_URL = "https://tagore-engg.ac.in/images/tagore-logo.png"
@@ -72,6 +299,7 @@ input, select, textarea {
   font: inherit;
 }
 textarea { min-height: 90px; resize: vertical; }
+input[type="checkbox"] { width: auto; margin: 0; }
 button, .btn {
   display: inline-block;
   background: var(--primary);
@@ -174,6 +402,13 @@ th { background: #eef3fb; }
 .priority-low { color: #166534; font-weight: 700; }
 .priority-medium { color: #a16207; font-weight: 700; }
 .priority-high { color: #b91c1c; font-weight: 700; }
+.bar {
+  display: inline-block;
+  height: 10px;
+  background: var(--primary);
+  border-radius: 2px;
+  vertical-align: middle;
+}
 .chip {
   display: inline-block;
   padding: 4px 8px;
@@ -184,12 +419,1178 @@ th { background: #eef3fb; }
   margin-right: 6px;
 }
 """
+STYLE_BYTES = STYLE.encode("utf-8")
+STYLE_DIGEST = hashlib.sha256(STYLE_BYTES).hexdigest()[:16]
+
+# Compiled once at startup through the app's Jinja loader (see
+# precompile_templates); pages extend base.html.
+TEMPLATES = {
+    "base.html": """
+<!doctype html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>{% block title %}{% endblock %}</title>
+  <link rel="stylesheet" href="{{ url_for('stylesheet', digest=style_digest) }}">
+</head>
+<body>
+  <div class="nav">
+{% block nav %}{% endblock %}
+  </div>
+  <div class="container">
+    <div class="brand-header">
+      <img class="brand-logo" src="{{ college_logo_url }}" alt="{{ college_name }} logo">
+    </div>
+{% block content %}{% endblock %}
+  </div>
+</body>
+</html>
+""",
+    "flashes.html": """
+{% with messages = get_flashed_messages() %}
+  {% if messages %}
+    {% for message in messages %}
+      <div class="alert">{{ message }}</div>
+    {% endfor %}
+  {% endif %}
+{% endwith %}
+""",
+    "live_updates.html": """
+<div id="live-updates" class="alert" hidden>
+  Complaints have changed since this page loaded. <a href="">Reload</a> to see the latest.
+</div>
+<script>
+  (function () {
+    if (!window.fetch) { return; }
+    var version = {{ live_version }};
+    var timer = setInterval(function () {
+      if (document.hidden) { return; }
+      fetch("{{ changes_url }}", { credentials: "same-origin", cache: "no-cache" })
+        .then(function (response) { return response.ok ? response.json() : null; })
+        .then(function (body) {
+          if (body && body.version !== version) {
+            document.getElementById("live-updates").hidden = false;
+            clearInterval(timer);
+          }
+        })
+        .catch(function () {});
+    }, {{ (config.LIVE_POLL_SECONDS * 1000) | int }});
+  })();
+</script>
+""",
+    "index.html": """
+{% extends "base.html" %}
+{% block title %}Hostel Portal{% endblock %}
+{% block nav %}
+  <span class="nav-title">Portal</span>
+{% endblock %}
+{% block content %}
+<div class="card">
+  <h2>Welcome</h2>
+  <p class="small">Students can raise complaints and track status. Admin can manage all complaints.</p>
+  <a class="btn" href="{{ url_for('student_login') }}">Student Login</a>
+  <a class="btn btn-secondary" href="{{ url_for('admin_login') }}">Admin Login</a>
+</div>
+{% endblock %}
+""",
+    "student_history.html": """
+{% if complaints %}
+<div class="table-wrap">
+  <table>
+    <thead>
+      <tr>
+        <th>ID</th>
+        <th>Block</th>
+        <th>Room</th>
+        <th>Category</th>
+        <th>Priority</th>
+        <th>Description</th>
+        <th>Status</th>
+        <th>Assigned Staff</th>
+        <th>Admin Remarks</th>
+        <th>Created</th>
+        <th>Last Updated</th>
+      </tr>
+    </thead>
+    <tbody>
+    {% for row in complaints %}
+      <tr>
+        <td>{{ row['id'] }}</td>
+        <td>{{ row['hostel_block'] }}</td>
+        <td>{{ row['room_number'] }}</td>
+        <td>{{ row['category'] }}</td>
+        <td class="{{ priority_class(row['priority']) }}">{{ row['priority'] }}</td>
+        <td>{{ row['description'] }}</td>
+        <td class="{{ status_class(row['status']) }}">{{ row['status'] }}</td>
+        <td>{{ row['staff_assigned'] or '-' }}</td>
+        <td>{{ row['remarks'] or '-' }}</td>
+        <td>{{ row['created_at'] | timestamp }}</td>
+        <td>{{ (row['updated_at'] or row['created_at']) | timestamp }}</td>
+      </tr>
+    {% endfor %}
+    </tbody>
+  </table>
+</div>
+{% else %}
+  <p class="small">No complaints filed yet.</p>
+{% endif %}
+""",
+    "student_login.html": """
+{% extends "base.html" %}
+{% block title %}Student Login{% endblock %}
+{% block nav %}
+  <a href="{{ url_for('index') }}">Home</a>
+  <span class="nav-title">Student Portal</span>
+{% endblock %}
+{% block content %}
+<div class="card" style="max-width:520px;">
+  <h2>Student Login</h2>
+  <p class="small">Use your unique roll number (must start with 4127).</p>
+  {% include "flashes.html" %}
+  <form method="post">
+    <label for="roll_number">Roll Number</label>
+    <input id="roll_number" name="roll_number" type="text" required placeholder="4127...">
+    <button type="submit">Login</button>
+  </form>
+</div>
+{% endblock %}
+""",
+    "student_dashboard.html": """
+{% extends "base.html" %}
+{% block title %}Student Dashboard{% endblock %}
+{% block nav %}
+  <a href="{{ url_for('index') }}">Home</a>
+  <span class="nav-title">Student Portal</span>
+  <a href="{{ url_for('student_logout') }}">Logout</a>
+{% endblock %}
+{% block content %}
+<div class="card">
+  <h2>Welcome, {{ roll_number }}</h2>
+  <p class="small">File complaints and track status/history. Maximum active complaints allowed: {{ max_active }}.</p>
+</div>
+
+<div class="grid">
+  <div class="card">
+    <h3>File New Complaint</h3>
+    {% include "flashes.html" %}
+    <form method="post">
+      <label for="hostel_block">Hostel Block</label>
+      {% if blocks %}
+      <select id="hostel_block" name="hostel_block" required>
+        <option value="">Select block</option>
+        {% for item in blocks %}
+          <option value="{{ item }}">{{ item }}</option>
+        {% endfor %}
+      </select>
+      {% else %}
+      <input id="hostel_block" name="hostel_block" type="text" required maxlength="30" placeholder="e.g. A Block">
+      {% endif %}
+
+      <label for="room_number">Room Number</label>
+      <input id="room_number" name="room_number" type="text" required maxlength="20" placeholder="e.g. 102 or B-204">
+
+      <label for="category">Category</label>
+      <select id="category" name="category" required>
+        <option value="">Select category</option>
+        {% for item in categories %}
+          <option value="{{ item }}">{{ item }}</option>
+        {% endfor %}
+      </select>
+
+      <label for="priority">Priority</label>
+      <select id="priority" name="priority" required>
+        <option value="">Select priority</option>
+        {% for item in priorities %}
+          <option value="{{ item }}">{{ item }}</option>
+        {% endfor %}
+      </select>
+
+      <label for="description">Complaint Details</label>
+      <textarea id="description" name="description" required maxlength="{{ max_description }}" placeholder="Explain the issue clearly (10 to {{ max_description }} characters)"></textarea>
+
+      <button class="btn btn-success" type="submit">Submit Complaint</button>
+    </form>
+  </div>
+
+  <div class="card">
+    <h3>Your Complaint History</h3>
+    {% with changes_url = url_for('student_changes') %}{% include "live_updates.html" %}{% endwith %}
+    {% if show_archived %}
+      <p class="small">Including archived complaints. <a href="{{ url_for('student_dashboard') }}">Show recent only</a></p>
+    {% elif has_archive %}
+      <p class="small">Older resolved complaints are archived. <a href="{{ url_for('student_dashboard', archived=1) }}">Show archived complaints</a></p>
+    {% endif %}
+    {{ history_html }}
+  </div>
+</div>
+{% endblock %}
+""",
+    "admin_login.html": """
+{% extends "base.html" %}
+{% block title %}Admin Login{% endblock %}
+{% block nav %}
+  <a href="{{ url_for('index') }}">Home</a>
+  <span class="nav-title">Admin Portal</span>
+{% endblock %}
+{% block content %}
+<div class="card" style="max-width:520px;">
+  <h2>Admin Login</h2>
+  <p class="small">Login using admin username and password.</p>
+  {% include "flashes.html" %}
+  <form method="post">
+    <label for="username">Username</label>
+    <input id="username" name="username" type="text" required>
+
+    <label for="password">Password</label>
+    <input id="password" name="password" type="password" required>
+
+    <div class="action-row">
+      <button type="submit">Login</button>
+      <a class="btn btn-secondary" href="{{ url_for('admin_register') }}">Create Admin</a>
+    </div>
+  </form>
+</div>
+{% endblock %}
+""",
+    "admin_register.html": """
+{% extends "base.html" %}
+{% block title %}Create Admin{% endblock %}
+{% block nav %}
+  <a href="{{ url_for('index') }}">Home</a>
+  <a href="{{ url_for('admin_login') }}">Admin Login</a>
+  <span class="nav-title">Create Admin</span>
+{% endblock %}
+{% block content %}
+<div class="card" style="max-width:520px;">
+  <h2>Create Admin Account</h2>
+  {% include "flashes.html" %}
+  <form method="post">
+    <label for="username">Admin Username</label>
+    <input id="username" name="username" type="text" required>
+
+    <label for="password">Admin Password</label>
+    <input id="password" name="password" type="password" required>
+
+    <button type="submit">Create Admin</button>
+  </form>
+</div>
+{% endblock %}
+""",
+    "admin_analytics.html": """
+{% extends "base.html" %}
+{% block title %}Complaint Analytics{% endblock %}
+{% block nav %}
+  <a href="{{ url_for('index') }}">Home</a>
+  <span class="nav-title">Admin Portal ({{ session['admin_username'] }})</span>
+  <a href="{{ url_for('admin_dashboard') }}">Complaints</a>
+  <a href="{{ url_for('admin_logout') }}">Logout</a>
+{% endblock %}
+{% block content %}
+<div class="card">
+  <h2>Complaint Trends</h2>
+  <form method="get">
+    <div class="grid">
+      <div>
+        <label for="granularity">Per</label>
+        <select id="granularity" name="granularity">
+          {% for item in granularities %}
+            <option value="{{ item }}" {% if analytics.granularity == item %}selected{% endif %}>{{ item|capitalize }}</option>
+          {% endfor %}
+        </select>
+      </div>
+      <div>
+        <label for="from">From</label>
+        <input id="from" name="from" type="date" value="{{ analytics['from'] }}">
+      </div>
+      <div>
+        <label for="to">To</label>
+        <input id="to" name="to" type="date" value="{{ analytics['to'] }}">
+      </div>
+      <div>
+        <label for="hostel_block">Block</label>
+        <select id="hostel_block" name="hostel_block">
+          <option value="">All</option>
+          {% for item in blocks %}
+            <option value="{{ item }}" {% if analytics.hostel_block == item %}selected{% endif %}>{{ item }}</option>
+          {% endfor %}
+        </select>
+      </div>
+      <div>
+        <label for="category">Category</label>
+        <select id="category" name="category">
+          <option value="">All</option>
+          {% for item in categories %}
+            <option value="{{ item }}" {% if analytics.category == item %}selected{% endif %}>{{ item }}</option>
+          {% endfor %}
+        </select>
+      </div>
+    </div>
+    <button type="submit" class="btn btn-secondary">Show</button>
+  </form>
+
+  {% include "flashes.html" %}
+
+  <p>
+    <span class="chip">Filed: {{ analytics.totals.created }}</span>
+    <span class="chip">Resolved: {{ analytics.totals.resolved }}</span>
+    <span class="chip">Mean time to resolution: {{ analytics.totals.mean_resolution_hours if analytics.totals.mean_resolution_hours is not none else '-' }} h</span>
+  </p>
+
+  {% set peak = analytics.series|map(attribute='created')|max if analytics.series else 0 %}
+  <div class="table-wrap">
+    <table>
+      <thead>
+        <tr><th>{{ analytics.granularity|capitalize }}</th><th>Filed</th><th></th><th>Resolved</th><th>Mean Resolution (h)</th></tr>
+      </thead>
+      <tbody>
+      {% for point in analytics.series %}
+        <tr>
+          <td>{{ point.bucket }}</td>
+          <td>{{ point.created }}</td>
+          <td><span class="bar" style="width: {{ (point.created * 200 / peak)|round|int if peak else 0 }}px"></span></td>
+          <td>{{ point.resolved }}</td>
+          <td>{{ point.mean_resolution_hours if point.mean_resolution_hours is not none else '-' }}</td>
+        </tr>
+      {% else %}
+        <tr><td colspan="5">No complaints in this range.</td></tr>
+      {% endfor %}
+      </tbody>
+    </table>
+  </div>
+</div>
+
+<div class="card">
+  <h2>By Block and Category</h2>
+  <div class="table-wrap">
+    <table>
+      <thead><tr><th>Block</th><th>Category</th><th>Filed</th><th>Resolved</th><th>Mean Resolution (h)</th></tr></thead>
+      <tbody>
+      {% for row in analytics.breakdown %}
+        <tr>
+          <td>{{ row.hostel_block or '-' }}</td>
+          <td>{{ row.category }}</td>
+          <td>{{ row.created }}</td>
+          <td>{{ row.resolved }}</td>
+          <td>{{ row.mean_resolution_hours if row.mean_resolution_hours is not none else '-' }}</td>
+        </tr>
+      {% endfor %}
+      </tbody>
+    </table>
+  </div>
+</div>
+
+<div class="card">
+  <h2>Open Backlog by Age</h2>
+  <p>
+    <span class="chip">Open: {{ analytics.backlog.open }}</span>
+    <span class="chip">Oldest: {{ analytics.backlog.oldest_days if analytics.backlog.oldest_days is not none else '-' }} days</span>
+  </p>
+  <div class="table-wrap">
+    <table>
+      <thead><tr><th>Age</th><th>Open Complaints</th></tr></thead>
+      <tbody>
+      {% for band in analytics.backlog.ages %}
+        <tr><td>{{ band.label }}</td><td>{{ band.open }}</td></tr>
+      {% endfor %}
+      </tbody>
+    </table>
+  </div>
+</div>
+{% endblock %}
+""",
+    "admin_dashboard.html": """
+{% extends "base.html" %}
+{% block title %}Admin Dashboard{% endblock %}
+{% block nav %}
+  <a href="{{ url_for('index') }}">Home</a>
+  <span class="nav-title">Admin Portal ({{ session['admin_username'] }})</span>
+  <a href="{{ url_for('admin_analytics') }}">Analytics</a>
+  <a href="{{ url_for('admin_archive') }}">Archive</a>
+  <a href="{{ url_for('admin_reference') }}">Reference Data</a>
+  <a href="{{ url_for('admin_logout') }}">Logout</a>
+{% endblock %}
+{% block content %}
+<div class="card">
+  <h2>All Complaints</h2>
+  <p class="small">Student identity is hidden in admin view as requested.</p>
+  <p>
+    <span class="chip">Pending: {{ summary['Pending'] }}</span>
+    <span class="chip">In Progress: {{ summary['In Progress'] }}</span>
+    <span class="chip">Resolved: {{ summary['Resolved'] }}</span>
+    {% if archived %}<a class="chip" href="{{ url_for('admin_archive') }}">Archived: {{ archived }}</a>{% endif %}
+    <span class="chip">Showing (Filtered): {{ complaints|length }}</span>
+  </p>
+
+  <form method="get">
+    <label for="q">Search Descriptions and Remarks</label>
+    <input id="q" name="q" type="search" maxlength="{{ search_max_length }}" value="{{ search }}" placeholder="e.g. geyser leaking">
+
+    <label for="status_filter">Filter by Status</label>
+    <select id="status_filter" name="status_filter">
+      <option value="All" {% if status_filter == 'All' %}selected{% endif %}>All</option>
+      {% for item in statuses %}
+        <option value="{{ item }}" {% if status_filter == item %}selected{% endif %}>{{ item }}</option>
+      {% endfor %}
+    </select>
+
+    <label for="category_filter">Filter by Category</label>
+    <select id="category_filter" name="category_filter">
+      <option value="All" {% if category_filter == 'All' %}selected{% endif %}>All</option>
+      {% for item in categories %}
+        <option value="{{ item }}" {% if category_filter == item %}selected{% endif %}>{{ item }}</option>
+      {% endfor %}
+    </select>
+
+    <label for="priority_filter">Filter by Priority</label>
+    <select id="priority_filter" name="priority_filter">
+      <option value="All" {% if priority_filter == 'All' %}selected{% endif %}>All</option>
+      {% for item in priorities %}
+        <option value="{{ item }}" {% if priority_filter == item %}selected{% endif %}>{{ item }}</option>
+      {% endfor %}
+    </select>
+
+    <label for="page_size">Rows per Page</label>
+    <select id="page_size" name="page_size">
+      {% for item in page_sizes %}
+        <option value="{{ item }}" {% if page_size == item %}selected{% endif %}>{{ item }}</option>
+      {% endfor %}
+    </select>
+    <button type="submit" class="btn btn-secondary">Apply Filters</button>
+  </form>
+
+  {% include "flashes.html" %}
+  {% with changes_url = url_for('admin_changes') %}{% include "live_updates.html" %}{% endwith %}
+
+  {% if complaints %}
+    <datalist id="staff-names">
+      {% for member in staff %}
+        <option value="{{ member.name }}" label="{{ member.skills|join(', ') }}{% if not member.on_duty %} (off duty){% endif %}"></option>
+      {% endfor %}
+    </datalist>
+    <form id="bulk-update-form" method="post" action="{{ url_for('admin_bulk_update') }}">
+      <input type="hidden" name="status_filter" value="{{ status_filter }}">
+      <input type="hidden" name="category_filter" value="{{ category_filter }}">
+      <input type="hidden" name="priority_filter" value="{{ priority_filter }}">
+      <input type="hidden" name="page_size" value="{{ page_size }}">
+      {% if search %}<input type="hidden" name="q" value="{{ search }}">{% endif %}
+      <h3>Update Selected Complaints</h3>
+      <div class="grid">
+        <div>
+          <label for="bulk_status">Status</label>
+          <select id="bulk_status" name="status">
+            <option value="">No change</option>
+            {% for item in statuses %}
+              <option value="{{ item }}">{{ item }}</option>
+            {% endfor %}
+          </select>
+        </div>
+        <div>
+          <label for="bulk_priority">Priority</label>
+          <select id="bulk_priority" name="priority">
+            <option value="">No change</option>
+            {% for item in priorities %}
+              <option value="{{ item }}">{{ item }}</option>
+            {% endfor %}
+          </select>
+        </div>
+        <div>
+          <label for="bulk_staff">Assign Staff</label>
+          <input id="bulk_staff" type="text" name="staff_assigned" list="staff-names" placeholder="No change">
+        </div>
+        <div>
+          <label for="bulk_remarks">Remarks</label>
+          <input id="bulk_remarks" type="text" name="remarks" placeholder="No change">
+        </div>
+      </div>
+      <button type="submit">Update Selected</button>
+    </form>
+
+    <div class="table-wrap">
+      <table>
+        <thead>
+          <tr>
+            <th></th>
+            <th>ID</th>
+            <th>Block</th>
+            <th>Room</th>
+            <th>Category</th>
+            <th>Priority</th>
+            <th>Description</th>
+            <th>Status</th>
+            <th>Assigned Staff</th>
+            <th>Remarks</th>
+            <th>Created</th>
+            <th>Last Updated</th>
+            <th>Actions</th>
+          </tr>
+        </thead>
+        <tbody>
+        {% for row in complaints %}
+          <tr>
+            <td><input type="checkbox" name="complaint_ids" value="{{ row['id'] }}" form="bulk-update-form" aria-label="Select complaint {{ row['id'] }}"></td>
+            <td>{{ row['id'] }}</td>
+            <td>{{ row['hostel_block'] }}</td>
+            <td>{{ row['room_number'] }}</td>
+            <td>{{ row['category'] }}</td>
+            <td class="{{ priority_class(row['priority']) }}">{{ row['priority'] }}</td>
+            <td>{{ row['description'] }}</td>
+            <td class="{{ status_class(row['status']) }}">{{ row['status'] }}</td>
+            <td>{{ row['staff_assigned'] or '-' }}</td>
+            <td>{{ row['remarks'] or '-' }}</td>
+            <td>{{ row['created_at'] | timestamp }}</td>
+            <td>{{ (row['updated_at'] or row['created_at']) | timestamp }}</td>
+            <td>
+              <form method="post">
+                <input type="hidden" name="complaint_id" value="{{ row['id'] }}">
+                <input type="hidden" name="status_filter" value="{{ status_filter }}">
+                <input type="hidden" name="category_filter" value="{{ category_filter }}">
+                <input type="hidden" name="priority_filter" value="{{ priority_filter }}">
+                <input type="hidden" name="page_size" value="{{ page_size }}">
+                {% if after is not none %}<input type="hidden" name="after" value="{{ after }}">{% endif %}
+                {% if before is not none %}<input type="hidden" name="before" value="{{ before }}">{% endif %}
+                {% if search %}<input type="hidden" name="q" value="{{ search }}">{% endif %}
+                {% if offset %}<input type="hidden" name="offset" value="{{ offset }}">{% endif %}
+                <label>Status</label>
+                <select name="status" required>
+                  {% for item in statuses %}
+                    <option value="{{ item }}" {% if item == row['status'] %}selected{% endif %}>{{ item }}</option>
+                  {% endfor %}
+                </select>
+
+                <label>Priority</label>
+                <select name="priority" required>
+                  {% for item in priorities %}
+                    <option value="{{ item }}" {% if item == row['priority'] %}selected{% endif %}>{{ item }}</option>
+                  {% endfor %}
+                </select>
+
+                <label>Assign Staff</label>
+                <input type="text" name="staff_assigned" list="staff-names" value="{{ row['staff_assigned'] or '' }}" placeholder="Unassigned">
+
+                <label>Remarks</label>
+                <textarea name="remarks" placeholder="Add remarks">{{ row['remarks'] or '' }}</textarea>
+
+                <button type="submit">Update</button>
+              </form>
+            </td>
+          </tr>
+        {% endfor %}
+        </tbody>
+      </table>
+    </div>
+  {% else %}
+    <p class="small">No complaints available.</p>
+  {% endif %}
+
+  <div class="action-row" style="margin-top:12px;">
+    {% if prev_url %}
+      <a class="btn btn-secondary" href="{{ prev_url }}">&laquo; Previous</a>
+    {% endif %}
+    {% if next_url %}
+      <a class="btn btn-secondary" href="{{ next_url }}">Next &raquo;</a>
+    {% endif %}
+  </div>
+</div>
+{% endblock %}
+""",
+    "admin_archive.html": """
+{% extends "base.html" %}
+{% block title %}Archived Complaints{% endblock %}
+{% block nav %}
+  <a href="{{ url_for('index') }}">Home</a>
+  <span class="nav-title">Admin Portal ({{ session['admin_username'] }})</span>
+  <a href="{{ url_for('admin_dashboard') }}">Complaints</a>
+  <a href="{{ url_for('admin_analytics') }}">Analytics</a>
+  <a href="{{ url_for('admin_logout') }}">Logout</a>
+{% endblock %}
+{% block content %}
+<div class="card">
+  <h2>Archived Complaints</h2>
+  <p class="small">Resolved complaints older than {{ archive_after_days }} days, by the term they were filed in. Archived complaints are read-only.</p>
+  <p>
+    {% for row in terms %}
+      <span class="chip">{{ row['term'] }}: {{ row['complaints'] }}</span>
+    {% else %}
+      <span class="chip">Nothing archived yet</span>
+    {% endfor %}
+  </p>
+
+  <form method="get">
+    <label for="term">Term</label>
+    <select id="term" name="term">
+      <option value="All" {% if term == 'All' %}selected{% endif %}>All</option>
+      {% for row in terms %}
+        <option value="{{ row['term'] }}" {% if term == row['term'] %}selected{% endif %}>{{ row['term'] }} ({{ row['first_created'][:10] }} to {{ row['last_created'][:10] }})</option>
+      {% endfor %}
+    </select>
+
+    <label for="category_filter">Filter by Category</label>
+    <select id="category_filter" name="category_filter">
+      <option value="All" {% if category_filter == 'All' %}selected{% endif %}>All</option>
+      {% for item in categories %}
+        <option value="{{ item }}" {% if category_filter == item %}selected{% endif %}>{{ item }}</option>
+      {% endfor %}
+    </select>
+
+    <label for="priority_filter">Filter by Priority</label>
+    <select id="priority_filter" name="priority_filter">
+      <option value="All" {% if priority_filter == 'All' %}selected{% endif %}>All</option>
+      {% for item in priorities %}
+        <option value="{{ item }}" {% if priority_filter == item %}selected{% endif %}>{{ item }}</option>
+      {% endfor %}
+    </select>
+
+    <label for="page_size">Rows per Page</label>
+    <select id="page_size" name="page_size">
+      {% for item in page_sizes %}
+        <option value="{{ item }}" {% if page_size == item %}selected{% endif %}>{{ item }}</option>
+      {% endfor %}
+    </select>
+    <button type="submit" class="btn btn-secondary">Apply Filters</button>
+  </form>
+
+  {% if complaints %}
+    <div class="table-wrap">
+      <table>
+        <thead>
+          <tr>
+            <th>ID</th>
+            <th>Block</th>
+            <th>Room</th>
+            <th>Category</th>
+            <th>Priority</th>
+            <th>Description</th>
+            <th>Status</th>
+            <th>Assigned Staff</th>
+            <th>Remarks</th>
+            <th>Created</th>
+            <th>Last Updated</th>
+          </tr>
+        </thead>
+        <tbody>
+        {% for row in complaints %}
+          <tr>
+            <td>{{ row['id'] }}</td>
+            <td>{{ row['hostel_block'] }}</td>
+            <td>{{ row['room_number'] }}</td>
+            <td>{{ row['category'] }}</td>
+            <td class="{{ priority_class(row['priority']) }}">{{ row['priority'] }}</td>
+            <td>{{ row['description'] }}</td>
+            <td class="{{ status_class(row['status']) }}">{{ row['status'] }}</td>
+            <td>{{ row['staff_assigned'] or '-' }}</td>
+            <td>{{ row['remarks'] or '-' }}</td>
+            <td>{{ row['created_at'] | timestamp }}</td>
+            <td>{{ (row['updated_at'] or row['created_at']) | timestamp }}</td>
+          </tr>
+        {% endfor %}
+        </tbody>
+      </table>
+    </div>
+  {% else %}
+    <p class="small">No archived complaints match.</p>
+  {% endif %}
+
+  <div class="action-row" style="margin-top:12px;">
+    {% if prev_url %}
+      <a class="btn btn-secondary" href="{{ prev_url }}">&laquo; Newer</a>
+    {% endif %}
+    {% if next_url %}
+      <a class="btn btn-secondary" href="{{ next_url }}">Older &raquo;</a>
+    {% endif %}
+  </div>
+</div>
+{% endblock %}
+""",
+    "admin_reference.html": """
+{% extends "base.html" %}
+{% block title %}Reference Data{% endblock %}
+{% block nav %}
+  <a href="{{ url_for('index') }}">Home</a>
+  <span class="nav-title">Admin Portal ({{ session['admin_username'] }})</span>
+  <a href="{{ url_for('admin_dashboard') }}">Complaints</a>
+  <a href="{{ url_for('admin_analytics') }}">Analytics</a>
+  <a href="{{ url_for('admin_logout') }}">Logout</a>
+{% endblock %}
+{% block content %}
+{% include "flashes.html" %}
+<div class="card">
+  <h2>Categories</h2>
+  <p class="small">Retired categories are no longer offered to students; their complaints keep the category. New complaints are assigned automatically to staff with the category's skill{% if not auto_assign %} once automatic assignment is enabled{% endif %}.</p>
+  <div class="table-wrap">
+    <table>
+      <thead><tr><th>Category</th><th>State</th><th>Skill Needed</th><th></th></tr></thead>
+      <tbody>
+      {% for row in categories %}
+        <tr>
+          <td>{{ row['name'] }}</td>
+          <td>{{ 'Active' if row['active'] else 'Retired' }}</td>
+          <td>
+            <form method="post" class="action-row">
+              <input type="hidden" name="action" value="set_category_skill">
+              <input type="hidden" name="code" value="{{ row['code'] }}">
+              <input type="text" name="skill" value="{{ row['skill'] or '' }}" maxlength="{{ max_name }}" aria-label="Skill needed for {{ row['name'] }}">
+              <button type="submit" class="btn-secondary">Save</button>
+            </form>
+          </td>
+          <td>
+            <form method="post">
+              <input type="hidden" name="action" value="set_category_active">
+              <input type="hidden" name="code" value="{{ row['code'] }}">
+              <input type="hidden" name="active" value="{{ 0 if row['active'] else 1 }}">
+              <button type="submit" class="btn-secondary">{{ 'Retire' if row['active'] else 'Restore' }}</button>
+            </form>
+          </td>
+        </tr>
+      {% endfor %}
+      </tbody>
+    </table>
+  </div>
+  <form method="post">
+    <input type="hidden" name="action" value="add_category">
+    <label for="category_name">New Category</label>
+    <input id="category_name" name="name" type="text" required maxlength="{{ max_name }}">
+    <label for="category_skill">Skill Needed</label>
+    <input id="category_skill" name="skill" type="text" maxlength="{{ max_name }}" placeholder="e.g. Networking">
+    <button type="submit">Add Category</button>
+  </form>
+</div>
+
+<div class="card">
+  <h2>Hostel Blocks and Rooms</h2>
+  <p class="small">Once a block is listed, students pick from the active blocks; once a block has rooms, its room number must be one of them.</p>
+  <div class="table-wrap">
+    <table>
+      <thead><tr><th>Block</th><th>State</th><th>Rooms</th><th></th></tr></thead>
+      <tbody>
+      {% for row in blocks %}
+        <tr>
+          <td>{{ row['name'] }}</td>
+          <td>{{ 'Active' if row['active'] else 'Retired' }}</td>
+          <td>{{ row['rooms'] or 'Any' }}</td>
+          <td>
+            <form method="post">
+              <input type="hidden" name="action" value="set_block_active">
+              <input type="hidden" name="id" value="{{ row['id'] }}">
+              <input type="hidden" name="active" value="{{ 0 if row['active'] else 1 }}">
+              <button type="submit" class="btn-secondary">{{ 'Retire' if row['active'] else 'Restore' }}</button>
+            </form>
+          </td>
+        </tr>
+      {% endfor %}
+      </tbody>
+    </table>
+  </div>
+  <div class="grid">
+    <form method="post">
+      <input type="hidden" name="action" value="add_block">
+      <label for="block_name">New Block</label>
+      <input id="block_name" name="name" type="text" required maxlength="{{ max_name }}" placeholder="e.g. A Block">
+      <button type="submit">Add Block</button>
+    </form>
+    {% if blocks %}
+    <form method="post">
+      <label for="rooms_block">Rooms of Block</label>
+      <select id="rooms_block" name="id" required>
+        {% for row in blocks %}
+          <option value="{{ row['id'] }}">{{ row['name'] }}</option>
+        {% endfor %}
+      </select>
+      <label for="rooms">Rooms</label>
+      <input id="rooms" name="rooms" type="text" required placeholder="e.g. 101-140, 201, G-01">
+      <div class="action-row">
+        <button type="submit" name="action" value="add_rooms">Add Rooms</button>
+        <button type="submit" name="action" value="remove_rooms" class="btn-secondary">Remove Rooms</button>
+      </div>
+    </form>
+    {% endif %}
+  </div>
+</div>
+
+<div class="card">
+  <h2>Staff</h2>
+  <p class="small">Skills are comma separated. Inactive staff keep their past assignments but are no longer offered. Automatic assignment prefers staff based in the complaint's block.</p>
+  <div class="table-wrap">
+    <table>
+      <thead><tr><th>Name</th><th>Skills</th><th>Home Block</th><th>On Duty</th><th>Active</th><th></th></tr></thead>
+      <tbody>
+      {% for member in staff %}
+        <tr>
+          <td>{{ member['name'] }}</td>
+          <td colspan="5">
+            <form method="post" class="action-row">
+              <input type="hidden" name="action" value="update_staff">
+              <input type="hidden" name="id" value="{{ member['id'] }}">
+              <input type="text" name="skills" value="{{ member['skills'] or '' }}" aria-label="Skills of {{ member['name'] }}" style="flex:1;">
+              <select name="home_block_id" aria-label="Home block of {{ member['name'] }}">
+                <option value="">No home block</option>
+                {% for block in blocks %}
+                  <option value="{{ block['id'] }}" {% if block['id'] == member['home_block_id'] %}selected{% endif %}>{{ block['name'] }}</option>
+                {% endfor %}
+              </select>
+              <label><input type="checkbox" name="on_duty" value="1" {% if member['on_duty'] %}checked{% endif %}> On duty</label>
+              <label><input type="checkbox" name="active" value="1" {% if member['active'] %}checked{% endif %}> Active</label>
+              <button type="submit" class="btn-secondary">Save</button>
+            </form>
+          </td>
+        </tr>
+      {% endfor %}
+      </tbody>
+    </table>
+  </div>
+  <form method="post">
+    <input type="hidden" name="action" value="add_staff">
+    <label for="staff_name">New Staff Member</label>
+    <input id="staff_name" name="name" type="text" required maxlength="{{ max_name }}" placeholder="e.g. Electrician Ravi">
+    <label for="staff_skills">Skills</label>
+    <input id="staff_skills" name="skills" type="text" placeholder="e.g. Electrical, Plumbing">
+    <label for="staff_home_block">Home Block</label>
+    <select id="staff_home_block" name="home_block_id">
+      <option value="">No home block</option>
+      {% for block in blocks %}
+        <option value="{{ block['id'] }}">{{ block['name'] }}</option>
+      {% endfor %}
+    </select>
+    <label><input type="checkbox" name="on_duty" value="1" checked> On duty</label>
+    <button type="submit">Add Staff Member</button>
+  </form>
+</div>
+{% endblock %}
+""",
+}
+
+
+class PoolTimeoutError(RuntimeError):
+    pass
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of SQLite connections.
+
+    Connections are opened lazily up to ``size`` and reused most-recently-used
+    first. Each one gets the pragmas below once, when it is opened.
+    """
+
+    def __init__(
+        self,
+        database,
+        size=8,
+        timeout=10.0,
+        healthcheck_interval=30.0,
+        busy_timeout_ms=5000,
+        cache_size_kib=16384,
+        mmap_size=256 * 1024 * 1024,
+        factory=sqlite3.Connection,
+    ):
+        self.database = database
+        self.size = size
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._in_use = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.discarded = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.checkout_seconds_total = 0.0
+
+    def connect(self):
+        """Open a new connection with the pool's pragmas applied."""
+        conn = sqlite3.connect(
+            self.database,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            factory=self.factory,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def _healthy(self, conn):
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def acquire(self):
+        started = time.perf_counter()
+        waited = False
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_open = self._opened < self.size
+                    if can_open:
+                        self._opened += 1
+                if can_open:
+                    try:
+                        conn = self.connect()
+                    except Exception:
+                        with self._lock:
+                            self._opened -= 1
+                        raise
+                    break
+                remaining = self.timeout - (time.perf_counter() - started)
+                waited = True
+                try:
+                    conn, last_used = self._idle.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    with self._lock:
+                        self.timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No database connection became free within {self.timeout} seconds."
+                    ) from None
+            if time.monotonic() - last_used < self.healthcheck_interval or self._healthy(conn):
+                break
+            self._discard(conn)
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._in_use += 1
+            self.checkouts += 1
+            self.checkout_seconds_total += elapsed
+            if waited:
+                self.waits += 1
+                self.wait_seconds_total += elapsed
+                self.wait_seconds_max = max(self.wait_seconds_max, elapsed)
+        return conn
+
+    def release(self, conn):
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    def _discard(self, conn):
+        with self._lock:
+            self._opened -= 1
+            self.discarded += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "opened": self._opened,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "discarded": self.discarded,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "checkout_seconds_total": round(self.checkout_seconds_total, 6),
+            }
+
+
+class Subscription:
+    __slots__ = ("matches", "events", "overflowed")
+
+    def __init__(self, matches, queue_limit):
+        self.matches = matches
+        self.events = deque(maxlen=queue_limit)
+        self.overflowed = False
+
+
+class EventHub:
+    """In-process fan-out of complaint events to live stream subscribers.
+
+    Subscribers are plain objects holding a bounded deque; there is no thread
+    per subscriber. ``publish`` appends to every matching deque and wakes the
+    waiting streams through one shared condition.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._subscribers = set()
+        self._sequence = 0
+        self.published = 0
+        self.delivered = 0
+
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def subscribe(self, matches, queue_limit, max_subscribers):
+        with self._condition:
+            if len(self._subscribers) >= max_subscribers:
+                return None
+            subscription = Subscription(matches, queue_limit)
+            self._subscribers.add(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self._condition:
+            self._subscribers.discard(subscription)
+
+    def publish(self, events):
+        with self._condition:
+            for event in events:
+                self._sequence += 1
+                event["seq"] = self._sequence
+                self.published += 1
+                for subscription in self._subscribers:
+                    if subscription.matches(event):
+                        if len(subscription.events) == subscription.events.maxlen:
+                            subscription.overflowed = True
+                        subscription.events.append(event)
+                        self.delivered += 1
+            self._condition.notify_all()
+
+    def wait(self, subscription, timeout):
+        """Block until the subscription has events or ``timeout`` passes.
+
+        Returns ``(events, overflowed)`` and empties the subscription's queue.
+        """
+        with self._condition:
+            if not subscription.events:
+                self._condition.wait_for(lambda: subscription.events, timeout)
+            events = list(subscription.events)
+            subscription.events.clear()
+            overflowed = subscription.overflowed
+            subscription.overflowed = False
+            return events, overflowed
+
+    def stats(self):
+        with self._condition:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self.published,
+                "delivered": self.delivered,
+            }
+
+
+event_hub = EventHub()
+
+
+def queue_complaint_event(event_type, complaint, roll_number, changed=None):
+    """Record an event to publish once the current transaction commits."""
+    if not event_hub.has_subscribers():
+        return
+    g.setdefault("pending_events", []).append(
+        {
+            "type": event_type,
+            "roll_number": roll_number,
+            "changed": changed or [],
+            "complaint": complaint,
+        }
+    )
+
+
+def publish_pending_events():
+    events = g.pop("pending_events", None)
+    if events:
+        event_hub.publish(events)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on ``path`` (created if missing) across processes."""
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def ensure_schema(pool):
+    """Bring the database up to the latest migration, once per database file.
+
+    Runs when a process opens its first pool for a database. Worker processes
+    starting together queue on a lock file next to the database; the first
+    applies any pending migrations and the rest find user_version current.
+    """
+    with file_lock(pool.database + ".lock"):
+        conn = pool.connect()
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < len(MIGRATIONS):
+                run_migrations(conn)
+        finally:
+            conn.close()
+
+
+def get_pool():
+    database = app.config["DATABASE"]
+    with _pools_lock:
+        pool = _pools.get(database)
+        if pool is None:
+            pool = ConnectionPool(
+                database,
+                size=app.config["DB_POOL_SIZE"],
+                timeout=app.config["DB_POOL_TIMEOUT"],
+                healthcheck_interval=app.config["DB_POOL_HEALTHCHECK_INTERVAL"],
+                busy_timeout_ms=app.config["DB_BUSY_TIMEOUT_MS"],
+                cache_size_kib=app.config["DB_CACHE_SIZE_KIB"],
+                mmap_size=app.config["DB_MMAP_SIZE"],
+                factory=app.config["DB_CONNECTION_FACTORY"]
+                or (
+                    InstrumentedConnection
+                    if app.config["INSTRUMENTATION_ENABLED"]
+                    else sqlite3.Connection
+                ),
+            )
+            ensure_schema(pool)
+            _pools[database] = pool
+        return pool
+
+
+def close_pools():
+    """Close every idle pooled connection this process holds."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
 
 
 def get_db():
     if "db" not in g:
-        g.db = sqlite3.connect(app.config["DATABASE"])
-        g.db.row_factory = sqlite3.Row
+        g.db = get_pool().acquire()
     return g.db
 
 
@@ -197,11 +1598,75 @@ def get_db():
 def close_db(exception):
     db = g.pop("db", None)
     if db is not None:
-        db.close()
+        get_pool().release(db)
 
 
-def init_db():
-    db = get_db()
+@contextmanager
+def immediate_transaction(db):
+    """Run the block in a BEGIN IMMEDIATE transaction.
+
+    The write lock is taken up front, so reads made inside the block cannot be
+    invalidated by another writer before the commit.
+    """
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        yield db
+    except BaseException:
+        db.rollback()
+        g.pop("pending_events", None)
+        raise
+    db.commit()
+    publish_pending_events()
+
+
+def rank_case_sql(column, ranks, codes):
+    cases = " ".join(f"WHEN {codes[value]} THEN {rank}" for value, rank in ranks.items())
+    return f"CASE {column} {cases} ELSE {len(ranks) + 1} END"
+
+
+def sort_key_sql(prefix=""):
+    return (
+        f"(({rank_case_sql(prefix + 'status', STATUS_RANKS, STATUS_CODES)}) * 10"
+        f" + ({rank_case_sql(prefix + 'priority', PRIORITY_RANKS, PRIORITY_CODES)}))"
+        f" * {SORT_KEY_ID_SPAN} - {prefix}id"
+    )
+
+
+def epoch_sql(value):
+    """A local ``YYYY-MM-DD HH:MM:SS`` text time as integer Unix seconds."""
+    return f"CAST(strftime('%s', {value}, 'utc') AS INTEGER)"
+
+
+def local_time_sql(value):
+    """Integer Unix seconds as local ``YYYY-MM-DD HH:MM:SS`` text."""
+    return f"datetime({value}, 'unixepoch', 'localtime')"
+
+
+def label_sql(column, value):
+    """The label behind a stored key of one of the LABELLED_COLUMNS."""
+    table, key = LABELLED_COLUMNS[column]
+    return f"(SELECT name FROM {table} WHERE {key} = {value})"
+
+
+def encoded_columns_sql(columns, keep=()):
+    """SELECT expressions storing text-form complaint columns (labels and
+    local text times, as staged by imports) as keys and Unix seconds.
+    Columns in ``keep`` are copied as they are."""
+    expressions = []
+    for column in columns:
+        if column in keep:
+            expressions.append(column)
+        elif column in LABELLED_COLUMNS:
+            table, key = LABELLED_COLUMNS[column]
+            expressions.append(f"(SELECT {key} FROM {table} WHERE name = {column}) AS {column}")
+        elif column in TIMESTAMP_COLUMNS:
+            expressions.append(f"{epoch_sql(column)} AS {column}")
+        else:
+            expressions.append(column)
+    return ", ".join(expressions)
+
+
+def migrate_base_schema(db):
     db.execute(
         """
         CREATE TABLE IF NOT EXISTS admins (
@@ -230,7 +1695,7 @@ def init_db():
         )
         """
     )
-    # Keep existing databases compatible when new fields are introduced.
+    # Databases created before migrations were tracked may lack these fields.
     for statement in [
         "ALTER TABLE complaints ADD COLUMN hostel_block TEXT NOT NULL DEFAULT ''",
         "ALTER TABLE complaints ADD COLUMN room_number TEXT NOT NULL DEFAULT ''",
@@ -241,343 +1706,3420 @@ def init_db():
             db.execute(statement)
         except sqlite3.OperationalError:
             pass
-    db.commit()
 
 
-def student_required(view):
-    @wraps(view)
-    def wrapped(*args, **kwargs):
-        if not session.get("student_roll"):
-            return redirect(url_for("student_login"))
-        return view(*args, **kwargs)
+def migrate_sort_key(db):
+    try:
+        db.execute("ALTER TABLE complaints ADD COLUMN sort_key INTEGER")
+    except sqlite3.OperationalError:
+        pass
+    db.execute(f"UPDATE complaints SET sort_key = {sort_key_sql()} WHERE sort_key IS NULL")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_complaints_sort_key ON complaints (sort_key)")
+    # Triggers keep sort_key in step with every write to status/priority.
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS complaints_sort_key_insert
+        AFTER INSERT ON complaints
+        BEGIN
+            UPDATE complaints SET sort_key = {sort_key_sql("NEW.")} WHERE id = NEW.id;
+        END
+        """
+    )
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS complaints_sort_key_update
+        AFTER UPDATE OF status, priority ON complaints
+        BEGIN
+            UPDATE complaints SET sort_key = {sort_key_sql("NEW.")} WHERE id = NEW.id;
+        END
+        """
+    )
 
-    return wrapped
 
+def migrate_query_indexes(db):
+    # Student history: WHERE roll_number = ? ORDER BY id DESC. Index entries
+    # with the same roll_number are stored in rowid order, so no sort step.
+    db.execute("CREATE INDEX IF NOT EXISTS idx_complaints_roll ON complaints (roll_number)")
+    # Active-complaint limit: WHERE roll_number = ? AND status IN (...), answered from the index alone.
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_complaints_roll_status ON complaints (roll_number, status)"
+    )
+    # Admin filters walk the filtered rows already in page order.
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_complaints_status_sort ON complaints (status, sort_key)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_complaints_category_sort ON complaints (category, sort_key)"
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_complaints_priority_sort ON complaints (priority, sort_key)"
+    )
+    db.execute("ANALYZE complaints")
 
-def admin_required(view):
-    @wraps(view)
-    def wrapped(*args, **kwargs):
-        if not session.get("admin_id"):
-            return redirect(url_for("admin_login"))
-        return view(*args, **kwargs)
 
-    return wrapped
+def migrate_complaint_counters(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS complaint_counters (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+        """
+    )
+    # Counters are adjusted by triggers, so they change in the same
+    # transaction as whichever statement inserted, updated or deleted the row.
+    for column in COUNTER_DIMENSIONS:
+        increment = f"""
+            INSERT INTO complaint_counters (dimension, value, total)
+            VALUES ('{column}', NEW.{column}, 1)
+            ON CONFLICT (dimension, value) DO UPDATE SET total = total + 1;
+        """
+        decrement = f"""
+            UPDATE complaint_counters SET total = total - 1
+            WHERE dimension = '{column}' AND value = OLD.{column};
+        """
+        db.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS complaint_counters_{column}_insert
+            AFTER INSERT ON complaints
+            BEGIN {increment} END
+            """
+        )
+        db.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS complaint_counters_{column}_update
+            AFTER UPDATE OF {column} ON complaints
+            WHEN OLD.{column} IS NOT NEW.{column}
+            BEGIN {decrement} {increment} END
+            """
+        )
+        db.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS complaint_counters_{column}_delete
+            AFTER DELETE ON complaints
+            BEGIN {decrement} END
+            """
+        )
+    rebuild_complaint_counters(db)
 
 
-def status_class(status):
-    if status == "Pending":
-        return "status-pending"
-    if status == "In Progress":
-        return "status-inprogress"
-    return "status-resolved"
+def active_statuses_sql():
+    return "(" + ", ".join(str(STATUS_CODES[status]) for status in ACTIVE_STATUSES) + ")"
 
 
-def priority_class(priority):
-    if priority == "High":
-        return "priority-high"
-    if priority == "Medium":
-        return "priority-medium"
-    return "priority-low"
+def migrate_student_active_counts(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS student_active_counts (
+            roll_number TEXT PRIMARY KEY,
+            active INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    active = active_statuses_sql()
+    upsert = """
+        INSERT INTO student_active_counts (roll_number, active)
+        VALUES ({roll}, {delta})
+        ON CONFLICT (roll_number) DO UPDATE SET active = active + excluded.active;
+    """
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS student_active_counts_insert
+        AFTER INSERT ON complaints
+        WHEN NEW.status IN {active}
+        BEGIN {upsert.format(roll="NEW.roll_number", delta=1)} END
+        """
+    )
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS student_active_counts_update
+        AFTER UPDATE OF status ON complaints
+        WHEN (OLD.status IN {active}) <> (NEW.status IN {active})
+        BEGIN
+            {upsert.format(roll="NEW.roll_number", delta=f"CASE WHEN NEW.status IN {active} THEN 1 ELSE -1 END")}
+        END
+        """
+    )
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS student_active_counts_delete
+        AFTER DELETE ON complaints
+        WHEN OLD.status IN {active}
+        BEGIN {upsert.format(roll="OLD.roll_number", delta=-1)} END
+        """
+    )
+    rebuild_student_active_counts(db)
 
 
-app.jinja_env.globals.update(
-    status_class=status_class,
-    priority_class=priority_class,
-    college_name=COLLEGE_NAME,
-    college_system_name=COLLEGE_SYSTEM_NAME,
-    college_logo_url=COLLEGE_LOGO_URL,
-)
+def migrate_change_versions(db):
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_versions (
+            scope TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        """
+    )
+    # One version for the whole table and one per student; API ETags are
+    # derived from them, so a poll can be answered without the list query.
+    bump = """
+        INSERT INTO change_versions (scope, version) VALUES ({scope}, 1)
+        ON CONFLICT (scope) DO UPDATE SET version = version + 1;
+    """
+    for event, row in [("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")]:
+        db.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS change_versions_{event.lower()}
+            AFTER {event} ON complaints
+            BEGIN
+                {bump.format(scope="'complaints'")}
+                {bump.format(scope=f"'student:' || {row}.roll_number")}
+            END
+            """
+        )
 
 
-@app.route("/")
-def index():
-    return render_template_string(
-        """
-        <!doctype html>
-        <html>
-        <head>
-          <meta charset="utf-8">
-          <meta name="viewport" content="width=device-width, initial-scale=1">
-          <title>Hostel Portal</title>
-          <style>{{ style }}</style>
-        </head>
-        <body>
-          <div class="nav">
-            <span class="nav-title">Portal</span>
-          </div>
-          <div class="container">
-            <div class="brand-header">
-              <img class="brand-logo" src="{{ college_logo_url }}" alt="{{ college_name }} logo">
-            </div>
-            <div class="card">
-              <h2>Welcome</h2>
-              <p class="small">Students can raise complaints and track status. Admin can manage all complaints.</p>
-              <a class="btn" href="{{ url_for('student_login') }}">Student Login</a>
-              <a class="btn btn-secondary" href="{{ url_for('admin_login') }}">Admin Login</a>
-            </div>
-          </div>
-        </body>
-        </html>
-        """,
-        style=STYLE,
+def migrate_complaint_search(db):
+    # External-content FTS5 index over complaints; it stores only the index,
+    # the text itself is read from the complaints table.
+    db.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS complaints_fts USING fts5(
+            description,
+            remarks,
+            content = 'complaints',
+            content_rowid = 'id',
+            tokenize = 'porter unicode61'
+        )
+        """
+    )
+    db.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS complaints_fts_insert
+        AFTER INSERT ON complaints
+        BEGIN
+            INSERT INTO complaints_fts (rowid, description, remarks)
+            VALUES (NEW.id, NEW.description, NEW.remarks);
+        END
+        """
+    )
+    db.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS complaints_fts_delete
+        AFTER DELETE ON complaints
+        BEGIN
+            INSERT INTO complaints_fts (complaints_fts, rowid, description, remarks)
+            VALUES ('delete', OLD.id, OLD.description, OLD.remarks);
+        END
+        """
+    )
+    db.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS complaints_fts_update
+        AFTER UPDATE OF description, remarks ON complaints
+        BEGIN
+            INSERT INTO complaints_fts (complaints_fts, rowid, description, remarks)
+            VALUES ('delete', OLD.id, OLD.description, OLD.remarks);
+            INSERT INTO complaints_fts (rowid, description, remarks)
+            VALUES (NEW.id, NEW.description, NEW.remarks);
+        END
+        """
     )
+    db.execute("INSERT INTO complaints_fts (complaints_fts) VALUES ('rebuild')")
 
 
-@app.route("/student/login", methods=["GET", "POST"])
-def student_login():
-    if request.method == "POST":
-        roll_number = request.form.get("roll_number", "").strip()
-        if not re.fullmatch(r"4127\d+", roll_number):
-            flash("Enter a valid roll number that starts with 4127 and contains only digits.")
-        else:
-            session.pop("admin_id", None)
-            session["student_roll"] = roll_number
-            return redirect(url_for("student_dashboard"))
+def rebuild_complaint_counters(db):
+    db.execute("DELETE FROM complaint_counters")
+    for column in COUNTER_DIMENSIONS:
+        db.execute(
+            f"""
+            INSERT INTO complaint_counters (dimension, value, total)
+            SELECT '{column}', {column}, COUNT(*)
+            FROM complaints
+            GROUP BY {column}
+            """
+        )
 
-    return render_template_string(
-        """
-        <!doctype html>
-        <html>
-        <head>
-          <meta charset="utf-8">
-          <meta name="viewport" content="width=device-width, initial-scale=1">
-          <title>Student Login</title>
-          <style>{{ style }}</style>
-        </head>
-        <body>
-          <div class="nav">
-            <a href="{{ url_for('index') }}">Home</a>
-            <span class="nav-title">Student Portal</span>
-          </div>
-          <div class="container">
-            <div class="brand-header">
-              <img class="brand-logo" src="{{ college_logo_url }}" alt="{{ college_name }} logo">
-            </div>
-            <div class="card" style="max-width:520px;">
-              <h2>Student Login</h2>
-              <p class="small">Use your unique roll number (must start with 4127).</p>
-              {% with messages = get_flashed_messages() %}
-                {% if messages %}
-                  {% for message in messages %}
-                    <div class="alert">{{ message }}</div>
-                  {% endfor %}
-                {% endif %}
-              {% endwith %}
-              <form method="post">
-                <label for="roll_number">Roll Number</label>
-                <input id="roll_number" name="roll_number" type="text" required placeholder="4127...">
-                <button type="submit">Login</button>
-              </form>
-            </div>
-          </div>
-        </body>
-        </html>
-        """,
-        style=STYLE,
+
+def rebuild_student_active_counts(db):
+    db.execute("DELETE FROM student_active_counts")
+    db.execute(
+        f"""
+        INSERT INTO student_active_counts (roll_number, active)
+        SELECT roll_number, COUNT(*)
+        FROM complaints
+        WHERE status IN {active_statuses_sql()}
+        GROUP BY roll_number
+        """
     )
 
 
-@app.route("/student/dashboard", methods=["GET", "POST"])
+def rebuild_complaint_rollups(db):
+    """Recompute complaint_rollups (and missing resolved_at) from complaints
+    and the archive tables.
+
+    Rows resolved before resolved_at existed use their last update time. The
+    caller owns the transaction.
+    """
+    active = active_statuses_sql()
+    db.execute(
+        f"""
+        UPDATE complaints SET resolved_at = COALESCE(updated_at, created_at)
+        WHERE status NOT IN {active} AND resolved_at IS NULL
+        """
+    )
+    db.execute(
+        f"UPDATE complaints SET resolved_at = NULL WHERE status IN {active} AND resolved_at IS NOT NULL"
+    )
+    db.execute("DELETE FROM complaint_rollups")
+    # Archived complaints still count towards the history.
+    source = " UNION ALL ".join(
+        f"SELECT hostel_block, {label_sql('category', 'category')} AS category, status, created_at, resolved_at"
+        f" FROM {table}"
+        for table in ["complaints", *get_archive_tables(db)]
+    )
+    for granularity, width in ROLLUP_GRANULARITIES.items():
+        db.execute(
+            f"""
+            INSERT INTO complaint_rollups (granularity, bucket, hostel_block, category, created, still_open)
+            SELECT '{granularity}', substr({local_time_sql("created_at")}, 1, {width}), hostel_block, category,
+                COUNT(*), SUM(status IN {active})
+            FROM ({source})
+            GROUP BY 2, 3, 4
+            """
+        )
+        db.execute(
+            f"""
+            INSERT INTO complaint_rollups (granularity, bucket, hostel_block, category, resolved, resolution_seconds)
+            SELECT '{granularity}', substr({local_time_sql("resolved_at")}, 1, {width}), hostel_block, category,
+                COUNT(*), SUM({resolution_seconds_sql("complaints", "resolved_at")})
+            FROM ({source}) AS complaints
+            WHERE resolved_at IS NOT NULL
+            GROUP BY 2, 3, 4
+            ON CONFLICT (granularity, bucket, hostel_block, category) DO UPDATE SET
+                resolved = excluded.resolved,
+                resolution_seconds = excluded.resolution_seconds
+            """
+        )
+
+
+def rebuild_counters(db):
+    """Recompute every trigger-maintained counter from the complaints table.
+
+    The caller owns the transaction.
+    """
+    rebuild_complaint_counters(db)
+    rebuild_student_active_counts(db)
+
+
+def get_counters(db, dimension):
+    rows = db.execute(
+        "SELECT value, total FROM complaint_counters WHERE dimension = ? AND total > 0",
+        (dimension,),
+    ).fetchall()
+    if dimension in CODED_COLUMNS:
+        labels = get_reference_data(db).labels[dimension]
+        if any(int(row["value"]) not in labels for row in rows):
+            labels = get_reference_data(db, refresh=True).labels[dimension]
+        return {labels[int(row["value"])]: row["total"] for row in rows}
+    return {row["value"]: row["total"] for row in rows}
+
+
+def migrate_export_index(db):
+    # Exports walk complaints in (created_at, id) order; a date range is one
+    # index range and the rows never need sorting.
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_complaints_created ON complaints (created_at)"
+    )
+
+
+def migrate_complaint_imports(db):
+    # Progress of each `flask import-complaints` run, so an interrupted one can
+    # resume, and the validated rows it has staged but not yet loaded.
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS complaint_imports (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            source_size INTEGER NOT NULL,
+            records_read INTEGER NOT NULL DEFAULT 0,
+            staged INTEGER NOT NULL DEFAULT 0,
+            rejected INTEGER NOT NULL DEFAULT 0,
+            started_at TEXT NOT NULL,
+            finished_at TEXT,
+            UNIQUE (source, source_size)
+        )
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS complaint_import_rows (
+            import_id INTEGER NOT NULL REFERENCES complaint_imports (id),
+            line INTEGER NOT NULL,
+            roll_number TEXT NOT NULL,
+            hostel_block TEXT NOT NULL,
+            room_number TEXT NOT NULL,
+            category TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            description TEXT NOT NULL,
+            status TEXT NOT NULL,
+            staff_assigned TEXT NOT NULL,
+            remarks TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            PRIMARY KEY (import_id, line)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def rollup_upsert_sql(row, at, created="0", still_open="0", resolved="0", seconds="0", when="1"):
+    """Statements adding the given deltas to every granularity's bucket of ``at``."""
+    return "".join(
+        f"""
+        INSERT INTO complaint_rollups (
+            granularity, bucket, hostel_block, category,
+            created, still_open, resolved, resolution_seconds
+        )
+        SELECT '{granularity}', substr({local_time_sql(at)}, 1, {width}), {row}.hostel_block,
+            {label_sql("category", row + ".category")},
+            {created}, {still_open}, {resolved}, {seconds}
+        WHERE {when}
+        ON CONFLICT (granularity, bucket, hostel_block, category) DO UPDATE SET
+            created = created + excluded.created,
+            still_open = still_open + excluded.still_open,
+            resolved = resolved + excluded.resolved,
+            resolution_seconds = resolution_seconds + excluded.resolution_seconds;
+        """
+        for granularity, width in ROLLUP_GRANULARITIES.items()
+    )
+
+
+def resolution_seconds_sql(row, resolved_at):
+    return f"({resolved_at} - {row}.created_at)"
+
+
+def rollup_delete_sql():
+    """Statements taking a deleted complaint (OLD) back out of complaint_rollups."""
+    active = active_statuses_sql()
+    return rollup_upsert_sql(
+        "OLD", "OLD.created_at", created="-1", still_open=f"-(OLD.status IN {active})"
+    ) + rollup_upsert_sql(
+        "OLD",
+        "OLD.resolved_at",
+        resolved="-1",
+        seconds="-" + resolution_seconds_sql("OLD", "OLD.resolved_at"),
+        when="OLD.resolved_at IS NOT NULL",
+    )
+
+
+def migrate_complaint_rollups(db):
+    try:
+        db.execute("ALTER TABLE complaints ADD COLUMN resolved_at TEXT")
+    except sqlite3.OperationalError:
+        pass
+    # Per hour and per day, block and category: complaints filed (bucketed by
+    # created_at) and how many of those are still open, and complaints
+    # resolved with their total time to resolution (bucketed by resolved_at).
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS complaint_rollups (
+            granularity TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            hostel_block TEXT NOT NULL,
+            category TEXT NOT NULL,
+            created INTEGER NOT NULL DEFAULT 0,
+            still_open INTEGER NOT NULL DEFAULT 0,
+            resolved INTEGER NOT NULL DEFAULT 0,
+            resolution_seconds INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (granularity, bucket, hostel_block, category)
+        ) WITHOUT ROWID
+        """
+    )
+    # Backlog age only needs the days that still have open complaints.
+    db.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_complaint_rollups_open
+        ON complaint_rollups (granularity, bucket) WHERE still_open > 0
+        """
+    )
+    active = active_statuses_sql()
+    resolved_now = "COALESCE(NEW.updated_at, CAST(strftime('%s', 'now') AS INTEGER))"
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS complaint_rollups_insert
+        AFTER INSERT ON complaints
+        BEGIN
+            {rollup_upsert_sql("NEW", "NEW.created_at", created="1", still_open=f"NEW.status IN {active}")}
+        END
+        """
+    )
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS complaint_rollups_resolve
+        AFTER UPDATE OF status ON complaints
+        WHEN OLD.status IN {active} AND NEW.status NOT IN {active}
+        BEGIN
+            UPDATE complaints SET resolved_at = {resolved_now} WHERE id = NEW.id;
+            {rollup_upsert_sql("NEW", "NEW.created_at", still_open="-1")}
+            {rollup_upsert_sql("NEW", resolved_now, resolved="1", seconds=resolution_seconds_sql("NEW", resolved_now))}
+        END
+        """
+    )
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS complaint_rollups_reopen
+        AFTER UPDATE OF status ON complaints
+        WHEN OLD.status NOT IN {active} AND NEW.status IN {active}
+        BEGIN
+            UPDATE complaints SET resolved_at = NULL WHERE id = NEW.id;
+            {rollup_upsert_sql("NEW", "NEW.created_at", still_open="1")}
+            {rollup_upsert_sql(
+                "OLD",
+                "OLD.resolved_at",
+                resolved="-1",
+                seconds="-" + resolution_seconds_sql("OLD", "OLD.resolved_at"),
+                when="OLD.resolved_at IS NOT NULL",
+            )}
+        END
+        """
+    )
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS complaint_rollups_delete
+        AFTER DELETE ON complaints
+        BEGIN {rollup_delete_sql()} END
+        """
+    )
+    # Filled by migrate_compact_complaints, once the timestamps are Unix seconds.
+
+
+def create_complaint_event_triggers(db):
+    # Written by triggers, inside the statement that changes the complaint:
+    # a bulk executemany adds its events without another round trip. Events
+    # keep labels and local text times.
+    status = label_sql("status", "NEW.status")
+    staff = f"COALESCE({label_sql('staff_assigned', 'NEW.staff_assigned')}, '')"
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS complaint_events_insert
+        AFTER INSERT ON complaints
+        BEGIN
+            INSERT INTO complaint_events (complaint_id, at, kind, new_value, status, staff)
+            VALUES (
+                NEW.id, {local_time_sql("NEW.created_at")}, 'created', {status}, {status}, {staff}
+            );
+        END
+        """
+    )
+    changes = " UNION ALL ".join(
+        f"SELECT '{field}' AS kind, {label_sql(field, 'OLD.' + field)} AS old_value, "
+        f"{label_sql(field, 'NEW.' + field)} AS new_value"
+        if field in LABELLED_COLUMNS
+        else f"SELECT '{field}' AS kind, OLD.{field} AS old_value, NEW.{field} AS new_value"
+        for field in UPDATABLE_FIELDS
+    )
+    db.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS complaint_events_update
+        AFTER UPDATE OF {", ".join(UPDATABLE_FIELDS)} ON complaints
+        BEGIN
+            INSERT INTO complaint_events (complaint_id, at, kind, old_value, new_value, status, staff)
+            SELECT NEW.id,
+                COALESCE({local_time_sql("NEW.updated_at")}, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')),
+                kind, old_value, new_value, {status}, {staff}
+            FROM ({changes})
+            WHERE old_value IS NOT new_value;
+        END
+        """
+    )
+
+
+def migrate_complaint_events(db):
+    # Append-only history: one row per created complaint and per changed
+    # field. status and staff are the values in effect after the event, so
+    # each row starts an interval that the next event for the complaint ends.
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS complaint_events (
+            id INTEGER PRIMARY KEY,
+            complaint_id INTEGER NOT NULL,
+            at TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            old_value TEXT,
+            new_value TEXT,
+            status TEXT NOT NULL,
+            staff TEXT NOT NULL DEFAULT ''
+        )
+        """
+    )
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_complaint_events_complaint ON complaint_events (complaint_id, at)"
+    )
+    db.execute("CREATE INDEX IF NOT EXISTS idx_complaint_events_at ON complaint_events (at)")
+    create_complaint_event_triggers(db)
+    # Complaints filed before the history existed get a reconstructed one:
+    # created as Pending, then one move to their current status. This runs
+    # before migrate_compact_complaints, while the columns still hold text.
+    db.execute(
+        """
+        INSERT INTO complaint_events (complaint_id, at, kind, new_value, status, staff)
+        SELECT id, created_at, 'created', 'Pending', 'Pending', ''
+        FROM complaints
+        ORDER BY id
+        """
+    )
+    db.execute(
+        """
+        INSERT INTO complaint_events (complaint_id, at, kind, old_value, new_value, status, staff)
+        SELECT id, COALESCE(resolved_at, updated_at, created_at), 'status', 'Pending', status, status,
+            COALESCE(staff_assigned, '')
+        FROM complaints
+        WHERE status <> 'Pending'
+        ORDER BY id
+        """
+    )
+
+
+def migrate_complaint_archives(db):
+    # One row per archive table, so reads know which tables to visit.
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS complaint_archives (
+            term TEXT PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            complaints INTEGER NOT NULL DEFAULT 0,
+            first_created TEXT NOT NULL,
+            last_created TEXT NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    # The ids of the batch being archived, filled and emptied inside the
+    # archiving transaction. Their deletes are moves, not deletions, so the
+    # rollups keep counting them.
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS archive_moving (
+            id INTEGER PRIMARY KEY,
+            term TEXT NOT NULL
+        )
+        """
+    )
+    db.execute("DROP TRIGGER IF EXISTS complaint_rollups_delete")
+    db.execute(
+        f"""
+        CREATE TRIGGER complaint_rollups_delete
+        AFTER DELETE ON complaints
+        WHEN NOT EXISTS (SELECT 1 FROM archive_moving WHERE id = OLD.id)
+        BEGIN {rollup_delete_sql()} END
+        """
+    )
+    # Archival candidates: WHERE status = 'Resolved' AND resolved_at < ?, oldest first.
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_complaints_status_resolved ON complaints (status, resolved_at)"
+    )
+
+
+def migrate_compact_complaints(db):
+    """Store category, status and priority as codes and the timestamps as
+    Unix seconds, in complaints and every archive table."""
+    for column, (table, codes) in CODED_COLUMNS.items():
+        db.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                code INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+            """
+        )
+        db.executemany(
+            f"INSERT OR IGNORE INTO {table} (code, name) VALUES (?, ?)",
+            [(code, name) for name, code in codes.items()],
+        )
+    archive_tables = get_archive_tables(db)
+    # Values written before validation existed get codes after the known ones.
+    for source in ["complaints", *archive_tables]:
+        for column, (table, _) in CODED_COLUMNS.items():
+            db.execute(f"INSERT OR IGNORE INTO {table} (name) SELECT DISTINCT {column} FROM {source}")
+
+    # Keep AUTOINCREMENT from reusing the ids of deleted or archived complaints.
+    sequence = db.execute("SELECT seq FROM sqlite_sequence WHERE name = 'complaints'").fetchone()
+    db.execute(
+        f"""
+        CREATE TABLE complaints_compact (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            roll_number TEXT NOT NULL,
+            hostel_block TEXT NOT NULL,
+            room_number TEXT NOT NULL,
+            category INTEGER NOT NULL,
+            priority INTEGER NOT NULL DEFAULT {PRIORITY_CODES["Medium"]},
+            description TEXT NOT NULL,
+            status INTEGER NOT NULL DEFAULT {STATUS_CODES["Pending"]},
+            staff_assigned TEXT,
+            remarks TEXT,
+            created_at INTEGER NOT NULL,
+            updated_at INTEGER,
+            sort_key INTEGER,
+            resolved_at INTEGER
+        )
+        """
+    )
+    columns = ", ".join(ARCHIVE_COLUMNS)
+    # Staff names stay text here; migrate_reference_tables moves them to ids.
+    encoded = encoded_columns_sql(ARCHIVE_COLUMNS, keep=["staff_assigned"])
+    db.execute(f"INSERT INTO complaints_compact ({columns}) SELECT {encoded} FROM complaints")
+    db.execute("DROP TABLE complaints")
+    db.execute("ALTER TABLE complaints_compact RENAME TO complaints")
+    if sequence is not None:
+        db.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'complaints'", (sequence[0],))
+        db.execute(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'complaints', ? "
+            "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'complaints')",
+            (sequence[0],),
+        )
+    for table in archive_tables:
+        db.execute(f"ALTER TABLE {table} RENAME TO {table}_text")
+        db.execute(f"DROP INDEX IF EXISTS idx_{table}_roll")
+        create_archive_table(db, table)
+        db.execute(f"INSERT INTO {table} ({columns}) SELECT {encoded} FROM {table}_text")
+        db.execute(f"DROP TABLE {table}_text")
+
+    # Dropping the old table dropped its indexes and triggers. The migrations
+    # that made them are idempotent, and recreate them for the new columns.
+    for migration in [
+        migrate_sort_key,
+        migrate_query_indexes,
+        migrate_complaint_counters,
+        migrate_student_active_counts,
+        migrate_change_versions,
+        migrate_complaint_search,
+        migrate_export_index,
+        migrate_complaint_rollups,
+        create_complaint_event_triggers,
+        migrate_complaint_archives,
+    ]:
+        migration(db)
+    rebuild_complaint_rollups(db)
+
+
+def migrate_reference_tables(db):
+    """Reference tables for categories, hostel blocks, rooms and staff, and
+    complaints.staff_assigned as a staff id instead of a name."""
+    # Retired categories stay in the table so old complaints keep their label.
+    db.execute("ALTER TABLE complaint_categories ADD COLUMN active INTEGER NOT NULL DEFAULT 1")
+    placeholders = ", ".join("?" for _ in ALLOWED_CATEGORIES)
+    db.execute(
+        f"UPDATE complaint_categories SET active = 0 WHERE name NOT IN ({placeholders})",
+        ALLOWED_CATEGORIES,
+    )
+    # Blocks and rooms start empty: until a block (or a block's rooms) is
+    # listed, students may type any block (or room), as before.
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS hostel_blocks (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            active INTEGER NOT NULL DEFAULT 1
+        )
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS hostel_rooms (
+            block_id INTEGER NOT NULL REFERENCES hostel_blocks (id),
+            number TEXT NOT NULL,
+            PRIMARY KEY (block_id, number)
+        ) WITHOUT ROWID
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS staff (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            on_duty INTEGER NOT NULL DEFAULT 1,
+            active INTEGER NOT NULL DEFAULT 1
+        )
+        """
+    )
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS staff_skills (
+            staff_id INTEGER NOT NULL REFERENCES staff (id),
+            skill TEXT NOT NULL,
+            PRIMARY KEY (staff_id, skill)
+        ) WITHOUT ROWID
+        """
+    )
+    # Every change moves the 'reference' version, which tells each process
+    # its snapshot is stale.
+    bump = """
+        INSERT INTO change_versions (scope, version) VALUES ('reference', 1)
+        ON CONFLICT (scope) DO UPDATE SET version = version + 1;
+    """
+    for table in REFERENCE_TABLES:
+        for event in ["INSERT", "UPDATE", "DELETE"]:
+            db.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN {bump} END
+                """
+            )
+
+    # Everyone ever assigned becomes a staff member, then complaints keep the
+    # id. The history triggers name the column, and the version trigger would
+    # fire for every row, so they are dropped for the switch and made again.
+    archive_tables = get_archive_tables(db)
+    for source in ["complaints", *archive_tables]:
+        db.execute(
+            f"""
+            INSERT OR IGNORE INTO staff (name)
+            SELECT DISTINCT trim(staff_assigned) FROM {source}
+            WHERE trim(staff_assigned) <> ''
+            ORDER BY 1
+            """
+        )
+    for trigger in ["complaint_events_insert", "complaint_events_update", "change_versions_update"]:
+        db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    for table in ["complaints", *archive_tables]:
+        db.execute(f"ALTER TABLE {table} ADD COLUMN staff_id INTEGER REFERENCES staff (id)")
+        db.execute(
+            f"UPDATE {table} SET staff_id = (SELECT id FROM staff WHERE name = trim({table}.staff_assigned))"
+        )
+        db.execute(f"ALTER TABLE {table} DROP COLUMN staff_assigned")
+        db.execute(f"ALTER TABLE {table} RENAME COLUMN staff_id TO staff_assigned")
+    migrate_change_versions(db)
+    create_complaint_event_triggers(db)
+
+
+def migrate_assignment_inputs(db):
+    """The skill each category needs and each staff member's home block,
+    read by the assignment engine."""
+    db.execute("ALTER TABLE complaint_categories ADD COLUMN skill TEXT")
+    db.executemany(
+        "UPDATE complaint_categories SET skill = ? WHERE name = ?",
+        [(skill, name) for name, skill in DEFAULT_CATEGORY_SKILLS.items()],
+    )
+    db.execute("ALTER TABLE staff ADD COLUMN home_block_id INTEGER REFERENCES hostel_blocks (id)")
+
+
+def migrate_archive_candidates_index(db):
+    # (status, resolved_at) also served WHERE status = ? ORDER BY sort_key and
+    # took the admin status filter off idx_complaints_status_sort, sorting the
+    # whole status on every page. A partial index only matches the archiver's
+    # literal status = Resolved.
+    db.execute("DROP INDEX IF EXISTS idx_complaints_status_resolved")
+    db.execute(
+        f"""
+        CREATE INDEX IF NOT EXISTS idx_complaints_resolved ON complaints (resolved_at)
+        WHERE status = {STATUS_CODES["Resolved"]}
+        """
+    )
+
+
+# Applied in order; the index of the last applied migration + 1 is stored in
+# PRAGMA user_version. Only ever append to this list.
+MIGRATIONS = [
+    migrate_base_schema,
+    migrate_sort_key,
+    migrate_query_indexes,
+    migrate_complaint_counters,
+    migrate_student_active_counts,
+    migrate_change_versions,
+    migrate_complaint_search,
+    migrate_export_index,
+    migrate_complaint_imports,
+    migrate_complaint_rollups,
+    migrate_complaint_events,
+    migrate_complaint_archives,
+    migrate_compact_complaints,
+    migrate_reference_tables,
+    migrate_assignment_inputs,
+    migrate_archive_candidates_index,
+]
+
+
+def run_migrations(db, target=None):
+    if target is None:
+        target = len(MIGRATIONS)
+    current = db.execute("PRAGMA user_version").fetchone()[0]
+    for version in range(current + 1, target + 1):
+        db.execute("BEGIN")
+        try:
+            MIGRATIONS[version - 1](db)
+            db.execute(f"PRAGMA user_version = {version}")
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+    return max(current, target)
+
+
+def init_db():
+    run_migrations(get_db())
+
+
+def student_required(view):
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if not session.get("student_roll"):
+            return redirect(url_for("student_login"))
+        return view(*args, **kwargs)
+
+    return wrapped
+
+
+def admin_required(view):
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        if not session.get("admin_id"):
+            return redirect(url_for("admin_login"))
+        return view(*args, **kwargs)
+
+    return wrapped
+
+
+def status_class(status):
+    if status == "Pending":
+        return "status-pending"
+    if status == "In Progress":
+        return "status-inprogress"
+    return "status-resolved"
+
+
+def priority_class(priority):
+    if priority == "High":
+        return "priority-high"
+    if priority == "Medium":
+        return "priority-medium"
+    return "priority-low"
+
+
+def parse_page_size(value):
+    if value and value.isdigit() and int(value) in PAGE_SIZE_OPTIONS:
+        return int(value)
+    return DEFAULT_PAGE_SIZE
+
+
+def parse_cursor(value):
+    if value and value.isdigit():
+        return int(value)
+    return None
+
+
+def fetch_complaint_page(db, columns, where_clauses, params, page_size, after=None, before=None):
+    """Return one keyset page of complaints ordered by sort_key.
+
+    ``after`` pages forward from a row's sort_key, ``before`` pages backwards.
+    Returns ``(rows, prev_cursor, next_cursor)``; a cursor is None when there
+    is nothing further in that direction.
+    """
+    clauses = list(where_clauses)
+    values = list(params)
+    if before is not None:
+        clauses.append("sort_key < ?")
+        values.append(before)
+        direction = "DESC"
+    else:
+        if after is not None:
+            clauses.append("sort_key > ?")
+            values.append(after)
+        direction = "ASC"
+
+    query = f"SELECT {columns}, sort_key FROM complaints"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += f" ORDER BY sort_key {direction} LIMIT ?"
+    values.append(page_size + 1)
+
+    rows = fetch_complaints(db, query, values)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if before is not None:
+        rows.reverse()
+        prev_cursor = rows[0]["sort_key"] if has_more and rows else None
+        # The last row shown, not ``before``: Next must start right after it.
+        next_cursor = rows[-1]["sort_key"] if rows else None
+    else:
+        prev_cursor = rows[0]["sort_key"] if after is not None and rows else None
+        next_cursor = rows[-1]["sort_key"] if has_more else None
+    return rows, prev_cursor, next_cursor
+
+
+def is_valid_roll_number(roll_number):
+    return re.fullmatch(r"4127\d+", roll_number) is not None
+
+
+def validate_complaint(values, reference):
+    """Check complaint fields the way the student form does.
+
+    ``values`` is any mapping of field names to strings, such as the form or
+    a CSV row; categories, blocks and rooms are checked against the
+    ``reference`` snapshot. Returns ``(complaint, None)`` with the cleaned
+    fields, or ``(None, message)`` for the first rule that fails.
+    """
+    hostel_block = (values.get("hostel_block") or "").strip()
+    room_number = (values.get("room_number") or "").strip().upper()
+    category = (values.get("category") or "").strip()
+    priority = (values.get("priority") or "").strip()
+    description = (values.get("description") or "").strip()
+
+    if category not in reference.categories:
+        return None, "Please select a valid complaint category."
+    if priority not in ALLOWED_PRIORITIES:
+        return None, "Please select a valid priority."
+    if not hostel_block:
+        return None, "Hostel block is required."
+    if len(hostel_block) > 30:
+        return None, "Hostel block must be 30 characters or less."
+    if reference.blocks and hostel_block not in reference.blocks:
+        return None, "Please select a valid hostel block."
+    if not room_number:
+        return None, "Room number is required."
+    if not re.fullmatch(r"[A-Za-z0-9/-]{1,20}", room_number):
+        return None, "Room number can contain letters, numbers, '-' or '/'."
+    rooms = reference.rooms.get(hostel_block)
+    if rooms and room_number not in rooms:
+        return None, f"Room {room_number} is not listed for {hostel_block}."
+    if not description:
+        return None, "Complaint description is required."
+    if len(description) < 10:
+        return None, "Complaint description must be at least 10 characters."
+    if len(description) > MAX_DESCRIPTION_LENGTH:
+        return None, f"Complaint description must be under {MAX_DESCRIPTION_LENGTH} characters."
+    return {
+        "hostel_block": hostel_block,
+        "room_number": room_number,
+        "category": category,
+        "priority": priority,
+        "description": description,
+    }, None
+
+
+def insert_complaint(db, roll_number, complaint, current_time):
+    """Insert a validated complaint unless the student is at the active limit.
+
+    Must run inside a write transaction so the limit check and the insert
+    cannot interleave with another submission. ``current_time`` is Unix
+    seconds. Returns the new complaint id, or None when the limit was reached.
+    """
+    row = db.execute(
+        "SELECT active FROM student_active_counts WHERE roll_number = ?",
+        (roll_number,),
+    ).fetchone()
+    if row and row["active"] >= MAX_ACTIVE_COMPLAINTS:
+        return None
+    cursor = db.execute(
+        """
+        INSERT INTO complaints (
+            roll_number, hostel_block, room_number, category, priority,
+            description, status, remarks, created_at, updated_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, '', ?, ?)
+        """,
+        (
+            roll_number,
+            complaint["hostel_block"],
+            complaint["room_number"],
+            get_reference_data(db).codes["category"][complaint["category"]],
+            PRIORITY_CODES[complaint["priority"]],
+            complaint["description"],
+            STATUS_CODES["Pending"],
+            current_time,
+            current_time,
+        ),
+    )
+    queue_complaint_event(
+        "created",
+        {
+            "id": cursor.lastrowid,
+            **complaint,
+            "status": "Pending",
+            "staff_assigned": None,
+            "remarks": "",
+            "created_at": format_timestamp(current_time),
+            "updated_at": format_timestamp(current_time),
+        },
+        roll_number,
+    )
+    return cursor.lastrowid
+
+
+class GroupCommitWriter:
+    """Single writer thread that commits queued submissions in batches.
+
+    Each submission runs ``insert_complaint`` under its own savepoint, so a
+    failing row does not abort the batch, and the whole batch shares one
+    COMMIT (one fsync). Futures are resolved only after that commit.
+    """
+
+    def __init__(self, pool, max_batch, max_delay_ms, synchronous):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self.synchronous = synchronous
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.submissions = 0
+        self.largest_batch = 0
+        self._thread.start()
+
+    def submit(self, roll_number, complaint, current_time):
+        future = Future()
+        self._queue.put((future, (roll_number, complaint, current_time)))
+        return future
+
+    def _run(self):
+        # A dedicated connection, outside the pool: request threads waiting on
+        # their futures may be holding every pooled connection.
+        conn = self.pool.connect()
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            self._commit_batch(conn, batch)
+
+    def _commit_batch(self, conn, batch):
+        outcomes = []
+        with app.app_context():
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for future, args in batch:
+                    conn.execute("SAVEPOINT submission")
+                    try:
+                        outcomes.append((future, insert_complaint(conn, *args), None))
+                    except Exception as error:
+                        conn.execute("ROLLBACK TO submission")
+                        outcomes.append((future, None, error))
+                    conn.execute("RELEASE submission")
+                conn.commit()
+            except Exception as error:
+                if conn.in_transaction:
+                    conn.rollback()
+                g.pop("pending_events", None)
+                for future, _ in batch:
+                    future.set_exception(error)
+                return
+            publish_pending_events()
+        with self._lock:
+            self.batches += 1
+            self.submissions += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+        for future, complaint_id, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(complaint_id)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "batches": self.batches,
+                "submissions": self.submissions,
+                "largest_batch": self.largest_batch,
+                "mean_batch": round(self.submissions / self.batches, 2) if self.batches else 0,
+            }
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_writer():
+    database = app.config["DATABASE"]
+    with _writers_lock:
+        writer = _writers.get(database)
+        if writer is None:
+            writer = GroupCommitWriter(
+                get_pool(),
+                max_batch=app.config["GROUP_COMMIT_MAX_BATCH"],
+                max_delay_ms=app.config["GROUP_COMMIT_MAX_DELAY_MS"],
+                synchronous=app.config["GROUP_COMMIT_SYNCHRONOUS"],
+            )
+            _writers[database] = writer
+        return writer
+
+
+class AssignmentEngine:
+    """Assigns waiting complaints to staff from one background thread.
+
+    Complaints that are Pending and unassigned wait in one heap per skill,
+    highest priority then oldest first. On-duty staff sit in heaps per skill,
+    and per skill and home block, ordered by their open complaints. Each pass
+    reads complaint_events after the last id it has seen, re-reads only the
+    complaints those events name, and moves them between the waiting set and
+    the staff loads, so a pass costs the changes since the last one rather
+    than a scan. Heap entries are replaced, not updated: an entry whose load
+    or rank no longer matches is dropped when it reaches the top.
+
+    One engine per database assigns at a time: the thread holds a lock file
+    next to the database, and engines in other processes wait on it to take
+    over. Assignments are written through apply_complaint_updates, only to
+    complaints still Pending and unassigned when the write lock is held.
+    """
+
+    def __init__(self, pool, max_open, other_block_load, poll_seconds, batch_rows):
+        self.pool = pool
+        self.max_open = max_open
+        self.other_block_load = other_block_load
+        self.poll_seconds = poll_seconds
+        self.batch_rows = batch_rows
+        self.last_event_id = None
+        self.reference_version = None
+        self.loads = {}
+        self.assigned = {}
+        self.waiting = {}
+        self._ranks = {PRIORITY_CODES[priority]: rank for priority, rank in PRIORITY_RANKS.items()}
+        self._skills = {}
+        self._member_queues = {}
+        self._staff_queues = {}
+        self._queue_members = {}
+        self._waiting_queues = {}
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.leader = False
+        self.passes = 0
+        self.assignments = 0
+        self.conflicts = 0
+        self.errors = 0
+        self.last_pass_ms = 0.0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="assignment-engine", daemon=True)
+                self._thread.start()
+
+    def notify(self):
+        """Run a pass now instead of at the next poll."""
+        self._wake.set()
+
+    def _run(self):
+        with file_lock(self.pool.database + ".assign.lock"):
+            self.leader = True
+            conn = self.pool.connect()
+            while True:
+                try:
+                    with app.app_context():
+                        self.step(conn)
+                except sqlite3.Error as error:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    with self._lock:
+                        self.errors += 1
+                    app.logger.warning("Assignment pass failed: %s", error)
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+    def step(self, conn):
+        """One pass: follow complaint changes, then assign what can be.
+
+        Needs an app context. Returns the number of complaints assigned.
+        """
+        started = time.perf_counter()
+        reference = get_reference_data(conn)
+        if self.last_event_id is None:
+            self._load(conn)
+            self._rebuild(reference)
+        else:
+            if reference.version != self.reference_version:
+                self._rebuild(reference)
+            self._follow(conn)
+        decisions = self._plan()
+        assigned = self._write(conn, reference, decisions) if decisions else 0
+        with self._lock:
+            self.passes += 1
+            self.assignments += assigned
+            self.conflicts += len(decisions) - assigned
+            self.last_pass_ms = (time.perf_counter() - started) * 1000
+        return assigned
+
+    def _load(self, conn):
+        # The events high-water mark and the open complaints come from one
+        # read transaction, so following from the mark misses nothing.
+        conn.execute("BEGIN")
+        try:
+            last_event_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM complaint_events").fetchone()[0]
+            rows = conn.execute(
+                f"""
+                SELECT id, category, hostel_block, priority, status, staff_assigned
+                FROM complaints
+                WHERE status IN ({", ".join("?" for _ in ACTIVE_STATUSES)})
+                """,
+                [STATUS_CODES[status] for status in ACTIVE_STATUSES],
+            ).fetchall()
+        finally:
+            conn.rollback()
+        for row in rows:
+            self._track(row["id"], row)
+        self.last_event_id = last_event_id
+
+    def _follow(self, conn):
+        while True:
+            rows = conn.execute(
+                "SELECT id, complaint_id FROM complaint_events WHERE id > ? ORDER BY id LIMIT ?",
+                (self.last_event_id, self.batch_rows),
+            ).fetchall()
+            if not rows:
+                return
+            self._refresh(conn, list(dict.fromkeys(row["complaint_id"] for row in rows)))
+            self.last_event_id = rows[-1]["id"]
+            if len(rows) < self.batch_rows:
+                return
+
+    def _refresh(self, conn, complaint_ids):
+        for start in range(0, len(complaint_ids), 500):
+            chunk = complaint_ids[start : start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            found = {
+                row["id"]: row
+                for row in conn.execute(
+                    f"""
+                    SELECT id, category, hostel_block, priority, status, staff_assigned
+                    FROM complaints
+                    WHERE id IN ({placeholders})
+                    """,
+                    chunk,
+                )
+            }
+            for complaint_id in chunk:
+                self._track(complaint_id, found.get(complaint_id))
+
+    def _track(self, complaint_id, row):
+        """Make the engine's view of one complaint match ``row`` (None: gone)."""
+        staff_id = self.assigned.pop(complaint_id, None)
+        if staff_id is not None:
+            self._add_load(staff_id, -1)
+        self.waiting.pop(complaint_id, None)
+        if row is None or row["status"] not in (STATUS_CODES["Pending"], STATUS_CODES["In Progress"]):
+            return
+        if row["staff_assigned"] is not None:
+            self.assigned[complaint_id] = row["staff_assigned"]
+            self._add_load(row["staff_assigned"], 1)
+        elif row["status"] == STATUS_CODES["Pending"]:
+            entry = (self._ranks.get(row["priority"], len(self._ranks) + 1), row["category"], row["hostel_block"])
+            self.waiting[complaint_id] = entry
+            skill = self._skills.get(row["category"])
+            if skill is not None:
+                heapq.heappush(self._waiting_queues.setdefault(skill, []), (entry[0], complaint_id))
+
+    def _add_load(self, staff_id, delta):
+        load = self.loads.get(staff_id, 0) + delta
+        if load:
+            self.loads[staff_id] = load
+        else:
+            self.loads.pop(staff_id, None)
+        for key in self._member_queues.get(staff_id, ()):
+            entries = self._staff_queues[key]
+            if len(entries) > 2 * len(self._queue_members[key]) + 64:
+                entries[:] = [(self.loads.get(member, 0), member) for member in self._queue_members[key]]
+                heapq.heapify(entries)
+            else:
+                heapq.heappush(entries, (load, staff_id))
+
+    def _rebuild(self, reference):
+        """Rebuild the heaps for a new reference snapshot."""
+        category_codes = reference.codes["category"]
+        self._skills = {
+            category_codes[category]: skill.casefold() for category, skill in reference.category_skills.items()
+        }
+        self._member_queues = {}
+        self._queue_members = {}
+        for member in reference.staff.values():
+            if not (member.active and member.on_duty):
+                continue
+            keys = []
+            for skill in {skill.casefold() for skill in member.skills}:
+                keys.append((skill, None))
+                if member.home_block:
+                    keys.append((skill, member.home_block))
+            self._member_queues[member.id] = keys
+            for key in keys:
+                self._queue_members.setdefault(key, []).append(member.id)
+        self._staff_queues = {
+            key: [(self.loads.get(member, 0), member) for member in members]
+            for key, members in self._queue_members.items()
+        }
+        self._waiting_queues = {}
+        for complaint_id, (rank, category, _) in self.waiting.items():
+            skill = self._skills.get(category)
+            if skill is not None:
+                self._waiting_queues.setdefault(skill, []).append((rank, complaint_id))
+        for entries in [*self._staff_queues.values(), *self._waiting_queues.values()]:
+            heapq.heapify(entries)
+        self.reference_version = reference.version
+
+    def _least_loaded(self, key):
+        entries = self._staff_queues.get(key)
+        while entries:
+            load, staff_id = entries[0]
+            if self.loads.get(staff_id, 0) == load:
+                return load, staff_id
+            heapq.heappop(entries)
+        return None
+
+    def _pick(self, skill, block):
+        best = self._least_loaded((skill, None))
+        if best is None or best[0] >= self.max_open:
+            return None
+        if block:
+            local = self._least_loaded((skill, block))
+            if local is not None and local[0] < self.max_open and local[0] <= best[0] + self.other_block_load:
+                return local[1]
+        return best[1]
+
+    def _next_waiting(self, skill):
+        entries = self._waiting_queues[skill]
+        while entries:
+            rank, complaint_id = entries[0]
+            entry = self.waiting.get(complaint_id)
+            if entry is not None and entry[0] == rank:
+                return rank, complaint_id
+            heapq.heappop(entries)
+        return None
+
+    def _plan(self):
+        """Choose staff for waiting complaints, highest priority first across
+        skills, and count them in the loads. Returns (complaint id, staff id)
+        pairs."""
+        decisions = []
+        skills = set(self._waiting_queues)
+        while skills:
+            candidates = []
+            for skill in list(skills):
+                head = self._next_waiting(skill)
+                if head is None:
+                    skills.discard(skill)
+                else:
+                    candidates.append((head, skill))
+            if not candidates:
+                break
+            (_, complaint_id), skill = min(candidates)
+            staff_id = self._pick(skill, self.waiting[complaint_id][2])
+            if staff_id is None:
+                skills.discard(skill)
+                continue
+            heapq.heappop(self._waiting_queues[skill])
+            del self.waiting[complaint_id]
+            self.assigned[complaint_id] = staff_id
+            self._add_load(staff_id, 1)
+            decisions.append((complaint_id, staff_id))
+        return decisions
+
+    def _write(self, conn, reference, decisions):
+        names = {member.id: member.name for member in reference.staff.values()}
+        complaint_ids = [complaint_id for complaint_id, _ in decisions]
+        still_waiting = set()
+        try:
+            with immediate_transaction(conn):
+                for start in range(0, len(complaint_ids), 500):
+                    chunk = complaint_ids[start : start + 500]
+                    placeholders = ", ".join("?" for _ in chunk)
+                    still_waiting.update(
+                        row["id"]
+                        for row in conn.execute(
+                            f"""
+                            SELECT id FROM complaints
+                            WHERE id IN ({placeholders}) AND status = ? AND staff_assigned IS NULL
+                            """,
+                            [*chunk, STATUS_CODES["Pending"]],
+                        )
+                    )
+                by_staff = {}
+                for complaint_id, staff_id in decisions:
+                    if complaint_id in still_waiting:
+                        by_staff.setdefault(staff_id, []).append(complaint_id)
+                current_time = int(time.time())
+                for staff_id, ids in by_staff.items():
+                    apply_complaint_updates(conn, ids, {"staff_assigned": names[staff_id]}, current_time)
+        except BaseException:
+            self._refresh(conn, complaint_ids)
+            raise
+        # Someone else changed these first; read them back as they are now.
+        self._refresh(conn, [complaint_id for complaint_id in complaint_ids if complaint_id not in still_waiting])
+        return len(still_waiting)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "leader": self.leader,
+                "waiting": len(self.waiting),
+                "open_assigned": len(self.assigned),
+                "passes": self.passes,
+                "assignments": self.assignments,
+                "conflicts": self.conflicts,
+                "errors": self.errors,
+                "last_pass_ms": round(self.last_pass_ms, 3),
+                "last_event_id": self.last_event_id,
+            }
+
+
+_assignment_engines = {}
+_assignment_engines_lock = threading.Lock()
+
+
+def get_assignment_engine():
+    database = app.config["DATABASE"]
+    with _assignment_engines_lock:
+        engine = _assignment_engines.get(database)
+        if engine is None:
+            engine = AssignmentEngine(
+                get_pool(),
+                max_open=app.config["AUTO_ASSIGN_MAX_OPEN"],
+                other_block_load=app.config["AUTO_ASSIGN_OTHER_BLOCK_LOAD"],
+                poll_seconds=app.config["AUTO_ASSIGN_POLL_SECONDS"],
+                batch_rows=app.config["AUTO_ASSIGN_BATCH_ROWS"],
+            )
+            engine.start()
+            _assignment_engines[database] = engine
+        return engine
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets: ``burst`` tokens, refilled at ``per_minute``."""
+
+    def __init__(self, burst, per_minute, max_keys):
+        self.burst = burst
+        self.rate = per_minute / 60
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def acquire(self, key):
+        """Take one token for ``key``; return 0 or the seconds until one is free."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._prune(now)
+                bucket = self._buckets[key] = [float(self.burst), now]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0
+            self.rejected += 1
+            return (1 - bucket[0]) / self.rate
+
+    def _prune(self, now):
+        # A bucket that has refilled completely is the same as no bucket.
+        full_after = self.burst / self.rate
+        for key, (_, stamp) in list(self._buckets.items()):
+            if now - stamp >= full_after:
+                del self._buckets[key]
+        if len(self._buckets) >= self.max_keys:
+            oldest = sorted(self._buckets, key=lambda key: self._buckets[key][1])
+            for key in oldest[: len(oldest) - self.max_keys + 1]:
+                del self._buckets[key]
+
+    def stats(self):
+        with self._lock:
+            return {"keys": len(self._buckets), "rejected": self.rejected}
+
+
+_auth_limiters = None
+_auth_limiters_lock = threading.Lock()
+
+
+def get_auth_limiters():
+    global _auth_limiters
+    with _auth_limiters_lock:
+        if _auth_limiters is None:
+            max_keys = app.config["ADMIN_AUTH_LIMITER_MAX_KEYS"]
+            _auth_limiters = {
+                "ip": TokenBucketLimiter(
+                    app.config["ADMIN_AUTH_IP_BURST"], app.config["ADMIN_AUTH_IP_PER_MINUTE"], max_keys
+                ),
+                "username": TokenBucketLimiter(
+                    app.config["ADMIN_AUTH_USER_BURST"], app.config["ADMIN_AUTH_USER_PER_MINUTE"], max_keys
+                ),
+            }
+        return _auth_limiters
+
+
+def admin_auth_retry_after(username):
+    """Charge one attempt to the client IP (see PROXY_FIX_X_FOR) and the
+    username; 0 if allowed."""
+    limiters = get_auth_limiters()
+    wait = limiters["ip"].acquire(request.remote_addr or "unknown")
+    if not wait and username:
+        wait = limiters["username"].acquire(username.lower())
+    return wait
+
+
+class HashPoolBusyError(RuntimeError):
+    """Raised when the password hashing queue is full."""
+
+
+class PasswordHasher:
+    """Runs password hashing on a few worker threads with a bounded queue.
+
+    hashlib's scrypt and pbkdf2 release the GIL, so request threads keep
+    serving while a hash runs; the bound stops a burst of logins from
+    queueing unbounded CPU work.
+    """
+
+    def __init__(self, workers, queue_limit, timeout):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+
+    def run(self, function, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashPoolBusyError("Password hashing queue is full.")
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._done)
+        return future.result(timeout=self.timeout)
+
+    def _done(self, future):
+        self._slots.release()
+        with self._lock:
+            self.completed += 1
+
+    def stats(self):
+        with self._lock:
+            return {"completed": self.completed, "rejected": self.rejected}
+
+
+_password_hasher = None
+_password_hasher_lock = threading.Lock()
+
+
+def get_password_hasher():
+    global _password_hasher
+    with _password_hasher_lock:
+        if _password_hasher is None:
+            _password_hasher = PasswordHasher(
+                workers=app.config["PASSWORD_HASH_WORKERS"],
+                queue_limit=app.config["PASSWORD_HASH_QUEUE_LIMIT"],
+                timeout=app.config["PASSWORD_HASH_TIMEOUT"],
+            )
+        return _password_hasher
+
+
+def hash_password(password):
+    method = app.config["PASSWORD_HASH_METHOD"]
+    return get_password_hasher().run(generate_password_hash, password, method)
+
+
+def verify_password(password_hash, password):
+    return get_password_hasher().run(check_password_hash, password_hash, password)
+
+
+@lru_cache(maxsize=8)
+def hash_method_prefix(method):
+    # werkzeug fills in default parameters, so compare against what it stores.
+    return generate_password_hash("", method).split("$", 1)[0]
+
+
+def password_needs_rehash(password_hash):
+    return password_hash.split("$", 1)[0] != hash_method_prefix(app.config["PASSWORD_HASH_METHOD"])
+
+
+def auth_throttled(template, wait):
+    flash(f"Too many attempts. Try again in {max(1, round(wait))} seconds.")
+    response = app.make_response((render_template(template), 429))
+    response.headers["Retry-After"] = str(max(1, round(wait)))
+    return response
+
+
+class MemoryCache:
+    """LRU cache of versioned byte strings in this process, capped at
+    ``max_bytes`` of values.
+
+    An entry is only returned for the version it was stored with; a newer
+    version on read drops it and counts as an invalidation.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._remove(key)
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def set(self, key, version, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, value)
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+class FileCache:
+    """The same cache kept in a SQLite file, shared by every worker process on
+    the host (point ``path`` at /dev/shm to keep it in memory).
+
+    An entry's last use is refreshed at most once a second, so most hits are
+    reads only and recency is exact to about a second. Hit and miss counts are per process.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_used ON cache (used)")
+
+    def get(self, key, version):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, value, used FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[0] == version:
+                if row[2] < now - 1:
+                    self._conn.execute("UPDATE cache SET used = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return row[1]
+            if row is not None:
+                self._conn.execute("DELETE FROM cache WHERE key = ? AND version = ?", (key, row[0]))
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def set(self, key, version, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, version, value, size, used) VALUES (?, ?, ?, ?, ?)",
+                    (key, version, value, len(value), time.time()),
+                )
+                excess = self._conn.execute("SELECT SUM(size) FROM cache").fetchone()[0] - self.max_bytes
+                while excess > 0:
+                    key, size = self._conn.execute("SELECT key, size FROM cache ORDER BY used LIMIT 1").fetchone()
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    excess -= size
+                    self.evictions += 1
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "backend": "file",
+                "path": self.path,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+            }
+
+
+_history_cache = None
+_history_cache_lock = threading.Lock()
+
+
+def get_history_cache():
+    """The student history cache for this process, or None when disabled."""
+    global _history_cache
+    backend = app.config["HISTORY_CACHE_BACKEND"]
+    if backend == "none":
+        return None
+    with _history_cache_lock:
+        if _history_cache is None:
+            max_bytes = app.config["HISTORY_CACHE_MAX_BYTES"]
+            if backend == "file":
+                path = app.config["HISTORY_CACHE_PATH"] or app.config["DATABASE"] + ".history-cache"
+                _history_cache = FileCache(path, max_bytes)
+            elif backend == "memory":
+                _history_cache = MemoryCache(max_bytes)
+            else:
+                raise ValueError(f"Unknown HISTORY_CACHE_BACKEND {backend!r}.")
+        return _history_cache
+
+
+class Histogram:
+    """Prometheus-style cumulative histogram, one series per label value."""
+
+    BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, help_text, label):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, label_value, seconds):
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * len(self.BUCKETS), 0, 0.0]
+            for index, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    series[0][index] += 1
+            series[1] += 1
+            series[2] += seconds
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_value, (buckets, count, total) in sorted(self._series.items()):
+                label = f'{self.label}="{label_value}"'
+                for bound, bucket_count in zip(self.BUCKETS, buckets):
+                    lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{label}}} {total:.6f}")
+                lines.append(f"{self.name}_count{{{label}}} {count}")
+        return lines
+
+
+request_duration = Histogram(
+    "hostel_request_duration_seconds", "Time spent handling a request.", "endpoint"
+)
+request_sql_duration = Histogram(
+    "hostel_request_sql_duration_seconds", "Time spent in SQL statements per request.", "endpoint"
+)
+request_render_duration = Histogram(
+    "hostel_request_render_duration_seconds", "Time spent rendering templates per request.", "endpoint"
+)
+slow_queries = deque(maxlen=app.config["SLOW_QUERY_LOG_SIZE"])
+slow_query_count = 0
+# Request threads record slow queries concurrently; the count and the log
+# change together under this lock.
+_slow_queries_lock = threading.Lock()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection that times every statement and captures the plan of slow ones."""
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(sql, parameters, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._record(sql, None, time.perf_counter() - started)
+
+    def _record(self, sql, parameters, seconds):
+        global slow_query_count
+        if has_app_context() and "sql_seconds" in g:
+            g.sql_seconds += seconds
+        if seconds * 1000 < app.config["SLOW_QUERY_MS"]:
+            return
+        plan = []
+        statement = sql.strip()
+        if parameters is not None and (statement.split(None, 1) or [""])[0].upper() in {
+            "SELECT",
+            "UPDATE",
+            "DELETE",
+            "INSERT",
+            "WITH",
+        }:
+            try:
+                plan = [row[3] for row in super().execute("EXPLAIN QUERY PLAN " + statement, parameters)]
+            except sqlite3.Error:
+                pass
+        endpoint = request.endpoint if has_request_context() else None
+        with _slow_queries_lock:
+            slow_query_count += 1
+            slow_queries.append(
+                {
+                    "at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "endpoint": endpoint,
+                    "ms": round(seconds * 1000, 3),
+                    "sql": " ".join(statement.split()),
+                    "plan": plan,
+                }
+            )
+        app.logger.warning("Slow query (%.1f ms) in %s: %s %s", seconds * 1000, endpoint, " ".join(statement.split()), plan)
+
+
+class StackSampler:
+    """Samples the stacks of in-flight requests from one background thread.
+
+    Requests register their thread on start; every ``interval`` the sampler
+    walks ``sys._current_frames()`` for those threads and counts collapsed
+    stacks. Slow requests dump their counts in flamegraph.pl's folded format.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active = {}
+        self._thread = None
+
+    def start_request(self):
+        ident = threading.get_ident()
+        with self._lock:
+            self._active[ident] = {}
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def finish_request(self):
+        with self._lock:
+            return self._active.pop(threading.get_ident(), {})
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, stacks in self._active.items():
+                    frame = frames.get(ident)
+                    if frame is None:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                        frame = frame.f_back
+                    key = ";".join(reversed(stack))
+                    stacks[key] = stacks.get(key, 0) + 1
+
+
+stack_sampler = StackSampler(app.config["PROFILE_INTERVAL_MS"] / 1000)
+
+
+def dump_profile(endpoint, seconds, stacks):
+    os.makedirs(app.config["PROFILE_DIR"], exist_ok=True)
+    filename = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{endpoint}-{int(seconds * 1000)}ms.folded"
+    path = os.path.join(app.config["PROFILE_DIR"], filename)
+    with open(path, "w", encoding="utf-8") as handle:
+        for stack, count in sorted(stacks.items()):
+            handle.write(f"{stack} {count}\n")
+    return path
+
+
+@app.before_request
+def start_instrumentation():
+    if not app.config["INSTRUMENTATION_ENABLED"]:
+        return
+    g.request_started = time.perf_counter()
+    g.sql_seconds = 0.0
+    g.render_seconds = 0.0
+    stack_sampler.start_request()
+
+
+@app.before_request
+def start_assignment_engine():
+    # Every worker starts one; all but one wait on its lock file to take over.
+    if app.config["AUTO_ASSIGN_ENABLED"]:
+        get_assignment_engine()
+
+
+@app.teardown_request
+def finish_instrumentation(exception):
+    if "request_started" not in g:
+        return
+    seconds = time.perf_counter() - g.pop("request_started")
+    stacks = stack_sampler.finish_request()
+    endpoint = request.endpoint or "unmatched"
+    request_duration.observe(endpoint, seconds)
+    request_sql_duration.observe(endpoint, g.pop("sql_seconds", 0.0))
+    request_render_duration.observe(endpoint, g.pop("render_seconds", 0.0))
+    if seconds * 1000 >= app.config["PROFILE_THRESHOLD_MS"] and stacks:
+        path = dump_profile(endpoint, seconds, stacks)
+        app.logger.warning("Slow request %s (%.0f ms); stacks written to %s", endpoint, seconds * 1000, path)
+
+
+def time_render_start(sender, template, context, **extra):
+    if "render_seconds" in g:
+        g.render_started = time.perf_counter()
+
+
+def time_render_end(sender, template, context, **extra):
+    if "render_started" in g:
+        g.render_seconds += time.perf_counter() - g.pop("render_started")
+
+
+before_render_template.connect(time_render_start, app)
+template_rendered.connect(time_render_end, app)
+
+
+def prometheus_metrics():
+    lines = []
+    for histogram in (request_duration, request_sql_duration, request_render_duration):
+        lines.extend(histogram.render())
+    lines += [
+        "# HELP hostel_slow_queries_total Statements slower than SLOW_QUERY_MS.",
+        "# TYPE hostel_slow_queries_total counter",
+        f"hostel_slow_queries_total {slow_query_count}",
+    ]
+    pool_stats = get_pool().stats()
+    for key in ("size", "opened", "in_use", "idle"):
+        lines.append(f"# TYPE hostel_db_pool_{key} gauge")
+        lines.append(f"hostel_db_pool_{key} {pool_stats[key]}")
+    for key in ("checkouts", "waits", "timeouts", "discarded"):
+        lines.append(f"# TYPE hostel_db_pool_{key}_total counter")
+        lines.append(f"hostel_db_pool_{key}_total {pool_stats[key]}")
+    for key in ("wait_seconds", "checkout_seconds"):
+        lines.append(f"# TYPE hostel_db_pool_{key}_total counter")
+        lines.append(f"hostel_db_pool_{key}_total {pool_stats[key + '_total']}")
+    hub_stats = event_hub.stats()
+    lines += [
+        "# TYPE hostel_sse_subscribers gauge",
+        f"hostel_sse_subscribers {hub_stats['subscribers']}",
+        "# TYPE hostel_sse_events_published_total counter",
+        f"hostel_sse_events_published_total {hub_stats['published']}",
+    ]
+    cache = get_history_cache()
+    if cache is not None:
+        cache_stats = cache.stats()
+        for key in ("entries", "bytes"):
+            lines.append(f"# TYPE hostel_history_cache_{key} gauge")
+            lines.append(f"hostel_history_cache_{key} {cache_stats[key]}")
+        for key in ("hits", "misses", "invalidations", "evictions"):
+            lines.append(f"# TYPE hostel_history_cache_{key}_total counter")
+            lines.append(f"hostel_history_cache_{key}_total {cache_stats[key]}")
+    if app.config["GROUP_COMMIT_ENABLED"]:
+        writer_stats = get_writer().stats()
+        lines += [
+            "# TYPE hostel_write_queue_depth gauge",
+            f"hostel_write_queue_depth {writer_stats['queued']}",
+            "# TYPE hostel_write_queue_batches_total counter",
+            f"hostel_write_queue_batches_total {writer_stats['batches']}",
+            "# TYPE hostel_write_queue_submissions_total counter",
+            f"hostel_write_queue_submissions_total {writer_stats['submissions']}",
+        ]
+    if app.config["AUTO_ASSIGN_ENABLED"]:
+        engine_stats = get_assignment_engine().stats()
+        for key in ("waiting", "open_assigned"):
+            lines.append(f"# TYPE hostel_assignment_{key} gauge")
+            lines.append(f"hostel_assignment_{key} {engine_stats[key]}")
+        for key in ("assignments", "conflicts", "errors"):
+            lines.append(f"# TYPE hostel_assignment_{key}_total counter")
+            lines.append(f"hostel_assignment_{key}_total {engine_stats[key]}")
+    return "\n".join(lines) + "\n"
+
+
+def fts_match_expression(text):
+    """Quote each word so user input can never be parsed as FTS5 syntax."""
+    return " ".join(f'"{token}"' for token in re.findall(r"\w+", text))
+
+
+def search_complaints(db, text, where_clauses, params, page_size, offset=0):
+    """Full-text search over description and remarks, best bm25 match first.
+
+    ``where_clauses`` are the usual admin filters. Returns
+    ``(rows, prev_offset, next_offset)``.
+    """
+    match = fts_match_expression(text)
+    if not match:
+        return [], None, None
+    query = f"""
+        SELECT {", ".join("c." + column for column in COMPLAINT_COLUMNS)}
+        FROM complaints_fts
+        JOIN complaints AS c ON c.id = complaints_fts.rowid
+        WHERE complaints_fts MATCH ?
+    """
+    for clause in where_clauses:
+        query += f" AND c.{clause}"
+    # Description matches count double relative to admin remarks.
+    query += " ORDER BY bm25(complaints_fts, 2.0, 1.0), c.id DESC LIMIT ? OFFSET ?"
+    rows = fetch_complaints(db, query, [match, *params, page_size + 1, offset])
+    next_offset = offset + page_size if len(rows) > page_size else None
+    prev_offset = max(offset - page_size, 0) if offset > 0 else None
+    return rows[:page_size], prev_offset, next_offset
+
+
+class Complaint:
+    """One complaints row as read: labels for the coded columns, the staff
+    member's name, Unix seconds for the timestamps. ``row["status"]`` works as
+    on a sqlite3.Row; columns the query did not select are None."""
+
+    __slots__ = (*COMPLAINT_COLUMNS, "roll_number", "sort_key")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def __getitem__(self, column):
+        return getattr(self, column)
+
+
+class StaffMember:
+    __slots__ = ("id", "name", "on_duty", "active", "home_block", "skills")
+
+    def __init__(self, id, name, on_duty, active, home_block, skills):
+        self.id = id
+        self.name = name
+        self.on_duty = bool(on_duty)
+        self.active = bool(active)
+        self.home_block = home_block
+        self.skills = skills
+
+
+class ReferenceData:
+    """A read-only snapshot of the reference tables.
+
+    ``labels`` maps each of the LABELLED_COLUMNS to ``{key: label}`` and
+    ``codes`` maps it back. ``categories`` and ``blocks`` are the active names
+    offered on forms, ``rooms`` the listed rooms of each block,
+    ``category_skills`` the skill each category needs (where one is set) and
+    ``staff`` every staff member by name. Keys never change meaning, so a
+    snapshot is only ever missing rows added since it was read.
+    """
+
+    __slots__ = (
+        "version",
+        "labels",
+        "codes",
+        "categories",
+        "blocks",
+        "rooms",
+        "category_skills",
+        "staff",
+        "checked_at",
+    )
+
+    def __init__(self, db):
+        self.version = get_change_version(db, "reference")
+        self.labels = {
+            column: {row[0]: row[1] for row in db.execute(f"SELECT {key}, name FROM {table} ORDER BY {key}")}
+            for column, (table, key) in LABELLED_COLUMNS.items()
+        }
+        self.codes = {
+            column: {label: key for key, label in labels.items()} for column, labels in self.labels.items()
+        }
+        self.categories = [
+            row[0] for row in db.execute("SELECT name FROM complaint_categories WHERE active ORDER BY code")
+        ]
+        self.blocks = [row[0] for row in db.execute("SELECT name FROM hostel_blocks WHERE active ORDER BY name")]
+        self.rooms = {}
+        for block, number in db.execute(
+            """
+            SELECT b.name, r.number
+            FROM hostel_rooms AS r JOIN hostel_blocks AS b ON b.id = r.block_id
+            ORDER BY b.name, length(r.number), r.number
+            """
+        ):
+            self.rooms.setdefault(block, []).append(number)
+        self.category_skills = {
+            row[0]: row[1] for row in db.execute("SELECT name, skill FROM complaint_categories WHERE skill IS NOT NULL")
+        }
+        skills = {}
+        for staff_id, skill in db.execute("SELECT staff_id, skill FROM staff_skills ORDER BY skill"):
+            skills.setdefault(staff_id, []).append(skill)
+        self.staff = {
+            row[1]: StaffMember(*row, skills.get(row[0], []))
+            for row in db.execute(
+                """
+                SELECT s.id, s.name, s.on_duty, s.active, b.name
+                FROM staff AS s LEFT JOIN hostel_blocks AS b ON b.id = s.home_block_id
+                ORDER BY s.name
+                """
+            )
+        }
+        self.checked_at = time.monotonic()
+
+    @property
+    def all_categories(self):
+        """Every category, retired ones included, for filters over old complaints."""
+        return list(self.labels["category"].values())
+
+    @property
+    def active_staff(self):
+        return [member for member in self.staff.values() if member.active]
+
+
+_reference_data = {}
+
+
+def get_reference_data(db, refresh=False):
+    """This process's ReferenceData for the database.
+
+    The stored 'reference' version is compared at most every
+    REFERENCE_REFRESH_SECONDS, and the tables are read again only when it
+    moved. ``refresh`` checks now, for a key the snapshot does not know yet.
+    """
+    database = app.config["DATABASE"]
+    snapshot = _reference_data.get(database)
+    now = time.monotonic()
+    if (
+        snapshot is not None
+        and not refresh
+        and now - snapshot.checked_at < app.config["REFERENCE_REFRESH_SECONDS"]
+    ):
+        return snapshot
+    if snapshot is None or get_change_version(db, "reference") != snapshot.version:
+        snapshot = ReferenceData(db)
+        _reference_data[database] = snapshot
+    snapshot.checked_at = now
+    return snapshot
+
+
+def invalidate_reference_data():
+    """Make this process read the reference tables again on next use."""
+    _reference_data.pop(app.config["DATABASE"], None)
+
+
+def format_timestamp(seconds):
+    """Unix seconds as local ``YYYY-MM-DD HH:MM:SS``; None stays None."""
+    if seconds is None:
+        return None
+    return time.strftime(TIMESTAMP_FORMAT, time.localtime(seconds))
+
+
+def parse_timestamp(text):
+    """Local ``YYYY-MM-DD HH:MM:SS`` as Unix seconds."""
+    return int(datetime.strptime(text, TIMESTAMP_FORMAT).timestamp())
+
+
+def decode_complaints(reference, columns, rows):
+    """Complaint rows from raw result rows; KeyError for a key ``reference``
+    does not know."""
+    decoders = [reference.labels.get(column) for column in columns]
+    return [
+        Complaint(
+            **{
+                column: value if decoder is None or value is None else decoder[value]
+                for column, value, decoder in zip(columns, values, decoders)
+            }
+        )
+        for values in rows
+    ]
+
+
+def fetch_complaints(db, query, params=()):
+    """Run a SELECT over complaints or an archive table; returns Complaint rows
+    keyed by the result column names, with the keys decoded."""
+    cursor = db.execute(query, params)
+    columns = [description[0] for description in cursor.description]
+    rows = cursor.fetchall()
+    try:
+        return decode_complaints(get_reference_data(db), columns, rows)
+    except KeyError:
+        # Written by another process since this one's snapshot was read.
+        return decode_complaints(get_reference_data(db, refresh=True), columns, rows)
+
+
+def fetch_student_complaints(db, roll_number, include_archived=False):
+    tables = ["complaints"]
+    if include_archived:
+        tables += get_archive_tables(db)
+    query = " UNION ALL ".join(
+        f"SELECT {', '.join(COMPLAINT_COLUMNS)} FROM {table} WHERE roll_number = ?" for table in tables
+    )
+    return fetch_complaints(db, query + " ORDER BY id DESC", [roll_number] * len(tables))
+
+
+def complaint_to_dict(row):
+    """A Complaint as JSON-ready values, timestamps as local text."""
+    complaint = {column: row[column] for column in COMPLAINT_COLUMNS}
+    complaint["created_at"] = format_timestamp(complaint["created_at"])
+    complaint["updated_at"] = format_timestamp(complaint["updated_at"])
+    return complaint
+
+
+def get_change_version(db, scope):
+    row = db.execute("SELECT version FROM change_versions WHERE scope = ?", (scope,)).fetchone()
+    return row["version"] if row else 0
+
+
+def student_scope(roll_number):
+    return f"student:{roll_number}"
+
+
+def render_student_history(db, roll_number, include_archived=False):
+    """The student's history table as HTML, from the history cache while
+    their change version is unchanged.
+
+    Triggers bump the version in the same transaction as any insert, update,
+    import or archival touching the student's complaints. It is read before
+    the rows, so a write that commits in between leaves the new rows cached
+    under the old version, where no later request will look.
+    """
+    cache = get_history_cache()
+    key = f"{roll_number}|{int(include_archived)}"
+    version = get_change_version(db, student_scope(roll_number))
+    if cache is not None:
+        cached = cache.get(key, version)
+        if cached is not None:
+            return Markup(cached.decode("utf-8"))
+    html = render_template(
+        "student_history.html",
+        complaints=fetch_student_complaints(db, roll_number, include_archived),
+    )
+    if cache is not None:
+        cache.set(key, version, html.encode("utf-8"))
+    return Markup(html)
+
+
+def build_complaint_filters(reference, status_filter, category_filter, priority_filter):
+    """Turn the admin filter values into SQL clauses.
+
+    Returns ``(where_clauses, params, filters)``; unknown filter values are
+    reported back as "All". Retired categories can still be filtered on.
+    """
+    where_clauses = []
+    params = []
+    filters = {}
+    for column, value, allowed in [
+        ("status", status_filter, ALLOWED_STATUSES),
+        ("category", category_filter, reference.all_categories),
+        ("priority", priority_filter, ALLOWED_PRIORITIES),
+    ]:
+        if value in allowed:
+            where_clauses.append(f"{column} = ?")
+            params.append(reference.codes[column][value])
+        else:
+            value = "All"
+        filters[column] = value
+    return where_clauses, params, filters
+
+
+def parse_export_date(value):
+    """Parse a ``YYYY-MM-DD`` export bound; blank means unbounded."""
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+def add_date_range(where_clauses, params, date_from, date_to):
+    """Restrict created_at to ``[date_from, date_to]``, both local days inclusive."""
+    if date_from:
+        where_clauses.append("created_at >= ?")
+        params.append(int(date_from.timestamp()))
+    if date_to:
+        where_clauses.append("created_at < ?")
+        params.append(int((date_to + timedelta(days=1)).timestamp()))
+
+
+def iter_complaint_export(db, export_format, where_clauses, params, batch_rows):
+    """Yield an export of the matching complaints as text chunks.
+
+    Rows are stepped from one open cursor ``batch_rows`` at a time, so memory
+    use does not depend on how many rows match. roll_number is not exported.
+    """
+    where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+    cursor = db.cursor()
+    cursor.row_factory = None
+    cursor.execute(
+        f"""
+        SELECT {", ".join(COMPLAINT_COLUMNS)}
+        FROM complaints INDEXED BY idx_complaints_created
+        {where_sql}
+        ORDER BY created_at, id
+        """,
+        params,
+    )
+
+    def decode_rows(reference, rows):
+        decoders = [
+            reference.labels[column].__getitem__
+            if column in LABELLED_COLUMNS
+            else format_timestamp
+            if column in TIMESTAMP_COLUMNS
+            else None
+            for column in COMPLAINT_COLUMNS
+        ]
+        return [
+            [value if decode is None or value is None else decode(value) for value, decode in zip(row, decoders)]
+            for row in rows
+        ]
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if export_format == "csv":
+        writer.writerow(COMPLAINT_COLUMNS)
+    try:
+        while True:
+            batch = cursor.fetchmany(batch_rows)
+            if not batch:
+                break
+            try:
+                rows = decode_rows(get_reference_data(db), batch)
+            except KeyError:
+                rows = decode_rows(get_reference_data(db, refresh=True), batch)
+            if export_format == "csv":
+                writer.writerows(rows)
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(zip(COMPLAINT_COLUMNS, row))))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    finally:
+        cursor.close()
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+IMPORT_COLUMNS = [
+    "roll_number",
+    "hostel_block",
+    "room_number",
+    "category",
+    "priority",
+    "description",
+    "status",
+    "staff_assigned",
+    "remarks",
+    "created_at",
+    "updated_at",
+]
+
+
+def parse_import_timestamp(value):
+    for pattern in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, pattern).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            pass
+    return None
+
+
+def validate_import_record(record, import_time, reference):
+    """Validate one CSV record; returns ``(values, None)`` or ``(None, message)``.
+
+    The complaint fields go through the same rules as the student form. The
+    legacy-only columns are optional: status defaults to Pending and the
+    timestamps to the time of the import.
+    """
+    complaint, error = validate_complaint(record, reference)
+    if error:
+        return None, error
+    roll_number = (record.get("roll_number") or "").strip()
+    if not is_valid_roll_number(roll_number):
+        return None, "Roll number must start with 4127 and contain only digits."
+    status = (record.get("status") or "").strip() or "Pending"
+    if status not in ALLOWED_STATUSES:
+        return None, "Status must be one of " + ", ".join(ALLOWED_STATUSES) + "."
+    created_at = (record.get("created_at") or "").strip()
+    updated_at = (record.get("updated_at") or "").strip()
+    created_at = parse_import_timestamp(created_at) if created_at else import_time
+    updated_at = parse_import_timestamp(updated_at) if updated_at else created_at
+    if created_at is None or updated_at is None:
+        return None, "Dates must be YYYY-MM-DD or YYYY-MM-DD HH:MM:SS."
+    # Unknown names join the staff list when the import is loaded, so they
+    # follow the Reference Data page's rules.
+    staff_assigned = (record.get("staff_assigned") or "").strip()
+    if staff_assigned:
+        try:
+            staff_assigned = clean_reference_name(staff_assigned, "Staff")
+        except ValueError as error:
+            return None, str(error)
+    return (
+        roll_number,
+        complaint["hostel_block"],
+        complaint["room_number"],
+        complaint["category"],
+        complaint["priority"],
+        complaint["description"],
+        status,
+        staff_assigned,
+        (record.get("remarks") or "").strip(),
+        created_at,
+        updated_at,
+    ), None
+
+
+def stage_import(db, path, import_id, records_read, batch_rows, rejects):
+    """Validate the CSV at ``path`` into complaint_import_rows.
+
+    Skips the ``records_read`` records an earlier run already staged. Each
+    batch and the progress counters commit together, so an interrupted run
+    resumes from its last committed batch. Rejected records are written to
+    the ``rejects`` csv.writer with their line and reason.
+    """
+    import_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    reference = get_reference_data(db)
+    placeholders = ", ".join("?" for _ in IMPORT_COLUMNS)
+    insert_sql = (
+        f"INSERT INTO complaint_import_rows (import_id, line, {', '.join(IMPORT_COLUMNS)}) "
+        f"VALUES (?, ?, {placeholders})"
+    )
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        batch = []
+        rejected = []
+        number = records_read
+        for number, record in enumerate(reader, start=1):
+            if number <= records_read:
+                continue
+            values, error = validate_import_record(record, import_time, reference)
+            if error:
+                rejected.append([reader.line_num, error, *(record.get(c) or "" for c in IMPORT_COLUMNS)])
+            else:
+                batch.append((import_id, reader.line_num, *values))
+            if len(batch) + len(rejected) >= batch_rows:
+                save_import_batch(db, insert_sql, import_id, number, batch, len(rejected))
+                # Only after the commit, so a resumed run never reports a row twice.
+                rejects.writerows(rejected)
+                batch = []
+                rejected = []
+        save_import_batch(db, insert_sql, import_id, number, batch, len(rejected))
+        rejects.writerows(rejected)
+
+
+def save_import_batch(db, insert_sql, import_id, records_read, batch, rejected):
+    with immediate_transaction(db):
+        db.executemany(insert_sql, batch)
+        db.execute(
+            """
+            UPDATE complaint_imports
+            SET records_read = MAX(records_read, ?), staged = staged + ?, rejected = rejected + ?
+            WHERE id = ?
+            """,
+            (records_read, len(batch), rejected, import_id),
+        )
+
+
+def load_staged_import(db, import_id):
+    """Move the staged rows into complaints in one transaction.
+
+    The per-row insert triggers are dropped for the duration and their work
+    is redone in bulk afterwards: counters and rollups are rebuilt, the new
+    rows are added to the search index and history, and the change versions
+    are bumped. When the import
+    is at least as large as the table, the secondary indexes are also dropped
+    and rebuilt once at the end instead of being updated row by row. Staff
+    named in the file who are not on the staff list yet are added to it.
+    """
+    with immediate_transaction(db):
+        staged = db.execute(
+            "SELECT COUNT(*) FROM complaint_import_rows WHERE import_id = ?", (import_id,)
+        ).fetchone()[0]
+        existing = db.execute("SELECT COUNT(*) FROM complaints").fetchone()[0]
+        last_id = db.execute(
+            """
+            SELECT MAX(
+                COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'complaints'), 0),
+                COALESCE((SELECT MAX(id) FROM complaints), 0)
+            )
+            """
+        ).fetchone()[0]
+        triggers = db.execute(
+            """
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'trigger' AND tbl_name = 'complaints' AND name GLOB '*_insert'
+            """
+        ).fetchall()
+        indexes = []
+        if staged and staged >= existing:
+            indexes = db.execute(
+                """
+                SELECT name, sql FROM sqlite_master
+                WHERE type = 'index' AND tbl_name = 'complaints' AND sql IS NOT NULL
+                """
+            ).fetchall()
+        for name, _ in triggers:
+            db.execute(f"DROP TRIGGER {name}")
+        for name, _ in indexes:
+            db.execute(f"DROP INDEX {name}")
+
+        db.execute(
+            """
+            INSERT OR IGNORE INTO staff (name)
+            SELECT DISTINCT staff_assigned FROM complaint_import_rows
+            WHERE import_id = ? AND staff_assigned <> ''
+            ORDER BY 1
+            """,
+            (import_id,),
+        )
+        columns = ", ".join(IMPORT_COLUMNS)
+        db.execute(
+            f"""
+            INSERT INTO complaints (id, {columns}, sort_key, resolved_at)
+            SELECT id, {columns}, {sort_key_sql()},
+                CASE WHEN status NOT IN {active_statuses_sql()} THEN updated_at END
+            FROM (
+                SELECT ? + ROW_NUMBER() OVER (ORDER BY line) AS id, {encoded_columns_sql(IMPORT_COLUMNS)}
+                FROM complaint_import_rows
+                WHERE import_id = ?
+            )
+            """,
+            (last_id, import_id),
+        )
+
+        for _, sql in indexes:
+            db.execute(sql)
+        for _, sql in triggers:
+            db.execute(sql)
+        rebuild_counters(db)
+        rebuild_complaint_rollups(db)
+        db.execute(
+            """
+            INSERT INTO complaints_fts (rowid, description, remarks)
+            SELECT id, description, remarks FROM complaints WHERE id > ?
+            """,
+            (last_id,),
+        )
+        db.execute(
+            f"""
+            INSERT INTO complaint_events (complaint_id, at, kind, new_value, status, staff)
+            SELECT id, {local_time_sql("created_at")}, 'created', status, status, staff
+            FROM (
+                SELECT id, created_at, {label_sql("status", "status")} AS status,
+                    COALESCE({label_sql("staff_assigned", "staff_assigned")}, '') AS staff
+                FROM complaints WHERE id > ?
+            )
+            ORDER BY id
+            """,
+            (last_id,),
+        )
+        db.execute(
+            """
+            INSERT INTO change_versions (scope, version)
+            SELECT 'student:' || roll_number, 1 FROM complaints WHERE id > ? GROUP BY roll_number
+            ON CONFLICT (scope) DO UPDATE SET version = version + 1
+            """,
+            (last_id,),
+        )
+        db.execute(
+            """
+            INSERT INTO change_versions (scope, version) VALUES ('complaints', 1)
+            ON CONFLICT (scope) DO UPDATE SET version = version + 1
+            """
+        )
+        db.execute("DELETE FROM complaint_import_rows WHERE import_id = ?", (import_id,))
+        db.execute(
+            "UPDATE complaint_imports SET finished_at = ? WHERE id = ?",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), import_id),
+        )
+        if indexes:
+            db.execute("ANALYZE complaints")
+    return staged
+
+
+def import_complaints(db, path, batch_rows, rejects_path, restart=False):
+    """Import a legacy complaints CSV; returns the complaint_imports row.
+
+    Re-running with the same unchanged file resumes an interrupted import.
+    Raises ValueError if that file was already imported.
+    """
+    source = os.path.abspath(path)
+    source_size = os.path.getsize(path)
+    key = (source, source_size)
+    previous = db.execute(
+        "SELECT id, records_read, finished_at FROM complaint_imports WHERE source = ? AND source_size = ?",
+        key,
+    ).fetchone()
+    if previous and restart and not previous["finished_at"]:
+        with immediate_transaction(db):
+            db.execute("DELETE FROM complaint_import_rows WHERE import_id = ?", (previous["id"],))
+            db.execute("DELETE FROM complaint_imports WHERE id = ?", (previous["id"],))
+        previous = None
+    if previous and previous["finished_at"]:
+        raise ValueError(f"{path} was already imported at {previous['finished_at']}.")
+    if previous is None:
+        with immediate_transaction(db):
+            import_id = db.execute(
+                "INSERT INTO complaint_imports (source, source_size, started_at) VALUES (?, ?, ?)",
+                (*key, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            ).lastrowid
+        records_read = 0
+    else:
+        import_id, records_read = previous["id"], previous["records_read"]
+
+    with open(rejects_path, "a" if records_read else "w", newline="", encoding="utf-8") as handle:
+        rejects = csv.writer(handle)
+        if not records_read:
+            rejects.writerow(["line", "error", *IMPORT_COLUMNS])
+        stage_import(db, path, import_id, records_read, batch_rows, rejects)
+    load_staged_import(db, import_id)
+    return db.execute("SELECT * FROM complaint_imports WHERE id = ?", (import_id,)).fetchone()
+
+
+ARCHIVE_COLUMNS = ["id", *IMPORT_COLUMNS, "resolved_at"]
+
+
+def archive_term(created_at):
+    """The term a complaint filed at ``created_at`` (Unix seconds) belongs to,
+    e.g. ``2024_07``."""
+    filed = datetime.fromtimestamp(created_at)
+    year, month = filed.year, filed.month
+    start = max((first for first in ARCHIVE_TERM_START_MONTHS if first <= month), default=1)
+    return f"{year}_{start:02d}"
+
+
+def get_archive_tables(db):
+    """Names of the archive tables, newest term first."""
+    rows = db.execute(
+        """
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name GLOB 'complaints_archive_[0-9]*'
+        ORDER BY name DESC
+        """
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def create_archive_table(db, table):
+    # The complaints columns minus sort_key: archived rows are never paged by it.
+    db.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY,
+            roll_number TEXT NOT NULL,
+            hostel_block TEXT NOT NULL,
+            room_number TEXT NOT NULL,
+            category INTEGER NOT NULL,
+            priority INTEGER NOT NULL,
+            description TEXT NOT NULL,
+            status INTEGER NOT NULL,
+            staff_assigned INTEGER REFERENCES staff (id),
+            remarks TEXT,
+            created_at INTEGER NOT NULL,
+            updated_at INTEGER,
+            resolved_at INTEGER
+        )
+        """
+    )
+    db.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_roll ON {table} (roll_number)")
+
+
+def archive_complaints_batch(db, cutoff, batch_rows):
+    """Move up to ``batch_rows`` complaints resolved before ``cutoff`` (Unix
+    seconds) into their term's archive table, in one transaction; returns how many moved.
+
+    The delete triggers keep the counters, search index and change versions
+    in step; complaint_rollups and complaint_events keep the history.
+    """
+    with immediate_transaction(db):
+        # The status is a literal so the partial index applies.
+        rows = db.execute(
+            f"""
+            SELECT id, created_at FROM complaints INDEXED BY idx_complaints_resolved
+            WHERE status = {STATUS_CODES["Resolved"]} AND resolved_at < ?
+            ORDER BY resolved_at
+            LIMIT ?
+            """,
+            (cutoff, batch_rows),
+        ).fetchall()
+        if not rows:
+            return 0
+        db.executemany(
+            "INSERT INTO archive_moving (id, term) VALUES (?, ?)",
+            [(row["id"], archive_term(row["created_at"])) for row in rows],
+        )
+        columns = ", ".join(ARCHIVE_COLUMNS)
+        terms = [row[0] for row in db.execute("SELECT DISTINCT term FROM archive_moving ORDER BY term")]
+        for term in terms:
+            table = f"complaints_archive_{term}"
+            create_archive_table(db, table)
+            moving = "id IN (SELECT id FROM archive_moving WHERE term = ?)"
+            db.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM complaints WHERE {moving}", (term,))
+            db.execute(
+                f"""
+                INSERT INTO complaint_archives (term, table_name, complaints, first_created, last_created)
+                SELECT ?, ?, COUNT(*), {local_time_sql("MIN(created_at)")}, {local_time_sql("MAX(created_at)")}
+                FROM complaints WHERE {moving}
+                ON CONFLICT (term) DO UPDATE SET
+                    complaints = complaints + excluded.complaints,
+                    first_created = MIN(first_created, excluded.first_created),
+                    last_created = MAX(last_created, excluded.last_created)
+                """,
+                (term, table, term),
+            )
+        db.execute("DELETE FROM complaints WHERE id IN (SELECT id FROM archive_moving)")
+        db.execute("DELETE FROM archive_moving")
+    return len(rows)
+
+
+def archive_complaints(db, older_than_days, batch_rows, pause=0.0):
+    """Archive every complaint resolved more than ``older_than_days`` ago, one
+    batch per transaction; returns how many were moved."""
+    cutoff = int(time.time()) - older_than_days * 86400
+    archived = 0
+    while True:
+        moved = archive_complaints_batch(db, cutoff, batch_rows)
+        archived += moved
+        if moved < batch_rows:
+            return archived
+        # Let waiting writers take the lock between batches.
+        time.sleep(pause)
+
+
+def get_term_archive_tables(db, term):
+    """The archive tables to read for ``term``, and the term as understood:
+    an unknown term (or "All") reads every archive table."""
+    row = db.execute("SELECT table_name FROM complaint_archives WHERE term = ?", (term,)).fetchone()
+    if row is None:
+        return get_archive_tables(db), "All"
+    return [row["table_name"]], term
+
+
+def get_archive_terms(db):
+    return db.execute(
+        "SELECT term, complaints, first_created, last_created FROM complaint_archives ORDER BY term DESC"
+    ).fetchall()
+
+
+def fetch_archived_page(db, tables, where_clauses, params, page_size, after=None, before=None):
+    """Return one page of archived complaints from ``tables``, newest first.
+
+    Works like fetch_complaint_page, but the cursors are complaint ids:
+    ``after`` pages to older complaints and ``before`` to newer ones.
+    """
+    if not tables:
+        return [], None, None
+    clauses = list(where_clauses)
+    values = list(params)
+    if before is not None:
+        clauses.append("id > ?")
+        values.append(before)
+        direction = "ASC"
+    else:
+        if after is not None:
+            clauses.append("id < ?")
+            values.append(after)
+        direction = "DESC"
+    where = " WHERE " + " AND ".join(clauses) if clauses else ""
+    # Each table is read in id order and the branches are merged, so a page
+    # costs page_size rows per table however large the archive grows.
+    query = " UNION ALL ".join(
+        f"SELECT * FROM (SELECT {', '.join(COMPLAINT_COLUMNS)} FROM {table}{where} ORDER BY id {direction} LIMIT ?)"
+        for table in tables
+    )
+    query += f" ORDER BY id {direction} LIMIT ?"
+    rows = fetch_complaints(db, query, [*values, page_size + 1] * len(tables) + [page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if before is not None:
+        rows.reverse()
+        prev_cursor = rows[0]["id"] if has_more and rows else None
+        next_cursor = rows[-1]["id"] if rows else None
+    else:
+        prev_cursor = rows[0]["id"] if after is not None and rows else None
+        next_cursor = rows[-1]["id"] if has_more else None
+    return rows, prev_cursor, next_cursor
+
+
+def fetch_complaint_roll_number(db, complaint_id):
+    """The roll number behind a complaint, hot or archived; None if unknown."""
+    for table in ["complaints", *get_archive_tables(db)]:
+        row = db.execute(f"SELECT roll_number FROM {table} WHERE id = ?", (complaint_id,)).fetchone()
+        if row is not None:
+            return row["roll_number"]
+    return None
+
+
+def staff_assignment_error(db, reference, name, complaint_id=None):
+    """Why complaints cannot be assigned to ``name``, or None if they can.
+
+    Only active staff take complaints. A complaint may keep an inactive
+    member it already has, so the dashboard's row form, which always sends
+    the current name back, can still change its status.
+    """
+    member = reference.staff.get(name)
+    if member is None:
+        return f"{name} is not on the staff list."
+    if member.active:
+        return None
+    if complaint_id is not None and db.execute(
+        "SELECT 1 FROM complaints WHERE id = ? AND staff_assigned = ?", (complaint_id, member.id)
+    ).fetchone():
+        return None
+    return f"{name} is no longer an active staff member."
+
+
+def apply_complaint_updates(db, complaint_ids, changes, current_time):
+    """Apply the same ``changes`` to every complaint in ``complaint_ids``.
+
+    ``changes`` holds labels (a staff member's name for ``staff_assigned``,
+    blank to unassign), ``current_time`` Unix seconds. All rows are written
+    with one executemany; the caller owns the transaction. Returns one
+    ``{"id", "result"}`` entry per requested id.
+    """
+    existing = set()
+    for start in range(0, len(complaint_ids), 500):
+        chunk = complaint_ids[start : start + 500]
+        placeholders = ", ".join("?" for _ in chunk)
+        existing.update(
+            row["id"]
+            for row in db.execute(
+                f"SELECT id FROM complaints WHERE id IN ({placeholders})", chunk
+            ).fetchall()
+        )
+
+    columns = [field for field in UPDATABLE_FIELDS if field in changes]
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    codes = get_reference_data(db).codes
+    values = [
+        codes[column].get(changes[column]) if column in LABELLED_COLUMNS else changes[column]
+        for column in columns
+    ]
+    db.executemany(
+        f"UPDATE complaints SET {assignments}, updated_at = ? WHERE id = ?",
+        [(*values, current_time, complaint_id) for complaint_id in complaint_ids if complaint_id in existing],
+    )
+    if event_hub.has_subscribers():
+        updated = [complaint_id for complaint_id in complaint_ids if complaint_id in existing]
+        for start in range(0, len(updated), 500):
+            chunk = updated[start : start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            for row in fetch_complaints(
+                db,
+                f"SELECT roll_number, {', '.join(COMPLAINT_COLUMNS)} FROM complaints "
+                f"WHERE id IN ({placeholders})",
+                chunk,
+            ):
+                queue_complaint_event(
+                    "updated", complaint_to_dict(row), row["roll_number"], changed=columns
+                )
+    return [
+        {"id": complaint_id, "result": "updated" if complaint_id in existing else "not_found"}
+        for complaint_id in complaint_ids
+    ]
+
+
+app.jinja_env.globals.update(
+    status_class=status_class,
+    priority_class=priority_class,
+    college_name=COLLEGE_NAME,
+    college_system_name=COLLEGE_SYSTEM_NAME,
+    college_logo_url=COLLEGE_LOGO_URL,
+    style_digest=STYLE_DIGEST,
+)
+app.jinja_env.filters["timestamp"] = format_timestamp
+app.jinja_loader = DictLoader(TEMPLATES)
+app.jinja_env.trim_blocks = True
+
+
+def parse_analytics_args(args, categories):
+    """Read granularity, date range and block/category filters from ``args``.
+
+    Raises ValueError for malformed dates. Ranges are clamped to
+    ANALYTICS_MAX_DAYS for the granularity, and a category not in
+    ``categories`` means all of them.
+    """
+    granularity = args.get("granularity", "day").strip()
+    if granularity not in ROLLUP_GRANULARITIES:
+        granularity = "day"
+    date_to = parse_export_date(args.get("to", "").strip()) or datetime.combine(date.today(), datetime.min.time())
+    date_from = parse_export_date(args.get("from", "").strip()) or date_to - timedelta(
+        days=ANALYTICS_DEFAULT_DAYS[granularity] - 1
+    )
+    date_from = max(date_from, date_to - timedelta(days=ANALYTICS_MAX_DAYS[granularity] - 1))
+    category = args.get("category", "").strip()
+    return {
+        "granularity": granularity,
+        "from": date_from,
+        "to": date_to,
+        "hostel_block": args.get("hostel_block", "").strip()[:30],
+        "category": category if category in categories else "",
+    }
+
+
+def mean_resolution_hours(resolved, seconds):
+    return round(seconds / resolved / 3600, 1) if resolved else None
+
+
+def build_analytics(db, granularity, date_from, date_to, hostel_block="", category=""):
+    """Trends, per block/category totals and backlog age, from rollups only."""
+    where_clauses = ["granularity = ?", "bucket >= ?", "bucket < ?"]
+    params = [
+        granularity,
+        date_from.strftime("%Y-%m-%d"),
+        (date_to + timedelta(days=1)).strftime("%Y-%m-%d"),
+    ]
+    for column, value in [("hostel_block", hostel_block), ("category", category)]:
+        if value:
+            where_clauses.append(f"{column} = ?")
+            params.append(value)
+    where_sql = " AND ".join(where_clauses)
+
+    series = []
+    resolved = 0
+    seconds = 0
+    for row in db.execute(
+        f"""
+        SELECT bucket, SUM(created) AS created, SUM(resolved) AS resolved,
+            SUM(resolution_seconds) AS seconds
+        FROM complaint_rollups
+        WHERE {where_sql}
+        GROUP BY bucket
+        HAVING SUM(created) OR SUM(resolved)
+        ORDER BY bucket
+        """,
+        params,
+    ):
+        resolved += row["resolved"]
+        seconds += row["seconds"]
+        series.append(
+            {
+                "bucket": row["bucket"],
+                "created": row["created"],
+                "resolved": row["resolved"],
+                "mean_resolution_hours": mean_resolution_hours(row["resolved"], row["seconds"]),
+            }
+        )
+    breakdown = [
+        {
+            "hostel_block": row["hostel_block"],
+            "category": row["category"],
+            "created": row["created"],
+            "resolved": row["resolved"],
+            "mean_resolution_hours": mean_resolution_hours(row["resolved"], row["seconds"]),
+        }
+        for row in db.execute(
+            f"""
+            SELECT hostel_block, category, SUM(created) AS created, SUM(resolved) AS resolved,
+                SUM(resolution_seconds) AS seconds
+            FROM complaint_rollups
+            WHERE {where_sql}
+            GROUP BY hostel_block, category
+            HAVING SUM(created) OR SUM(resolved)
+            ORDER BY created DESC, hostel_block, category
+            """,
+            params,
+        )
+    ]
+
+    # Backlog age covers everything still open, whatever the date range.
+    backlog_where = ["granularity = 'day'", "still_open > 0"] + where_clauses[3:]
+    today = date.today()
+    ages = [{"label": label, "open": 0} for _, label in BACKLOG_AGE_BANDS]
+    oldest_days = None
+    open_total = 0
+    for row in db.execute(
+        f"""
+        SELECT bucket, SUM(still_open) AS still_open
+        FROM complaint_rollups INDEXED BY idx_complaint_rollups_open
+        WHERE {" AND ".join(backlog_where)}
+        GROUP BY bucket
+        """,
+        params[3:],
+    ):
+        try:
+            age = (today - date.fromisoformat(row["bucket"])).days
+        except ValueError:
+            continue
+        oldest_days = age if oldest_days is None else max(oldest_days, age)
+        open_total += row["still_open"]
+        for band, (upper, _) in zip(ages, BACKLOG_AGE_BANDS):
+            if upper is None or age < upper:
+                band["open"] += row["still_open"]
+                break
+
+    return {
+        "granularity": granularity,
+        "from": date_from.strftime("%Y-%m-%d"),
+        "to": date_to.strftime("%Y-%m-%d"),
+        "hostel_block": hostel_block,
+        "category": category,
+        "totals": {
+            "created": sum(point["created"] for point in series),
+            "resolved": resolved,
+            "mean_resolution_hours": mean_resolution_hours(resolved, seconds),
+        },
+        "series": series,
+        "breakdown": breakdown,
+        "backlog": {"open": open_total, "oldest_days": oldest_days, "ages": ages},
+    }
+
+
+EVENT_COLUMNS = ["id", "at", "kind", "old_value", "new_value", "status", "staff"]
+
+
+def fetch_complaint_timeline(db, complaint_id):
+    return [
+        {column: row[column] for column in EVENT_COLUMNS}
+        for row in db.execute(
+            f"""
+            SELECT {", ".join(EVENT_COLUMNS)}
+            FROM complaint_events
+            WHERE complaint_id = ?
+            ORDER BY at, id
+            """,
+            (complaint_id,),
+        )
+    ]
+
+
+def sla_intervals(db, start, end, kinds, group_by):
+    """Status intervals ending in ``[start, end)``, aggregated by ``group_by``.
+
+    An interval runs from one event of a complaint to its next one; only
+    events of the given ``kinds`` count as boundaries.
+    """
+    kind_placeholders = ", ".join("?" for _ in kinds)
+    return db.execute(
+        f"""
+        WITH intervals AS (
+            SELECT status, staff, at AS started,
+                LEAD(at) OVER (PARTITION BY complaint_id ORDER BY at, id) AS ended
+            FROM complaint_events
+            WHERE kind IN ({kind_placeholders})
+                AND complaint_id IN (
+                    SELECT complaint_id FROM complaint_events WHERE at >= ? AND at < ?
+                )
+        )
+        SELECT {group_by}, COUNT(*) AS intervals,
+            SUM((julianday(ended) - julianday(started)) * 86400) AS seconds,
+            MAX((julianday(ended) - julianday(started)) * 86400) AS longest
+        FROM intervals
+        WHERE ended >= ? AND ended < ? AND ended > started
+        GROUP BY {group_by}
+        ORDER BY {group_by}
+        """,
+        (*kinds, start, end, start, end),
+    ).fetchall()
+
+
+def build_sla_metrics(db, date_from, date_to):
+    """Time spent in each status, overall and per assigned staff member.
+
+    Intervals are counted when they end inside ``[date_from, date_to]``
+    (whole days); the current, still-open status of a complaint is not.
+    """
+    start = date_from.strftime("%Y-%m-%d")
+    end = (date_to + timedelta(days=1)).strftime("%Y-%m-%d")
+
+    def summary(row):
+        return {
+            "intervals": row["intervals"],
+            "mean_hours": round(row["seconds"] / row["intervals"] / 3600, 2),
+            "max_hours": round(row["longest"] / 3600, 2),
+        }
+
+    by_status = sla_intervals(db, start, end, ["created", "status"], "status")
+    # A change of staff also starts a new interval, so time is credited to
+    # whoever was assigned while it passed.
+    by_staff = sla_intervals(db, start, end, ["created", "status", "staff_assigned"], "staff, status")
+    return {
+        "from": start,
+        "to": date_to.strftime("%Y-%m-%d"),
+        "by_status": {row["status"]: summary(row) for row in by_status},
+        "by_staff": [
+            {"staff": row["staff"], "status": row["status"], **summary(row)}
+            for row in by_staff
+            if row["staff"]
+        ],
+    }
+
+
+COMPRESSIBLE_MIMETYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/csv",
+    "application/json",
+    "application/x-ndjson",
+}
+# Cache-Control by endpoint, for responses that do not set their own. Pages
+# that show one user's complaints are never stored; the static pages may be
+# stored but are revalidated against their ETag on every use.
+CACHE_POLICIES = {
+    "index": "no-cache",
+    "student_login": "no-cache",
+    "admin_login": "no-cache",
+    "admin_register": "no-cache",
+    "student_dashboard": "private, no-store",
+    "admin_dashboard": "private, no-store",
+    "admin_analytics": "private, no-store",
+    "admin_archive": "private, no-store",
+    "admin_export_complaints": "private, no-store",
+    "admin_reference": "private, no-store",
+    "metrics": "no-store",
+    "admin_slow_queries": "no-store",
+    "admin_db_pool_metrics": "no-store",
+    "admin_write_queue_metrics": "no-store",
+    "admin_auth_metrics": "no-store",
+    "admin_history_cache_metrics": "no-store",
+    "admin_assignment_metrics": "no-store",
+}
+
+
+def negotiate_encoding(available):
+    """Return the encoding in ``available`` the client rates highest, or None
+    for identity. Ties go to the earlier entry."""
+    best, best_quality = None, 0
+    for encoding in available:
+        quality = request.accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress_body(body, encoding, level=None):
+    """Compress ``body`` with ``encoding``; ``level`` None uses the config."""
+    if encoding == "br":
+        quality = app.config["COMPRESS_BROTLI_QUALITY"] if level is None else level
+        return brotli.compress(body, quality=quality)
+    level = app.config["COMPRESS_GZIP_LEVEL"] if level is None else level
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def available_encodings():
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+class PrecompressedBody:
+    """A response body that never changes, with its ETag and compressed
+    variants computed once so serving it costs a dictionary lookup."""
+
+    def __init__(self, body, mimetype):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.variants = {}
+        for encoding in available_encodings():
+            data = compress_body(body, encoding, level=11 if encoding == "br" else 9)
+            if len(data) < len(body):
+                self.variants[encoding] = data
+
+    def response(self):
+        encoding = negotiate_encoding(self.variants)
+        if encoding is None:
+            response = app.response_class(self.body, mimetype=self.mimetype)
+            response.set_etag(self.etag)
+        else:
+            response = app.response_class(self.variants[encoding], mimetype=self.mimetype)
+            response.headers["Content-Encoding"] = encoding
+            # Each representation needs its own strong validator.
+            response.set_etag(f"{self.etag}-{encoding}")
+        response.vary.add("Accept-Encoding")
+        return response.make_conditional(request)
+
+
+STYLE_BODY = PrecompressedBody(STYLE_BYTES, "text/css")
+static_pages = {}
+
+
+def render_static_page(template):
+    """Render a page whose HTML is the same for every visitor, from bytes built
+    the first time it is served."""
+    # Pending flash messages are rendered into the page, so it is not static.
+    if session.get("_flashes"):
+        return render_template(template)
+    key = (template, request.script_root)
+    page = static_pages.get(key)
+    if page is None:
+        page = static_pages[key] = PrecompressedBody(render_template(template).encode("utf-8"), "text/html")
+    return page.response()
+
+
+@app.after_request
+def compress_response(response):
+    if "Cache-Control" not in response.headers and request.endpoint in CACHE_POLICIES:
+        response.headers["Cache-Control"] = CACHE_POLICIES[request.endpoint]
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    if response.content_length is None or response.content_length < app.config["COMPRESS_MIN_BYTES"]:
+        return response
+    encoding = negotiate_encoding(available_encodings())
+    if encoding is None:
+        return response
+    response.set_data(compress_body(response.get_data(), encoding))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        # The compressed bytes differ, so a strong validator no longer holds.
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def precompile_templates():
+    for name in TEMPLATES:
+        app.jinja_env.get_template(name)
+
+
+@app.route("/assets/style.<digest>.css")
+def stylesheet(digest):
+    if digest != STYLE_DIGEST:
+        abort(404)
+    response = STYLE_BODY.response()
+    # The digest is part of the URL, so a changed stylesheet gets a new URL.
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+
+@app.route("/")
+def index():
+    return render_static_page("index.html")
+
+
+@app.route("/student/login", methods=["GET", "POST"])
+def student_login():
+    if request.method == "POST":
+        roll_number = request.form.get("roll_number", "").strip()
+        if not is_valid_roll_number(roll_number):
+            flash("Enter a valid roll number that starts with 4127 and contains only digits.")
+        else:
+            session.pop("admin_id", None)
+            session["student_roll"] = roll_number
+            return redirect(url_for("student_dashboard"))
+
+    return render_static_page("student_login.html")
+
+
+@app.route("/student/dashboard", methods=["GET", "POST"])
 @student_required
 def student_dashboard():
-    db = get_db()
     roll_number = session["student_roll"]
 
     if request.method == "POST":
-        hostel_block = request.form.get("hostel_block", "").strip()
-        room_number = request.form.get("room_number", "").strip().upper()
-        category = request.form.get("category", "").strip()
-        priority = request.form.get("priority", "").strip()
-        description = request.form.get("description", "").strip()
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        current_time = int(time.time())
+        complaint, error = validate_complaint(request.form, get_reference_data(get_db()))
 
-        if category not in ALLOWED_CATEGORIES:
-            flash("Please select a valid complaint category.")
-        elif priority not in ALLOWED_PRIORITIES:
-            flash("Please select a valid priority.")
-        elif not hostel_block:
-            flash("Hostel block is required.")
-        elif len(hostel_block) > 30:
-            flash("Hostel block must be 30 characters or less.")
-        elif not room_number:
-            flash("Room number is required.")
-        elif not re.fullmatch(r"[A-Za-z0-9/-]{1,20}", room_number):
-            flash("Room number can contain letters, numbers, '-' or '/'.")
-        elif not description:
-            flash("Complaint description is required.")
-        elif len(description) < 10:
-            flash("Complaint description must be at least 10 characters.")
-        elif len(description) > MAX_DESCRIPTION_LENGTH:
-            flash(f"Complaint description must be under {MAX_DESCRIPTION_LENGTH} characters.")
+        if error:
+            flash(error)
         else:
-            active_count = db.execute(
-                """
-                SELECT COUNT(*) AS total
-                FROM complaints
-                WHERE roll_number = ? AND status IN ('Pending', 'In Progress')
-                """,
-                (roll_number,),
-            ).fetchone()["total"]
-            if active_count >= MAX_ACTIVE_COMPLAINTS:
+            if app.config["GROUP_COMMIT_ENABLED"]:
+                future = get_writer().submit(roll_number, complaint, current_time)
+                try:
+                    complaint_id = future.result(timeout=app.config["GROUP_COMMIT_TIMEOUT"])
+                except FutureTimeoutError:
+                    flash("Submission is taking longer than usual. Check your history before retrying.")
+                    return redirect(url_for("student_dashboard"))
+            else:
+                db = get_db()
+                with immediate_transaction(db):
+                    complaint_id = insert_complaint(db, roll_number, complaint, current_time)
+            if complaint_id is None:
                 flash(
                     f"You already have {MAX_ACTIVE_COMPLAINTS} active complaints. "
                     "Please wait for resolution before filing new ones."
                 )
                 return redirect(url_for("student_dashboard"))
-            db.execute(
-                """
-                INSERT INTO complaints (
-                    roll_number, hostel_block, room_number, category, priority,
-                    description, status, staff_assigned, remarks, created_at, updated_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, 'Pending', '', '', ?, ?)
-                """,
-                (
-                    roll_number,
-                    hostel_block,
-                    room_number,
-                    category,
-                    priority,
-                    description,
-                    current_time,
-                    current_time,
-                ),
-            )
-            db.commit()
+            if app.config["AUTO_ASSIGN_ENABLED"]:
+                get_assignment_engine().notify()
             flash("Complaint submitted successfully.")
             return redirect(url_for("student_dashboard"))
 
-    complaints = db.execute(
-        """
-        SELECT id, hostel_block, room_number, category, priority, description, status,
-               staff_assigned, remarks, created_at, updated_at
-        FROM complaints
-        WHERE roll_number = ?
-        ORDER BY id DESC
-        """,
-        (roll_number,),
-    ).fetchall()
-
-    return render_template_string(
-        """
-        <!doctype html>
-        <html>
-        <head>
-          <meta charset="utf-8">
-          <meta name="viewport" content="width=device-width, initial-scale=1">
-          <title>Student Dashboard</title>
-          <style>{{ style }}</style>
-        </head>
-        <body>
-          <div class="nav">
-            <a href="{{ url_for('index') }}">Home</a>
-            <span class="nav-title">Student Portal</span>
-            <a href="{{ url_for('student_logout') }}">Logout</a>
-          </div>
-          <div class="container">
-            <div class="brand-header">
-              <img class="brand-logo" src="{{ college_logo_url }}" alt="{{ college_name }} logo">
-            </div>
-            <div class="card">
-              <h2>Welcome, {{ roll_number }}</h2>
-              <p class="small">File complaints and track status/history. Maximum active complaints allowed: {{ max_active }}.</p>
-            </div>
-
-            <div class="grid">
-              <div class="card">
-                <h3>File New Complaint</h3>
-                {% with messages = get_flashed_messages() %}
-                  {% if messages %}
-                    {% for message in messages %}
-                      <div class="alert">{{ message }}</div>
-                    {% endfor %}
-                  {% endif %}
-                {% endwith %}
-                <form method="post">
-                  <label for="hostel_block">Hostel Block</label>
-                  <input id="hostel_block" name="hostel_block" type="text" required maxlength="30" placeholder="e.g. A Block">
-
-                  <label for="room_number">Room Number</label>
-                  <input id="room_number" name="room_number" type="text" required maxlength="20" placeholder="e.g. 102 or B-204">
-
-                  <label for="category">Category</label>
-                  <select id="category" name="category" required>
-                    <option value="">Select category</option>
-                    {% for item in categories %}
-                      <option value="{{ item }}">{{ item }}</option>
-                    {% endfor %}
-                  </select>
-
-                  <label for="priority">Priority</label>
-                  <select id="priority" name="priority" required>
-                    <option value="">Select priority</option>
-                    {% for item in priorities %}
-                      <option value="{{ item }}">{{ item }}</option>
-                    {% endfor %}
-                  </select>
-
-                  <label for="description">Complaint Details</label>
-                  <textarea id="description" name="description" required maxlength="{{ max_description }}" placeholder="Explain the issue clearly (10 to {{ max_description }} characters)"></textarea>
-
-                  <button class="btn btn-success" type="submit">Submit Complaint</button>
-                </form>
-              </div>
-
-              <div class="card">
-                <h3>Your Complaint History</h3>
-                {% if complaints %}
-                <div class="table-wrap">
-                  <table>
-                    <thead>
-                      <tr>
-                        <th>ID</th>
-                        <th>Block</th>
-                        <th>Room</th>
-                        <th>Category</th>
-                        <th>Priority</th>
-                        <th>Description</th>
-                        <th>Status</th>
-                        <th>Assigned Staff</th>
-                        <th>Admin Remarks</th>
-                        <th>Created</th>
-                        <th>Last Updated</th>
-                      </tr>
-                    </thead>
-                    <tbody>
-                    {% for row in complaints %}
-                      <tr>
-                        <td>{{ row['id'] }}</td>
-                        <td>{{ row['hostel_block'] }}</td>
-                        <td>{{ row['room_number'] }}</td>
-                        <td>{{ row['category'] }}</td>
-                        <td class="{{ priority_class(row['priority']) }}">{{ row['priority'] }}</td>
-                        <td>{{ row['description'] }}</td>
-                        <td class="{{ status_class(row['status']) }}">{{ row['status'] }}</td>
-                        <td>{{ row['staff_assigned'] or '-' }}</td>
-                        <td>{{ row['remarks'] or '-' }}</td>
-                        <td>{{ row['created_at'] }}</td>
-                        <td>{{ row['updated_at'] or row['created_at'] }}</td>
-                      </tr>
-                    {% endfor %}
-                    </tbody>
-                  </table>
-                </div>
-                {% else %}
-                  <p class="small">No complaints filed yet.</p>
-                {% endif %}
-              </div>
-            </div>
-          </div>
-        </body>
-        </html>
-        """,
-        style=STYLE,
+    db = get_db()
+    show_archived = request.args.get("archived") == "1"
+    # Read before the history, so a change committed meanwhile shows the prompt.
+    live_version = get_change_version(db, student_scope(roll_number))
+    history_html = render_student_history(db, roll_number, include_archived=show_archived)
+    reference = get_reference_data(db)
+
+    return render_template(
+        "student_dashboard.html",
         roll_number=roll_number,
-        categories=ALLOWED_CATEGORIES,
+        categories=reference.categories,
+        blocks=reference.blocks,
         priorities=ALLOWED_PRIORITIES,
         max_active=MAX_ACTIVE_COMPLAINTS,
         max_description=MAX_DESCRIPTION_LENGTH,
-        complaints=complaints,
+        history_html=history_html,
+        show_archived=show_archived,
+        has_archive=bool(get_archive_tables(db)),
+        live_version=live_version,
     )
 
 
@@ -590,90 +5132,75 @@ def student_logout():
 
 @app.route("/admin/login", methods=["GET", "POST"])
 def admin_login():
-    db = get_db()
-
     if request.method == "POST":
         username = request.form.get("username", "").strip()
         password = request.form.get("password", "")
 
-        admin = db.execute("SELECT * FROM admins WHERE username = ?", (username,)).fetchone()
-        if not admin or not check_password_hash(admin["password_hash"], password):
+        wait = admin_auth_retry_after(username)
+        if wait:
+            return auth_throttled("admin_login.html", wait)
+
+        db = get_db()
+        admin = db.execute(
+            "SELECT id, username, password_hash FROM admins WHERE username = ?", (username,)
+        ).fetchone()
+        try:
+            valid = admin is not None and verify_password(admin["password_hash"], password)
+        except (HashPoolBusyError, FutureTimeoutError):
+            flash("The server is busy. Please try again shortly.")
+            return render_template("admin_login.html"), 503
+        if not valid:
             flash("Invalid admin username or password.")
         else:
+            if password_needs_rehash(admin["password_hash"]):
+                try:
+                    new_hash = hash_password(password)
+                except (HashPoolBusyError, FutureTimeoutError):
+                    new_hash = None  # upgraded on a later login instead
+                if new_hash:
+                    db.execute(
+                        "UPDATE admins SET password_hash = ? WHERE id = ? AND password_hash = ?",
+                        (new_hash, admin["id"], admin["password_hash"]),
+                    )
+                    db.commit()
             session.pop("student_roll", None)
             session["admin_id"] = admin["id"]
             session["admin_username"] = admin["username"]
             return redirect(url_for("admin_dashboard"))
 
-    return render_template_string(
-        """
-        <!doctype html>
-        <html>
-        <head>
-          <meta charset="utf-8">
-          <meta name="viewport" content="width=device-width, initial-scale=1">
-          <title>Admin Login</title>
-          <style>{{ style }}</style>
-        </head>
-        <body>
-          <div class="nav">
-            <a href="{{ url_for('index') }}">Home</a>
-            <span class="nav-title">Admin Portal</span>
-          </div>
-          <div class="container">
-            <div class="brand-header">
-              <img class="brand-logo" src="{{ college_logo_url }}" alt="{{ college_name }} logo">
-            </div>
-            <div class="card" style="max-width:520px;">
-              <h2>Admin Login</h2>
-              <p class="small">Login using admin username and password.</p>
-              {% with messages = get_flashed_messages() %}
-                {% if messages %}
-                  {% for message in messages %}
-                    <div class="alert">{{ message }}</div>
-                  {% endfor %}
-                {% endif %}
-              {% endwith %}
-              <form method="post">
-                <label for="username">Username</label>
-                <input id="username" name="username" type="text" required>
-
-                <label for="password">Password</label>
-                <input id="password" name="password" type="password" required>
-
-                <div class="action-row">
-                  <button type="submit">Login</button>
-                  <a class="btn btn-secondary" href="{{ url_for('admin_register') }}">Create Admin</a>
-                </div>
-              </form>
-            </div>
-          </div>
-        </body>
-        </html>
-        """,
-        style=STYLE,
-    )
+    return render_static_page("admin_login.html")
 
 
 @app.route("/admin/register", methods=["GET", "POST"])
 def admin_register():
-    db = get_db()
-
     if request.method == "POST":
         username = request.form.get("username", "").strip()
         password = request.form.get("password", "")
 
+        wait = admin_auth_retry_after(username)
+        if wait:
+            return auth_throttled("admin_register.html", wait)
+
         if len(username) < 3:
             flash("Admin username must be at least 3 characters.")
         elif len(password) < 8 or not re.search(r"[A-Za-z]", password) or not re.search(r"\d", password):
             flash("Admin password must be at least 8 characters and include letters and numbers.")
         else:
+            db = get_db()
+            if db.execute("SELECT 1 FROM admins WHERE username = ?", (username,)).fetchone():
+                flash("This admin username already exists.")
+                return render_template("admin_register.html")
+            try:
+                password_hash = hash_password(password)
+            except (HashPoolBusyError, FutureTimeoutError):
+                flash("The server is busy. Please try again shortly.")
+                return render_template("admin_register.html"), 503
             try:
                 db.execute(
                     "INSERT INTO admins (username, password_hash, created_at) VALUES (?, ?, ?)",
                     (
                         username,
-                        generate_password_hash(password),
+                        password_hash,
                         datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                     ),
                 )
@@ -683,61 +5210,23 @@ def admin_register():
             except sqlite3.IntegrityError:
                 flash("This admin username already exists.")
 
-    return render_template_string(
-        """
-        <!doctype html>
-        <html>
-        <head>
-          <meta charset="utf-8">
-          <meta name="viewport" content="width=device-width, initial-scale=1">
-          <title>Create Admin</title>
-          <style>{{ style }}</style>
-        </head>
-        <body>
-          <div class="nav">
-            <a href="{{ url_for('index') }}">Home</a>
-            <a href="{{ url_for('admin_login') }}">Admin Login</a>
-            <span class="nav-title">Create Admin</span>
-          </div>
-          <div class="container">
-            <div class="brand-header">
-              <img class="brand-logo" src="{{ college_logo_url }}" alt="{{ college_name }} logo">
-            </div>
-            <div class="card" style="max-width:520px;">
-              <h2>Create Admin Account</h2>
-              {% with messages = get_flashed_messages() %}
-                {% if messages %}
-                  {% for message in messages %}
-                    <div class="alert">{{ message }}</div>
-                  {% endfor %}
-                {% endif %}
-              {% endwith %}
-              <form method="post">
-                <label for="username">Admin Username</label>
-                <input id="username" name="username" type="text" required>
-
-                <label for="password">Admin Password</label>
-                <input id="password" name="password" type="password" required>
-
-                <button type="submit">Create Admin</button>
-              </form>
-            </div>
-          </div>
-        </body>
-        </html>
-        """,
-        style=STYLE,
-    )
+    return render_static_page("admin_register.html")
 
 
 @app.route("/admin/dashboard", methods=["GET", "POST"])
 @admin_required
 def admin_dashboard():
     db = get_db()
+    reference = get_reference_data(db)
 
     status_filter = request.values.get("status_filter", "All").strip()
     category_filter = request.values.get("category_filter", "All").strip()
     priority_filter = request.values.get("priority_filter", "All").strip()
+    page_size = parse_page_size(request.values.get("page_size", "").strip())
+    after = parse_cursor(request.values.get("after", "").strip())
+    before = parse_cursor(request.values.get("before", "").strip())
+    search = request.values.get("q", "").strip()[:SEARCH_MAX_LENGTH]
+    offset = parse_cursor(request.values.get("offset", "").strip()) or 0
 
     if request.method == "POST":
         complaint_id = request.form.get("complaint_id", "").strip()
@@ -745,7 +5234,10 @@ def admin_dashboard():
         priority = request.form.get("priority", "").strip()
         staff_assigned = request.form.get("staff_assigned", "").strip()
         remarks = request.form.get("remarks", "").strip()
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        current_time = int(time.time())
+        staff_error = None
+        if staff_assigned and complaint_id.isdigit():
+            staff_error = staff_assignment_error(db, reference, staff_assigned, int(complaint_id))
 
         if not complaint_id.isdigit():
             flash("Invalid complaint ID.")
@@ -753,16 +5245,21 @@ def admin_dashboard():
             flash("Invalid status selected.")
         elif priority not in ALLOWED_PRIORITIES:
             flash("Invalid priority selected.")
+        elif staff_error:
+            flash(staff_error)
         else:
-            db.execute(
-                """
-                UPDATE complaints
-                SET status = ?, priority = ?, staff_assigned = ?, remarks = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (status, priority, staff_assigned, remarks, current_time, int(complaint_id)),
-            )
-            db.commit()
+            with immediate_transaction(db):
+                apply_complaint_updates(
+                    db,
+                    [int(complaint_id)],
+                    {
+                        "status": status,
+                        "priority": priority,
+                        "staff_assigned": staff_assigned,
+                        "remarks": remarks,
+                    },
+                    current_time,
+                )
             flash(f"Complaint #{complaint_id} updated.")
             return redirect(
                 url_for(
@@ -770,219 +5267,941 @@ def admin_dashboard():
                     status_filter=status_filter,
                     category_filter=category_filter,
                     priority_filter=priority_filter,
+                    page_size=page_size,
+                    after=after,
+                    before=before,
+                    q=search or None,
+                    offset=offset or None,
                 )
             )
 
+    where_clauses, params, filters = build_complaint_filters(
+        reference, status_filter, category_filter, priority_filter
+    )
+    status_filter = filters["status"]
+    category_filter = filters["category"]
+    priority_filter = filters["priority"]
+
+    live_version = get_change_version(db, "complaints")
+    link_args = {
+        "status_filter": status_filter,
+        "category_filter": category_filter,
+        "priority_filter": priority_filter,
+        "page_size": page_size,
+    }
+    if search:
+        complaints, prev_offset, next_offset = search_complaints(
+            db, search, where_clauses, params, page_size, offset
+        )
+        link_args["q"] = search
+        prev_args = None if prev_offset is None else {"offset": prev_offset or None}
+        next_args = None if next_offset is None else {"offset": next_offset}
+    else:
+        complaints, prev_cursor, next_cursor = fetch_complaint_page(
+            db,
+            ", ".join(COMPLAINT_COLUMNS),
+            where_clauses,
+            params,
+            page_size,
+            after=after,
+            before=before,
+        )
+        prev_args = None if prev_cursor is None else {"before": prev_cursor}
+        next_args = None if next_cursor is None else {"after": next_cursor}
+    prev_url = None if prev_args is None else url_for("admin_dashboard", **link_args, **prev_args)
+    next_url = None if next_args is None else url_for("admin_dashboard", **link_args, **next_args)
+
+    summary = {"Pending": 0, "In Progress": 0, "Resolved": 0}
+    summary.update(get_counters(db, "status"))
+    archived = db.execute("SELECT COALESCE(SUM(complaints), 0) FROM complaint_archives").fetchone()[0]
+
+    return render_template(
+        "admin_dashboard.html",
+        complaints=complaints,
+        summary=summary,
+        archived=archived,
+        statuses=ALLOWED_STATUSES,
+        priorities=ALLOWED_PRIORITIES,
+        categories=reference.all_categories,
+        staff=reference.active_staff,
+        status_filter=status_filter,
+        category_filter=category_filter,
+        priority_filter=priority_filter,
+        page_sizes=PAGE_SIZE_OPTIONS,
+        page_size=page_size,
+        after=after,
+        before=before,
+        search=search,
+        search_max_length=SEARCH_MAX_LENGTH,
+        offset=offset,
+        prev_url=prev_url,
+        next_url=next_url,
+        live_version=live_version,
+    )
+
+
+@app.route("/admin/complaints/bulk-update", methods=["POST"])
+@admin_required
+def admin_bulk_update():
+    """Update many complaints in one transaction.
+
+    JSON body: ``complaint_ids`` (list) or ``filter`` (``status``/``category``/
+    ``priority``), plus any of ``status``, ``priority``, ``staff_assigned``
+    (a name from the staff list, or blank to unassign) and ``remarks``. The
+    dashboard's bulk form posts the same fields as form data with
+    ``complaint_ids`` from the row checkboxes.
+    """
+    db = get_db()
+    reference = get_reference_data(db)
+    wants_json = request.is_json
+    if wants_json:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({"error": "The request body must be a JSON object."}), 400
+        raw_ids = data.get("complaint_ids")
+        raw_filter = data.get("filter")
+        changes = {
+            field: str(data[field]).strip() for field in UPDATABLE_FIELDS if data.get(field) is not None
+        }
+    else:
+        raw_ids = request.form.getlist("complaint_ids") or None
+        raw_filter = None
+        changes = {
+            field: request.form[field].strip()
+            for field in UPDATABLE_FIELDS
+            if request.form.get(field, "").strip()
+        }
+
+    def redirect_to_dashboard():
+        return redirect(
+            url_for(
+                "admin_dashboard",
+                status_filter=request.form.get("status_filter", "All"),
+                category_filter=request.form.get("category_filter", "All"),
+                priority_filter=request.form.get("priority_filter", "All"),
+                page_size=request.form.get("page_size"),
+                q=request.form.get("q") or None,
+            )
+        )
+
+    def fail(message):
+        if wants_json:
+            return jsonify({"error": message}), 400
+        flash(message)
+        return redirect_to_dashboard()
+
+    if (raw_ids is None) == (raw_filter is None):
+        return fail("Select complaints to update, or give a filter (not both).")
+    if not changes:
+        return fail("Choose at least one field to change.")
+    if "status" in changes and changes["status"] not in ALLOWED_STATUSES:
+        return fail("Invalid status selected.")
+    if "priority" in changes and changes["priority"] not in ALLOWED_PRIORITIES:
+        return fail("Invalid priority selected.")
+    if changes.get("staff_assigned"):
+        staff_error = staff_assignment_error(db, reference, changes["staff_assigned"])
+        if staff_error:
+            return fail(staff_error)
+
+    complaint_ids = []
     where_clauses = []
     params = []
-    if status_filter in ALLOWED_STATUSES:
-        where_clauses.append("status = ?")
-        params.append(status_filter)
+    if raw_ids is not None:
+        if not isinstance(raw_ids, list) or not all(str(item).strip().isdigit() for item in raw_ids):
+            return fail("Complaint IDs must be a list of numbers.")
+        complaint_ids = list(dict.fromkeys(int(str(item).strip()) for item in raw_ids))
+        if len(complaint_ids) > BULK_UPDATE_MAX_ROWS:
+            return fail(f"At most {BULK_UPDATE_MAX_ROWS} complaints can be updated at once.")
     else:
-        status_filter = "All"
+        if not isinstance(raw_filter, dict):
+            return fail("Filter must be an object with status, category or priority.")
+        where_clauses, params, _ = build_complaint_filters(
+            reference, raw_filter.get("status"), raw_filter.get("category"), raw_filter.get("priority")
+        )
+        if not where_clauses:
+            return fail("Filter must match on at least one valid status, category or priority.")
 
-    if category_filter in ALLOWED_CATEGORIES:
-        where_clauses.append("category = ?")
-        params.append(category_filter)
-    else:
-        category_filter = "All"
+    current_time = int(time.time())
+    with immediate_transaction(db):
+        if where_clauses:
+            complaint_ids = [
+                row["id"]
+                for row in db.execute(
+                    f"SELECT id FROM complaints WHERE {' AND '.join(where_clauses)} "
+                    "ORDER BY sort_key LIMIT ?",
+                    (*params, BULK_UPDATE_MAX_ROWS + 1),
+                ).fetchall()
+            ]
+            if len(complaint_ids) > BULK_UPDATE_MAX_ROWS:
+                return fail(
+                    f"Filter matches more than {BULK_UPDATE_MAX_ROWS} complaints; narrow it down."
+                )
+        results = apply_complaint_updates(db, complaint_ids, changes, current_time)
+
+    updated = sum(1 for item in results if item["result"] == "updated")
+    if wants_json:
+        return jsonify(
+            {"updated": updated, "not_found": len(results) - updated, "results": results}
+        )
+    flash(f"{updated} complaint(s) updated.")
+    return redirect_to_dashboard()
+
+
+@app.route("/admin/complaints/export")
+@admin_required
+def admin_export_complaints():
+    export_format = request.args.get("format", "csv").strip().lower()
+    if export_format not in EXPORT_FORMATS:
+        return api_error("format must be csv or jsonl.", 400)
+    try:
+        date_from = parse_export_date(request.args.get("from", "").strip())
+        date_to = parse_export_date(request.args.get("to", "").strip())
+    except ValueError:
+        return api_error("from and to must be dates in YYYY-MM-DD format.", 400)
+    where_clauses, params, _ = build_complaint_filters(
+        get_reference_data(get_db()),
+        request.args.get("status", "All").strip(),
+        request.args.get("category", "All").strip(),
+        request.args.get("priority", "All").strip(),
+    )
+    add_date_range(where_clauses, params, date_from, date_to)
 
-    if priority_filter in ALLOWED_PRIORITIES:
-        where_clauses.append("priority = ?")
-        params.append(priority_filter)
+    # A connection of its own, outside the pool: a long export must not hold
+    # one of the slots page requests are waiting for.
+    conn = get_pool().connect()
+    encoded = (
+        chunk.encode("utf-8")
+        for chunk in iter_complaint_export(
+            conn, export_format, where_clauses, params, app.config["EXPORT_BATCH_ROWS"]
+        )
+    )
+
+    def release():
+        encoded.close()
+        conn.close()
+
+    # Buffer up to the gzip threshold to learn whether the export is large.
+    head = []
+    head_size = 0
+    exhausted = True
+    try:
+        for chunk in encoded:
+            head.append(chunk)
+            head_size += len(chunk)
+            if head_size >= app.config["EXPORT_GZIP_MIN_BYTES"]:
+                exhausted = False
+                break
+    except BaseException:
+        release()
+        raise
+
+    def body():
+        try:
+            yield from head
+            if not exhausted:
+                yield from encoded
+        finally:
+            release()
+
+    filename = f"complaints-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{export_format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"', "Vary": "Accept-Encoding"}
+    # accept_encodings honours q-values, so "gzip;q=0" declines it.
+    if not exhausted and request.accept_encodings["gzip"]:
+        headers["Content-Encoding"] = "gzip"
+        response = Response(gzip_chunks(body()), mimetype=EXPORT_FORMATS[export_format], headers=headers)
     else:
-        priority_filter = "All"
+        response = Response(body(), mimetype=EXPORT_FORMATS[export_format], headers=headers)
+    # body()'s finally only runs once the body is iterated; a HEAD request or a
+    # client gone before the first chunk closes the response without that.
+    response.call_on_close(release)
+    return response
 
-    base_query = """
-        SELECT id, hostel_block, room_number, category, priority, description, status,
-               staff_assigned, remarks, created_at, updated_at
-        FROM complaints
-    """
-    if where_clauses:
-        base_query += " WHERE " + " AND ".join(where_clauses)
-    base_query += """
-        ORDER BY
-          CASE status
-            WHEN 'Pending' THEN 1
-            WHEN 'In Progress' THEN 2
-            WHEN 'Resolved' THEN 3
-            ELSE 4
-          END,
-          CASE priority
-            WHEN 'High' THEN 1
-            WHEN 'Medium' THEN 2
-            WHEN 'Low' THEN 3
-            ELSE 4
-          END,
-          id DESC
-    """
-
-    complaints = db.execute(
-        base_query,
+
+@app.route("/admin/analytics")
+@admin_required
+def admin_analytics():
+    db = get_db()
+    categories = get_reference_data(db).all_categories
+    try:
+        options = parse_analytics_args(request.args, categories)
+    except ValueError:
+        flash("Dates must be in YYYY-MM-DD format.")
+        options = parse_analytics_args({}, categories)
+    return render_template(
+        "admin_analytics.html",
+        analytics=build_analytics(
+            db,
+            options["granularity"],
+            options["from"],
+            options["to"],
+            options["hostel_block"],
+            options["category"],
+        ),
+        granularities=list(ROLLUP_GRANULARITIES),
+        blocks=sorted(block for block in get_counters(db, "hostel_block") if block),
+        categories=categories,
+    )
+
+
+@app.route("/admin/archive")
+@admin_required
+def admin_archive():
+    db = get_db()
+    tables, term = get_term_archive_tables(db, request.args.get("term", "All").strip())
+    reference = get_reference_data(db)
+    where_clauses, params, filters = build_complaint_filters(
+        reference,
+        "All",
+        request.args.get("category_filter", "All").strip(),
+        request.args.get("priority_filter", "All").strip(),
+    )
+    page_size = parse_page_size(request.args.get("page_size", "").strip())
+    complaints, prev_cursor, next_cursor = fetch_archived_page(
+        db,
+        tables,
+        where_clauses,
         params,
-    ).fetchall()
+        page_size,
+        after=parse_cursor(request.args.get("after", "").strip()),
+        before=parse_cursor(request.args.get("before", "").strip()),
+    )
+    link_args = {
+        "term": term,
+        "category_filter": filters["category"],
+        "priority_filter": filters["priority"],
+        "page_size": page_size,
+    }
+    return render_template(
+        "admin_archive.html",
+        complaints=complaints,
+        terms=get_archive_terms(db),
+        term=term,
+        categories=reference.all_categories,
+        priorities=ALLOWED_PRIORITIES,
+        category_filter=filters["category"],
+        priority_filter=filters["priority"],
+        page_sizes=PAGE_SIZE_OPTIONS,
+        page_size=page_size,
+        archive_after_days=app.config["ARCHIVE_AFTER_DAYS"],
+        prev_url=None if prev_cursor is None else url_for("admin_archive", **link_args, before=prev_cursor),
+        next_url=None if next_cursor is None else url_for("admin_archive", **link_args, after=next_cursor),
+    )
+
 
-    summary_rows = db.execute(
+def clean_reference_name(value, label):
+    name = " ".join(value.split())
+    if not name:
+        raise ValueError(f"{label} name is required.")
+    if len(name) > REFERENCE_NAME_MAX_LENGTH:
+        raise ValueError(f"{label} name must be at most {REFERENCE_NAME_MAX_LENGTH} characters.")
+    return name
+
+
+def parse_skills(value):
+    """Comma separated skills, trimmed and without repeats."""
+    skills = {}
+    for item in value.split(","):
+        skill = " ".join(item.split())
+        if len(skill) > REFERENCE_NAME_MAX_LENGTH:
+            raise ValueError(f"Skill names must be at most {REFERENCE_NAME_MAX_LENGTH} characters.")
+        if skill:
+            skills.setdefault(skill.casefold(), skill)
+    return list(skills.values())
+
+
+def parse_room_numbers(value):
+    """Room numbers from a list like ``101-140, 201, G-01``.
+
+    ``101-140`` is every room from 101 to 140, zero-padded to the width of
+    the first number; anything else is a single room.
+    """
+    rooms = {}
+    for item in value.upper().split(","):
+        item = item.strip()
+        if not item:
+            continue
+        match = re.fullmatch(r"(\d+)\s*-\s*(\d+)", item)
+        if match:
+            first, last = int(match.group(1)), int(match.group(2))
+            if last < first or last - first >= MAX_ROOMS_PER_RANGE:
+                raise ValueError(f"Room range {item} must count up and cover at most {MAX_ROOMS_PER_RANGE} rooms.")
+            width = len(match.group(1))
+            for number in range(first, last + 1):
+                rooms.setdefault(str(number).zfill(width))
+        elif re.fullmatch(r"[A-Z0-9/-]{1,20}", item):
+            rooms.setdefault(item)
+        else:
+            raise ValueError(f"{item} is not a valid room number.")
+    if not rooms:
+        raise ValueError("Enter at least one room number.")
+    return list(rooms)
+
+
+def parse_reference_id(value):
+    if not value.isdigit():
+        raise ValueError("Invalid reference entry.")
+    return int(value)
+
+
+def parse_category_skill(value):
+    """The one skill a category needs; blank is None (never auto-assigned)."""
+    skills = parse_skills(value)
+    if len(skills) > 1:
+        raise ValueError("A category needs a single skill.")
+    return skills[0] if skills else None
+
+
+def parse_home_block(db, value):
+    if not value:
+        return None
+    block_id = parse_reference_id(value)
+    if db.execute("SELECT 1 FROM hostel_blocks WHERE id = ?", (block_id,)).fetchone() is None:
+        raise ValueError("Choose a listed block.")
+    return block_id
+
+
+def apply_reference_change(db, action, form):
+    """Apply one Reference Data form to the tables and describe the change.
+
+    Runs inside the caller's transaction; raises ValueError for input the
+    admin has to correct.
+    """
+    if action == "add_category":
+        name = clean_reference_name(form.get("name", ""), "Category")
+        skill = parse_category_skill(form.get("skill", ""))
+        if db.execute("SELECT 1 FROM complaint_categories WHERE name = ?", (name,)).fetchone():
+            raise ValueError(f"Category {name} already exists.")
+        db.execute("INSERT INTO complaint_categories (name, skill) VALUES (?, ?)", (name, skill))
+        return f"Category {name} added."
+    if action == "set_category_skill":
+        code = parse_reference_id(form.get("code", ""))
+        skill = parse_category_skill(form.get("skill", ""))
+        db.execute("UPDATE complaint_categories SET skill = ? WHERE code = ?", (skill, code))
+        return f"Category now needs {skill}." if skill else "Category is no longer assigned automatically."
+    if action == "set_category_active":
+        code = parse_reference_id(form.get("code", ""))
+        active = form.get("active") == "1"
+        db.execute("UPDATE complaint_categories SET active = ? WHERE code = ?", (int(active), code))
+        if not db.execute("SELECT 1 FROM complaint_categories WHERE active").fetchone():
+            raise ValueError("At least one category must stay active.")
+        return "Category restored." if active else "Category retired."
+    if action == "add_block":
+        name = clean_reference_name(form.get("name", ""), "Block")
+        if db.execute("SELECT 1 FROM hostel_blocks WHERE name = ?", (name,)).fetchone():
+            raise ValueError(f"Block {name} already exists.")
+        db.execute("INSERT INTO hostel_blocks (name) VALUES (?)", (name,))
+        return f"Block {name} added."
+    if action == "set_block_active":
+        block_id = parse_reference_id(form.get("id", ""))
+        active = form.get("active") == "1"
+        db.execute("UPDATE hostel_blocks SET active = ? WHERE id = ?", (int(active), block_id))
+        return "Block restored." if active else "Block retired."
+    if action in ("add_rooms", "remove_rooms"):
+        block = db.execute(
+            "SELECT id, name FROM hostel_blocks WHERE id = ?", (parse_reference_id(form.get("id", "")),)
+        ).fetchone()
+        if block is None:
+            raise ValueError("Choose a listed block.")
+        rooms = [(block["id"], number) for number in parse_room_numbers(form.get("rooms", ""))]
+        if action == "add_rooms":
+            changed = db.executemany(
+                "INSERT OR IGNORE INTO hostel_rooms (block_id, number) VALUES (?, ?)", rooms
+            ).rowcount
+            return f"{changed} room(s) added to {block['name']}."
+        changed = db.executemany("DELETE FROM hostel_rooms WHERE block_id = ? AND number = ?", rooms).rowcount
+        return f"{changed} room(s) removed from {block['name']}."
+    if action == "add_staff":
+        name = clean_reference_name(form.get("name", ""), "Staff")
+        skills = parse_skills(form.get("skills", ""))
+        home_block_id = parse_home_block(db, form.get("home_block_id", ""))
+        if db.execute("SELECT 1 FROM staff WHERE name = ?", (name,)).fetchone():
+            raise ValueError(f"{name} is already on the staff list.")
+        staff_id = db.execute(
+            "INSERT INTO staff (name, on_duty, home_block_id) VALUES (?, ?, ?)",
+            (name, int(form.get("on_duty") == "1"), home_block_id),
+        ).lastrowid
+        db.executemany("INSERT INTO staff_skills (staff_id, skill) VALUES (?, ?)", [(staff_id, s) for s in skills])
+        return f"{name} added to the staff list."
+    if action == "update_staff":
+        member = db.execute(
+            "SELECT id, name FROM staff WHERE id = ?", (parse_reference_id(form.get("id", "")),)
+        ).fetchone()
+        if member is None:
+            raise ValueError("Choose a listed staff member.")
+        skills = parse_skills(form.get("skills", ""))
+        home_block_id = parse_home_block(db, form.get("home_block_id", ""))
+        db.execute(
+            "UPDATE staff SET on_duty = ?, active = ?, home_block_id = ? WHERE id = ?",
+            (int(form.get("on_duty") == "1"), int(form.get("active") == "1"), home_block_id, member["id"]),
+        )
+        db.execute("DELETE FROM staff_skills WHERE staff_id = ?", (member["id"],))
+        db.executemany(
+            "INSERT INTO staff_skills (staff_id, skill) VALUES (?, ?)", [(member["id"], s) for s in skills]
+        )
+        return f"{member['name']} updated."
+    raise ValueError("Unknown reference data action.")
+
+
+@app.route("/admin/reference", methods=["GET", "POST"])
+@admin_required
+def admin_reference():
+    db = get_db()
+    if request.method == "POST":
+        try:
+            with immediate_transaction(db):
+                message = apply_reference_change(db, request.form.get("action", ""), request.form)
+        except ValueError as error:
+            flash(str(error))
+        else:
+            invalidate_reference_data()
+            flash(message)
+        return redirect(url_for("admin_reference"))
+
+    categories = db.execute("SELECT code, name, active, skill FROM complaint_categories ORDER BY code").fetchall()
+    blocks = db.execute(
         """
-        SELECT status, COUNT(*) AS total
-        FROM complaints
-        GROUP BY status
+        SELECT b.id, b.name, b.active,
+               (SELECT group_concat(number, ', ')
+                FROM (SELECT number FROM hostel_rooms WHERE block_id = b.id
+                      ORDER BY length(number), number)) AS rooms
+        FROM hostel_blocks AS b
+        ORDER BY b.name
         """
     ).fetchall()
-    summary = {"Pending": 0, "In Progress": 0, "Resolved": 0}
-    for row in summary_rows:
-        summary[row["status"]] = row["total"]
-
-    return render_template_string(
-        """
-        <!doctype html>
-        <html>
-        <head>
-          <meta charset="utf-8">
-          <meta name="viewport" content="width=device-width, initial-scale=1">
-          <title>Admin Dashboard</title>
-          <style>{{ style }}</style>
-        </head>
-        <body>
-          <div class="nav">
-            <a href="{{ url_for('index') }}">Home</a>
-            <span class="nav-title">Admin Portal ({{ session['admin_username'] }})</span>
-            <a href="{{ url_for('admin_logout') }}">Logout</a>
-          </div>
-          <div class="container">
-            <div class="brand-header">
-              <img class="brand-logo" src="{{ college_logo_url }}" alt="{{ college_name }} logo">
-            </div>
-            <div class="card">
-              <h2>All Complaints</h2>
-              <p class="small">Student identity is hidden in admin view as requested.</p>
-              <p>
-                <span class="chip">Pending: {{ summary['Pending'] }}</span>
-                <span class="chip">In Progress: {{ summary['In Progress'] }}</span>
-                <span class="chip">Resolved: {{ summary['Resolved'] }}</span>
-                <span class="chip">Visible (Filtered): {{ complaints|length }}</span>
-              </p>
-
-              <form method="get">
-                <label for="status_filter">Filter by Status</label>
-                <select id="status_filter" name="status_filter">
-                  <option value="All" {% if status_filter == 'All' %}selected{% endif %}>All</option>
-                  {% for item in statuses %}
-                    <option value="{{ item }}" {% if status_filter == item %}selected{% endif %}>{{ item }}</option>
-                  {% endfor %}
-                </select>
+    staff = db.execute(
+        """
+        SELECT s.id, s.name, s.on_duty, s.active, s.home_block_id,
+               (SELECT group_concat(skill, ', ')
+                FROM (SELECT skill FROM staff_skills WHERE staff_id = s.id ORDER BY skill)) AS skills
+        FROM staff AS s
+        ORDER BY s.active DESC, s.name
+        """
+    ).fetchall()
+    return render_template(
+        "admin_reference.html",
+        categories=categories,
+        blocks=blocks,
+        staff=staff,
+        max_name=REFERENCE_NAME_MAX_LENGTH,
+        auto_assign=app.config["AUTO_ASSIGN_ENABLED"],
+    )
 
-                <label for="category_filter">Filter by Category</label>
-                <select id="category_filter" name="category_filter">
-                  <option value="All" {% if category_filter == 'All' %}selected{% endif %}>All</option>
-                  {% for item in categories %}
-                    <option value="{{ item }}" {% if category_filter == item %}selected{% endif %}>{{ item }}</option>
-                  {% endfor %}
-                </select>
 
-                <label for="priority_filter">Filter by Priority</label>
-                <select id="priority_filter" name="priority_filter">
-                  <option value="All" {% if priority_filter == 'All' %}selected{% endif %}>All</option>
-                  {% for item in priorities %}
-                    <option value="{{ item }}" {% if priority_filter == item %}selected{% endif %}>{{ item }}</option>
-                  {% endfor %}
-                </select>
-                <button type="submit" class="btn btn-secondary">Apply Filters</button>
-              </form>
+def api_error(message, status):
+    return jsonify({"error": message}), status
 
-              {% with messages = get_flashed_messages() %}
-                {% if messages %}
-                  {% for message in messages %}
-                    <div class="alert">{{ message }}</div>
-                  {% endfor %}
-                {% endif %}
-              {% endwith %}
-
-              {% if complaints %}
-                <div class="table-wrap">
-                  <table>
-                    <thead>
-                      <tr>
-                        <th>ID</th>
-                        <th>Block</th>
-                        <th>Room</th>
-                        <th>Category</th>
-                        <th>Priority</th>
-                        <th>Description</th>
-                        <th>Status</th>
-                        <th>Assigned Staff</th>
-                        <th>Remarks</th>
-                        <th>Created</th>
-                        <th>Last Updated</th>
-                        <th>Actions</th>
-                      </tr>
-                    </thead>
-                    <tbody>
-                    {% for row in complaints %}
-                      <tr>
-                        <td>{{ row['id'] }}</td>
-                        <td>{{ row['hostel_block'] }}</td>
-                        <td>{{ row['room_number'] }}</td>
-                        <td>{{ row['category'] }}</td>
-                        <td class="{{ priority_class(row['priority']) }}">{{ row['priority'] }}</td>
-                        <td>{{ row['description'] }}</td>
-                        <td class="{{ status_class(row['status']) }}">{{ row['status'] }}</td>
-                        <td>{{ row['staff_assigned'] or '-' }}</td>
-                        <td>{{ row['remarks'] or '-' }}</td>
-                        <td>{{ row['created_at'] }}</td>
-                        <td>{{ row['updated_at'] or row['created_at'] }}</td>
-                        <td>
-                          <form method="post">
-                            <input type="hidden" name="complaint_id" value="{{ row['id'] }}">
-                            <input type="hidden" name="status_filter" value="{{ status_filter }}">
-                            <input type="hidden" name="category_filter" value="{{ category_filter }}">
-                            <input type="hidden" name="priority_filter" value="{{ priority_filter }}">
-                            <label>Status</label>
-                            <select name="status" required>
-                              {% for item in statuses %}
-                                <option value="{{ item }}" {% if item == row['status'] %}selected{% endif %}>{{ item }}</option>
-                              {% endfor %}
-                            </select>
-
-                            <label>Priority</label>
-                            <select name="priority" required>
-                              {% for item in priorities %}
-                                <option value="{{ item }}" {% if item == row['priority'] %}selected{% endif %}>{{ item }}</option>
-                              {% endfor %}
-                            </select>
-
-                            <label>Assign Staff</label>
-                            <input type="text" name="staff_assigned" value="{{ row['staff_assigned'] or '' }}" placeholder="e.g. Electrician Ravi">
-
-                            <label>Remarks</label>
-                            <textarea name="remarks" placeholder="Add remarks">{{ row['remarks'] or '' }}</textarea>
-
-                            <button type="submit">Update</button>
-                          </form>
-                        </td>
-                      </tr>
-                    {% endfor %}
-                    </tbody>
-                  </table>
-                </div>
-              {% else %}
-                <p class="small">No complaints available.</p>
-              {% endif %}
-            </div>
-          </div>
-        </body>
-        </html>
-        """,
-        style=STYLE,
-        complaints=complaints,
-        summary=summary,
-        statuses=ALLOWED_STATUSES,
-        priorities=ALLOWED_PRIORITIES,
-        categories=ALLOWED_CATEGORIES,
-        status_filter=status_filter,
-        category_filter=category_filter,
-        priority_filter=priority_filter,
+
+def conditional_json(db, scope, variant, build_payload):
+    """Serve ``build_payload()`` as JSON with an ETag from the scope's change
+    version; a matching If-None-Match gets 304 before the payload is built."""
+    digest = hashlib.sha1(variant.encode("utf-8")).hexdigest()[:12]
+    etag = f"{scope}-{get_change_version(db, scope)}-{digest}"
+    # Weak, since the same payload may be sent gzip- or brotli-encoded.
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(build_payload())
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+@app.route("/api/v1/complaints")
+def api_complaints():
+    if not session.get("admin_id"):
+        return api_error("Admin login required.", 401)
+    db = get_db()
+    where_clauses, params, filters = build_complaint_filters(
+        get_reference_data(db),
+        request.args.get("status", "All").strip(),
+        request.args.get("category", "All").strip(),
+        request.args.get("priority", "All").strip(),
+    )
+    page_size = parse_page_size(request.args.get("page_size", "").strip())
+    after = parse_cursor(request.args.get("after", "").strip())
+    before = parse_cursor(request.args.get("before", "").strip())
+    search = request.args.get("q", "").strip()[:SEARCH_MAX_LENGTH]
+    offset = parse_cursor(request.args.get("offset", "").strip()) or 0
+
+    def build_payload():
+        if search:
+            rows, prev_offset, next_offset = search_complaints(
+                db, search, where_clauses, params, page_size, offset
+            )
+            paging = {"q": search, "prev_offset": prev_offset, "next_offset": next_offset}
+        else:
+            rows, prev_cursor, next_cursor = fetch_complaint_page(
+                db,
+                ", ".join(COMPLAINT_COLUMNS),
+                where_clauses,
+                params,
+                page_size,
+                after=after,
+                before=before,
+            )
+            paging = {"prev_cursor": prev_cursor, "next_cursor": next_cursor}
+        return {
+            "complaints": [complaint_to_dict(row) for row in rows],
+            "filters": filters,
+            "page_size": page_size,
+            **paging,
+        }
+
+    variant = f"{filters}|{page_size}|{after}|{before}|{search}|{offset}"
+    return conditional_json(db, "complaints", variant, build_payload)
+
+
+@app.route("/api/v1/students/<roll_number>/complaints")
+def api_student_complaints(roll_number):
+    if session.get("student_roll") != roll_number:
+        return api_error("Log in as this student to view their complaints.", 403)
+    db = get_db()
+    include_archived = request.args.get("archived") == "1"
+    return conditional_json(
+        db,
+        student_scope(roll_number),
+        f"history|{include_archived}",
+        lambda: {
+            "roll_number": roll_number,
+            "max_active": MAX_ACTIVE_COMPLAINTS,
+            "complaints": [
+                complaint_to_dict(row)
+                for row in fetch_student_complaints(db, roll_number, include_archived)
+            ],
+        },
+    )
+
+
+@app.route("/api/v1/summary")
+def api_summary():
+    if not session.get("admin_id"):
+        return api_error("Admin login required.", 401)
+    db = get_db()
+    return conditional_json(
+        db,
+        "complaints",
+        "summary",
+        lambda: {
+            **{dimension: get_counters(db, dimension) for dimension in COUNTER_DIMENSIONS},
+            "archived": {row["term"]: row["complaints"] for row in get_archive_terms(db)},
+        },
+    )
+
+
+@app.route("/api/v1/analytics")
+def api_analytics():
+    if not session.get("admin_id"):
+        return api_error("Admin login required.", 401)
+    db = get_db()
+    try:
+        options = parse_analytics_args(request.args, get_reference_data(db).all_categories)
+    except ValueError:
+        return api_error("from and to must be dates in YYYY-MM-DD format.", 400)
+    # Backlog ages move with the calendar, so today's date is part of the variant.
+    variant = f"{sorted(options.items())}|{date.today()}"
+    return conditional_json(
+        db,
+        "complaints",
+        variant,
+        lambda: build_analytics(
+            db,
+            options["granularity"],
+            options["from"],
+            options["to"],
+            options["hostel_block"],
+            options["category"],
+        ),
+    )
+
+
+@app.route("/api/v1/archive")
+def api_archive():
+    if not session.get("admin_id"):
+        return api_error("Admin login required.", 401)
+    db = get_db()
+    tables, term = get_term_archive_tables(db, request.args.get("term", "All").strip())
+    where_clauses, params, filters = build_complaint_filters(
+        get_reference_data(db),
+        "All",
+        request.args.get("category", "All").strip(),
+        request.args.get("priority", "All").strip(),
+    )
+    page_size = parse_page_size(request.args.get("page_size", "").strip())
+    after = parse_cursor(request.args.get("after", "").strip())
+    before = parse_cursor(request.args.get("before", "").strip())
+
+    def build_payload():
+        rows, prev_cursor, next_cursor = fetch_archived_page(
+            db, tables, where_clauses, params, page_size, after=after, before=before
+        )
+        return {
+            "complaints": [complaint_to_dict(row) for row in rows],
+            "term": term,
+            "filters": {"category": filters["category"], "priority": filters["priority"]},
+            "page_size": page_size,
+            "prev_cursor": prev_cursor,
+            "next_cursor": next_cursor,
+        }
+
+    # Archiving deletes from complaints, which bumps this scope's version.
+    variant = f"archive|{term}|{filters}|{page_size}|{after}|{before}"
+    return conditional_json(db, "complaints", variant, build_payload)
+
+
+@app.route("/api/v1/complaints/<int:complaint_id>/timeline")
+def api_complaint_timeline(complaint_id):
+    roll_number = session.get("student_roll")
+    if not session.get("admin_id") and not roll_number:
+        return api_error("Login required.", 401)
+    db = get_db()
+    owner = fetch_complaint_roll_number(db, complaint_id)
+    if owner is None or (not session.get("admin_id") and owner != roll_number):
+        return api_error("Complaint not found.", 404)
+    scope = "complaints" if session.get("admin_id") else student_scope(roll_number)
+    return conditional_json(
+        db,
+        scope,
+        f"timeline|{complaint_id}",
+        lambda: {"complaint_id": complaint_id, "events": fetch_complaint_timeline(db, complaint_id)},
+    )
+
+
+@app.route("/api/v1/sla")
+def api_sla():
+    if not session.get("admin_id"):
+        return api_error("Admin login required.", 401)
+    try:
+        date_to = parse_export_date(request.args.get("to", "").strip()) or datetime.combine(
+            date.today(), datetime.min.time()
+        )
+        date_from = parse_export_date(request.args.get("from", "").strip()) or date_to - timedelta(days=29)
+    except ValueError:
+        return api_error("from and to must be dates in YYYY-MM-DD format.", 400)
+    db = get_db()
+    return conditional_json(
+        db, "complaints", f"sla|{date_from}|{date_to}", lambda: build_sla_metrics(db, date_from, date_to)
+    )
+
+
+def event_stream_response(matches):
+    subscription = event_hub.subscribe(
+        matches, app.config["SSE_QUEUE_LIMIT"], app.config["SSE_MAX_SUBSCRIBERS"]
+    )
+    if subscription is None:
+        response = app.response_class("Too many live connections, try again later.", status=503)
+        response.headers["Retry-After"] = "30"
+        return response
+    keepalive = app.config["SSE_KEEPALIVE_SECONDS"]
+
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                events, overflowed = event_hub.wait(subscription, keepalive)
+                if overflowed:
+                    # Events were dropped for this slow client; it should reload.
+                    yield "event: resync\ndata: {}\n\n"
+                    continue
+                if not events:
+                    yield ": keepalive\n\n"
+                    continue
+                for event in events:
+                    data = json.dumps(
+                        {
+                            "changed": event["changed"],
+                            "complaint": event["complaint"],
+                        }
+                    )
+                    yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {data}\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    response = Response(generate(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@app.route("/student/changes")
+@student_required
+def student_changes():
+    db = get_db()
+    scope = student_scope(session["student_roll"])
+    return conditional_json(db, scope, "changes", lambda: {"version": get_change_version(db, scope)})
+
+
+@app.route("/admin/changes")
+@admin_required
+def admin_changes():
+    db = get_db()
+    return conditional_json(db, "complaints", "changes", lambda: {"version": get_change_version(db, "complaints")})
+
+
+@app.route("/student/events")
+@student_required
+def student_events():
+    roll_number = session["student_roll"]
+    return event_stream_response(lambda event: event["roll_number"] == roll_number)
+
+
+@app.route("/admin/events")
+@admin_required
+def admin_events():
+    _, _, filters = build_complaint_filters(
+        get_reference_data(get_db()),
+        request.args.get("status_filter", "All").strip(),
+        request.args.get("category_filter", "All").strip(),
+        request.args.get("priority_filter", "All").strip(),
+    )
+    wanted = {column: value for column, value in filters.items() if value != "All"}
+
+    def matches(event):
+        complaint = event["complaint"]
+        return all(complaint[column] == value for column, value in wanted.items())
+
+    return event_stream_response(matches)
+
+
+@app.route("/metrics")
+def metrics():
+    if not app.config["INSTRUMENTATION_ENABLED"]:
+        abort(404)
+    return app.response_class(prometheus_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/admin/metrics/slow-queries")
+@admin_required
+def admin_slow_queries():
+    with _slow_queries_lock:
+        entries = list(slow_queries)
+    return jsonify(entries)
+
+
+@app.route("/admin/metrics/db-pool")
+@admin_required
+def admin_db_pool_metrics():
+    return jsonify(get_pool().stats())
+
+
+@app.route("/admin/metrics/write-queue")
+@admin_required
+def admin_write_queue_metrics():
+    if not app.config["GROUP_COMMIT_ENABLED"]:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **get_writer().stats()})
+
+
+@app.route("/admin/metrics/assignment")
+@admin_required
+def admin_assignment_metrics():
+    if not app.config["AUTO_ASSIGN_ENABLED"]:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **get_assignment_engine().stats()})
+
+
+@app.route("/admin/metrics/history-cache")
+@admin_required
+def admin_history_cache_metrics():
+    cache = get_history_cache()
+    return jsonify({"enabled": False} if cache is None else {"enabled": True, **cache.stats()})
+
+
+@app.route("/admin/metrics/auth")
+@admin_required
+def admin_auth_metrics():
+    limiters = get_auth_limiters()
+    return jsonify(
+        {
+            "ip_limiter": limiters["ip"].stats(),
+            "username_limiter": limiters["username"].stats(),
+            "password_hashing": get_password_hasher().stats(),
+        }
+    )
+
+
+@app.cli.command("rebuild-counters")
+def rebuild_counters_command():
+    """Recompute the summary and per-student active counters from complaints."""
+    db = get_db()
+    with immediate_transaction(db):
+        rebuild_counters(db)
+    click.echo("Complaint counters rebuilt.")
+
+
+@app.cli.command("backfill-rollups")
+def backfill_rollups_command():
+    """Recompute the hourly and daily analytics rollups from complaints."""
+    db = get_db()
+    with immediate_transaction(db):
+        rebuild_complaint_rollups(db)
+    click.echo("Complaint rollups rebuilt.")
+
+
+@app.cli.command("export-complaints")
+@click.option("--format", "export_format", type=click.Choice(sorted(EXPORT_FORMATS)), default="csv")
+@click.option("--status", default="All")
+@click.option("--category", default="All")
+@click.option("--priority", default="All")
+@click.option("--from", "date_from", type=click.DateTime(["%Y-%m-%d"]), help="first day, inclusive")
+@click.option("--to", "date_to", type=click.DateTime(["%Y-%m-%d"]), help="last day, inclusive")
+@click.option("--output", "-o", default="-", help="file to write; .gz is gzip-compressed")
+def export_complaints_command(export_format, status, category, priority, date_from, date_to, output):
+    """Stream complaints (without roll numbers) as CSV or JSONL."""
+    db = get_db()
+    where_clauses, params, _ = build_complaint_filters(get_reference_data(db), status, category, priority)
+    add_date_range(where_clauses, params, date_from, date_to)
+    chunks = iter_complaint_export(db, export_format, where_clauses, params, app.config["EXPORT_BATCH_ROWS"])
+    if output == "-":
+        for chunk in chunks:
+            click.echo(chunk, nl=False)
+        return
+    opener = gzip.open if output.endswith(".gz") else open
+    with opener(output, "wt", encoding="utf-8", newline="") as handle:
+        for chunk in chunks:
+            handle.write(chunk)
+
+
+@app.cli.command("import-complaints")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", type=int, default=None, help="rows per transaction")
+@click.option("--rejects", default=None, help="csv for rejected rows (default: PATH.rejected.csv)")
+@click.option("--restart", is_flag=True, help="discard an interrupted import of PATH and start over")
+def import_complaints_command(path, batch_size, rejects, restart):
+    """Import legacy complaints from a CSV file.
+
+    Columns: roll_number, hostel_block, room_number, category, priority,
+    description, and optionally status, staff_assigned, remarks, created_at,
+    updated_at. Running it again after an interruption resumes the import.
+    """
+    rejects = rejects or os.path.splitext(path)[0] + ".rejected.csv"
+    started = time.perf_counter()
+    try:
+        result = import_complaints(
+            get_db(), path, batch_size or app.config["IMPORT_BATCH_ROWS"], rejects, restart
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    click.echo(
+        f"Imported {result['staged']} complaints and rejected {result['rejected']} "
+        f"in {time.perf_counter() - started:.1f}s."
+    )
+    if result["rejected"]:
+        click.echo(f"Rejected rows written to {rejects}.", err=True)
+
+
+@app.cli.command("archive-complaints")
+@click.option("--older-than", type=int, default=None, help="days since resolution (default: ARCHIVE_AFTER_DAYS)")
+@click.option("--batch-size", type=int, default=None, help="complaints moved per transaction")
+def archive_complaints_command(older_than, batch_size):
+    """Move old Resolved complaints into the per-term archive tables."""
+    started = time.perf_counter()
+    archived = archive_complaints(
+        get_db(),
+        app.config["ARCHIVE_AFTER_DAYS"] if older_than is None else older_than,
+        batch_size or app.config["ARCHIVE_BATCH_ROWS"],
+        app.config["ARCHIVE_BATCH_PAUSE"],
     )
+    click.echo(f"Archived {archived} complaints in {time.perf_counter() - started:.1f}s.")
 
 
 @app.route("/admin/logout")
@@ -993,9 +6212,60 @@ def admin_logout():
     return redirect(url_for("admin_login"))
 
 
-with app.app_context():
-    init_db()
+def reset_process_state():
+    """Drop per-process state inherited through fork.
+
+    SQLite connections, threads and locks must not cross a fork, so a forked
+    worker starts with no pools, no group-commit writer, a fresh hashing
+    pool, limiters, live-event hub, stack sampler, history cache and
+    assignment engine, and reads the reference data again.
+    """
+    global _pools_lock, _writers_lock, _assignment_engines_lock, _password_hasher, _password_hasher_lock
+    global _auth_limiters, _auth_limiters_lock, event_hub, stack_sampler
+    global _history_cache, _history_cache_lock, _slow_queries_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+    _reference_data.clear()
+    _writers.clear()
+    _writers_lock = threading.Lock()
+    _assignment_engines.clear()
+    _assignment_engines_lock = threading.Lock()
+    _password_hasher = None
+    _password_hasher_lock = threading.Lock()
+    _auth_limiters = None
+    _auth_limiters_lock = threading.Lock()
+    event_hub = EventHub()
+    stack_sampler = StackSampler(app.config["PROFILE_INTERVAL_MS"] / 1000)
+    _history_cache = None
+    _history_cache_lock = threading.Lock()
+    _slow_queries_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_process_state)
+
+
+def create_app(config=None):
+    """Configure the app and prepare it to serve; returns the Flask app.
+
+    ``config`` overrides ``app.config`` keys. With PROXY_FIX_X_FOR set, the
+    client address and scheme are taken from that many proxies' forwarding
+    headers. The schema is brought up to date
+    (once per database file, see ensure_schema) and templates are compiled.
+    Pools opened on the way are closed again, so a pre-fork server master
+    that calls this before forking hands no connections to its workers.
+    """
+    if config:
+        app.config.update(config)
+    hops = app.config["PROXY_FIX_X_FOR"]
+    if hops and not isinstance(app.wsgi_app, ProxyFix):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+    with app.app_context():
+        get_db()
+        precompile_templates()
+    close_pools()
+    return app
 
 
 if __name__ == "__main__":
-    app.run(debug=True, host="127.0.0.1", port=5000)
+    create_app().run(debug=True, host="127.0.0.1", port=5000)
@@ -0,0 +1,120 @@
+"""Time the analytics queries, read from the rollup tables, against the same
+aggregation computed from the raw complaints table.
+
+    python benchmarks/analytics.py --rows 500000 --years 5
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+
+def seed(rows, years):
+    rng = random.Random(17)
+    start = datetime.now() - timedelta(days=365 * years)
+    span = 365 * years * 86400
+
+    def complaint():
+        created = start + timedelta(seconds=rng.randrange(span))
+        # Complaints older than a couple of months are almost always resolved.
+        recent = (datetime.now() - created).days < 60
+        status = rng.choices(hostel.ALLOWED_STATUSES, weights=[2, 2, 6] if recent else [1, 1, 398])[0]
+        updated = created + timedelta(hours=rng.randrange(1, 240))
+        return (
+            f"4127{rng.randrange(20_000):06d}",
+            rng.choice(["A Block", "B Block", "C Block", "D Block"]),
+            str(rng.randrange(100, 400)),
+            hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+            hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+            "Socket near the study table sparks when a charger is plugged in.",
+            hostel.STATUS_CODES[status],
+            int(created.timestamp()),
+            int(updated.timestamp()),
+        )
+
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (complaint() for _ in range(rows)),
+            )
+        started = time.perf_counter()
+        with hostel.immediate_transaction(db):
+            hostel.rebuild_complaint_rollups(db)
+        print(f"backfill of {rows} complaints: {time.perf_counter() - started:.2f} s")
+
+
+def raw_trend(db, date_from, date_to):
+    return db.execute(
+        """
+        SELECT date(created_at, 'unixepoch', 'localtime') AS day, COUNT(*),
+            AVG(CASE WHEN status = ? THEN (updated_at - created_at) / 3600.0 END)
+        FROM complaints
+        WHERE created_at >= ? AND created_at < ?
+        GROUP BY day
+        """,
+        (
+            hostel.STATUS_CODES["Resolved"],
+            int(date_from.timestamp()),
+            int((date_to + timedelta(days=1)).timestamp()),
+        ),
+    ).fetchall()
+
+
+def raw_backlog(db):
+    return db.execute(
+        f"""
+        SELECT date(created_at, 'unixepoch', 'localtime'), COUNT(*)
+        FROM complaints
+        WHERE status IN {hostel.active_statuses_sql()}
+        GROUP BY 1
+        """
+    ).fetchall()
+
+
+def timed(run, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    seed(args.rows, args.years)
+
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        for label, granularity, days in [
+            ("30 days, daily", "day", 30),
+            ("1 year, daily", "day", 365),
+            ("2 days, hourly", "hour", 2),
+        ]:
+            date_from = today - timedelta(days=days - 1)
+            rollup_ms = timed(lambda: hostel.build_analytics(db, granularity, date_from, today), args.repeat)
+            raw_ms = timed(lambda: (raw_trend(db, date_from, today), raw_backlog(db)), args.repeat)
+            print(f"{label:<16} rollups {rollup_ms:8.2f} ms   raw complaints {raw_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
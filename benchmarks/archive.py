@@ -0,0 +1,180 @@
+"""Archive years of resolved complaints and compare the hot table and the
+dashboards before and after.
+
+Seeds complaints spread over several years (almost all old ones resolved),
+then runs the archiver while a second thread keeps submitting complaints,
+to show how long each batch holds the write lock and what a submission
+waits meanwhile.
+
+    python benchmarks/archive.py --rows 300000 --years 4
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+ADMIN_USERNAME = "archive"
+ADMIN_PASSWORD = "archive1234"
+STUDENT_ROLL = "4127000001"
+
+
+def seed(rows, years):
+    rng = random.Random(37)
+    now = datetime.now()
+    span = 365 * years * 86400
+
+    def complaint(index):
+        created = now - timedelta(seconds=rng.randrange(span))
+        recent = (now - created).days < 60
+        status = rng.choices(hostel.ALLOWED_STATUSES, weights=[2, 2, 6] if recent else [1, 1, 398])[0]
+        updated = created + timedelta(hours=rng.randrange(1, 240))
+        return (
+            STUDENT_ROLL if index % 5000 == 0 else f"4127{rng.randrange(20_000):06d}",
+            rng.choice(["A Block", "B Block", "C Block", "D Block"]),
+            str(rng.randrange(100, 400)),
+            hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+            hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+            "Corridor light outside the room flickers all night.",
+            hostel.STATUS_CODES[status],
+            int(created.timestamp()),
+            int(updated.timestamp()),
+        )
+
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (complaint(index) for index in range(rows)),
+            )
+            hostel.rebuild_complaint_rollups(db)
+            db.execute(
+                "INSERT INTO admins (username, password_hash, created_at) VALUES (?, ?, '2024-01-01 10:00:00')",
+                (ADMIN_USERNAME, hostel.generate_password_hash(ADMIN_PASSWORD)),
+            )
+            db.execute("DELETE FROM student_active_counts")
+            db.execute("ANALYZE")
+
+
+def timed(run, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def measure(repeat):
+    admin = hostel.app.test_client()
+    admin.post("/admin/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    student = hostel.app.test_client()
+    with student.session_transaction() as session:
+        session["student_roll"] = STUDENT_ROLL
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        hot = db.execute("SELECT COUNT(*) FROM complaints").fetchone()[0]
+        group_by_ms = timed(
+            lambda: db.execute("SELECT status, COUNT(*) FROM complaints GROUP BY status").fetchall(), repeat
+        )
+    return {
+        "hot rows": hot,
+        "admin dashboard ms": timed(lambda: admin.get("/admin/dashboard"), repeat),
+        "admin Resolved filter ms": timed(lambda: admin.get("/admin/dashboard?status_filter=Resolved"), repeat),
+        "student history ms": timed(lambda: student.get("/student/dashboard"), repeat),
+        "GROUP BY status ms": group_by_ms,
+    }
+
+
+def submit_while(running, latencies):
+    rng = random.Random(41)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        while running.is_set():
+            complaint = {
+                "hostel_block": "A Block",
+                "room_number": "101",
+                "category": rng.choice(hostel.ALLOWED_CATEGORIES),
+                "priority": "Medium",
+                "description": "Fan regulator is broken and stuck at full speed.",
+            }
+            started = time.perf_counter()
+            with hostel.immediate_transaction(db):
+                hostel.insert_complaint(db, f"4128{rng.randrange(10**6):06d}", complaint, int(time.time()))
+            latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.005)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=300_000)
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--older-than", type=int, default=365, help="archive complaints resolved this many days ago")
+    parser.add_argument("--batch-size", type=int, default=hostel.app.config["ARCHIVE_BATCH_ROWS"])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    seed(args.rows, args.years)
+
+    before = measure(args.repeat)
+
+    running = threading.Event()
+    running.set()
+    submit_ms = []
+    submitter = threading.Thread(target=submit_while, args=(running, submit_ms))
+    submitter.start()
+    batch_ms = []
+    cutoff = int(time.time()) - args.older_than * 86400
+    started = time.perf_counter()
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        while True:
+            batch_started = time.perf_counter()
+            moved = hostel.archive_complaints_batch(db, cutoff, args.batch_size)
+            batch_ms.append((time.perf_counter() - batch_started) * 1000)
+            if moved < args.batch_size:
+                break
+            time.sleep(hostel.app.config["ARCHIVE_BATCH_PAUSE"])
+        archived = sum(row["complaints"] for row in hostel.get_archive_terms(db))
+    seconds = time.perf_counter() - started
+    running.clear()
+    submitter.join()
+    after = measure(args.repeat)
+
+    print(
+        f"archived {archived} complaints in {seconds:.1f} s ({archived / seconds:.0f}/s), "
+        f"{len(batch_ms)} batches of {args.batch_size}: p50 {statistics.median(batch_ms):.1f} ms, "
+        f"max {max(batch_ms):.1f} ms"
+    )
+    print(
+        f"submissions during archival: {len(submit_ms)}, p50 {statistics.median(submit_ms):.2f} ms, "
+        f"max {max(submit_ms):.2f} ms"
+    )
+    print(f"{'':<26} {'before':>10} {'after':>10}")
+    for name in before:
+        spec = "10d" if name == "hot rows" else "10.2f"
+        print(f"{name:<26} {before[name]:{spec}} {after[name]:{spec}}")
+
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        archived_ms = timed(lambda: hostel.fetch_student_complaints(db, STUDENT_ROLL, include_archived=True), args.repeat)
+        tables = hostel.get_archive_tables(db)
+        page_ms = timed(lambda: hostel.fetch_archived_page(db, tables, [], [], hostel.DEFAULT_PAGE_SIZE), args.repeat)
+    print(f"student history with archive {archived_ms:.2f} ms; archive page over {len(tables)} terms {page_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Automatic staff assignment under a burst of complaints.
+
+Live: ``--burst`` complaints are submitted through the student form from
+``--threads`` threads, with automatic assignment off and then on, on fresh
+databases. Reports submission latency both ways, and with assignment on, the
+time until every complaint had staff and the engine's passes.
+
+Drain: the same burst lands at once on a simulated clock. Each minute the
+engine takes one pass, and every staff member works through their open
+complaints one at a time, highest priority first, taking an exponentially
+distributed ``--service-minutes`` each. Reports the minutes until the backlog
+is resolved and, per priority, the wait until staff were assigned and until
+work started, for each
+``--max-open`` cap and for manual triage every ``--manual-every`` minutes
+(everything waiting handed to the least-loaded skilled staff, no cap; the
+first round comes ``--manual-every`` minutes after the burst).
+
+    python benchmarks/assignment.py --burst 1000 --max-open 2 --max-open 5
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+PRIORITY_WEIGHTS = {"Low": 5, "Medium": 3, "High": 2}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def fresh_database(blocks, staff_per_block, history):
+    """Point the app at a new database with blocks, skilled staff and
+    ``history`` resolved complaints; returns the block names."""
+    hostel.app.config["DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+    rng = random.Random(7)
+    names = [f"{chr(ord('A') + index)} Block" for index in range(blocks)]
+    skills = sorted(set(hostel.DEFAULT_CATEGORY_SKILLS.values()))
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            for block_id, block in enumerate(names, 1):
+                db.execute("INSERT INTO hostel_blocks (id, name) VALUES (?, ?)", (block_id, block))
+                for skill in skills:
+                    for number in range(staff_per_block):
+                        staff_id = db.execute(
+                            "INSERT INTO staff (name, home_block_id) VALUES (?, ?)",
+                            (f"{skill} {block[0]}{number + 1}", block_id),
+                        ).lastrowid
+                        db.execute("INSERT INTO staff_skills (staff_id, skill) VALUES (?, ?)", (staff_id, skill))
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at, updated_at
+                )
+                VALUES (?, ?, '101', ?, ?, 'Resolved long ago.', ?, ?, ?)
+                """,
+                (
+                    (
+                        f"4126{index:06d}",
+                        rng.choice(names),
+                        hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                        hostel.PRIORITY_CODES["Medium"],
+                        hostel.STATUS_CODES["Resolved"],
+                        1704103200 + index,
+                        1704103200 + index,
+                    )
+                    for index in range(history)
+                ),
+            )
+    hostel.invalidate_reference_data()
+    return names
+
+
+def burst_complaints(count, blocks, seed):
+    rng = random.Random(seed)
+    priorities = list(PRIORITY_WEIGHTS)
+    return [
+        {
+            "hostel_block": rng.choice(blocks),
+            "room_number": str(rng.randrange(100, 400)),
+            "category": rng.choice(hostel.ALLOWED_CATEGORIES),
+            "priority": rng.choices(priorities, weights=list(PRIORITY_WEIGHTS.values()))[0],
+            "description": "Reported during the evening outage; needs a visit.",
+        }
+        for _ in range(count)
+    ]
+
+
+def submit_burst(complaints, threads):
+    """Submit through the student form; returns latencies in seconds."""
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(offset):
+        client = hostel.app.test_client()
+        for index in range(offset, len(complaints), threads):
+            with client.session_transaction() as session:
+                session["student_roll"] = f"4127{index:06d}"
+            started = time.perf_counter()
+            response = client.post("/student/dashboard", data=complaints[index])
+            elapsed = time.perf_counter() - started
+            assert response.status_code == 302, response.status_code
+            with lock:
+                latencies.append(elapsed)
+
+    workers = [threading.Thread(target=worker, args=(offset,)) for offset in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies
+
+
+def run_live(args, enabled):
+    blocks = fresh_database(args.blocks, args.staff_per_block, args.history)
+    hostel.app.config["AUTO_ASSIGN_ENABLED"] = enabled
+    # No cap: this run measures how fast complaints get staff, not queueing.
+    hostel.app.config["AUTO_ASSIGN_MAX_OPEN"] = args.burst
+    complaints = burst_complaints(args.burst, blocks, 19)
+    started = time.perf_counter()
+    latencies = submit_burst(complaints, args.threads)
+    submitted = time.perf_counter()
+    line = (
+        f"assignment {'on ' if enabled else 'off'}  submit p50 {percentile(latencies, 0.50) * 1000:6.2f} ms"
+        f"  p95 {percentile(latencies, 0.95) * 1000:6.2f} ms"
+    )
+    if enabled:
+        with hostel.app.app_context():
+            engine = hostel.get_assignment_engine()
+        while engine.stats()["assignments"] < args.burst:
+            time.sleep(0.001)
+        finished = time.perf_counter()
+        stats = engine.stats()
+        line += (
+            f"  all assigned {(finished - submitted) * 1000:6.1f} ms after the last submission"
+            f" ({args.burst / (finished - started):5.0f}/s over the burst, {stats['passes']} passes)"
+        )
+    print(line)
+    hostel.app.config["AUTO_ASSIGN_ENABLED"] = False
+
+
+def run_drain(args, label, max_open, step_every):
+    blocks = fresh_database(args.blocks, args.staff_per_block, args.history)
+    rng = random.Random(31)
+    complaints = burst_complaints(args.burst, blocks, 19)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            for index, complaint in enumerate(complaints):
+                hostel.insert_complaint(db, f"4127{index:06d}", complaint, int(time.time()))
+        rows = db.execute(
+            "SELECT id, priority, hostel_block FROM complaints WHERE status = ?", (hostel.STATUS_CODES["Pending"],)
+        ).fetchall()
+        priority_of = {row["id"]: row["priority"] for row in rows}
+        block_of = {row["id"]: row["hostel_block"] for row in rows}
+        service = {row["id"]: max(1, round(rng.expovariate(1 / args.service_minutes))) for row in rows}
+        home = {member.id: member.home_block for member in hostel.get_reference_data(db).staff.values()}
+
+        conn = hostel.get_pool().connect()
+        engine = hostel.AssignmentEngine(
+            hostel.get_pool(),
+            max_open=max_open,
+            other_block_load=args.other_block_load,
+            poll_seconds=0,
+            batch_rows=hostel.app.config["AUTO_ASSIGN_BATCH_ROWS"],
+        )
+        assigned_at = {}
+        started_at = {}
+        same_block = 0
+        working = {}
+        step_seconds = []
+        minute = 0
+        while True:
+            if minute % step_every == 0 and (minute or step_every == 1):
+                started = time.perf_counter()
+                engine.step(conn)
+                step_seconds.append(time.perf_counter() - started)
+            open_rows = db.execute(
+                "SELECT id, staff_assigned FROM complaints WHERE status IN (?, ?)",
+                (hostel.STATUS_CODES["Pending"], hostel.STATUS_CODES["In Progress"]),
+            ).fetchall()
+            if not open_rows:
+                break
+            queues = {}
+            for row in open_rows:
+                if row["staff_assigned"] is None:
+                    continue
+                if row["id"] not in assigned_at:
+                    assigned_at[row["id"]] = minute
+                    same_block += home[row["staff_assigned"]] == block_of[row["id"]]
+                queues.setdefault(row["staff_assigned"], []).append(row["id"])
+            finished = [complaint_id for complaint_id, done in working.values() if done <= minute]
+            working = {staff: job for staff, job in working.items() if job[1] > minute}
+            started_work = []
+            for staff_id, ids in queues.items():
+                if staff_id in working:
+                    continue
+                ids = [complaint_id for complaint_id in ids if complaint_id not in finished]
+                if ids:
+                    complaint_id = min(ids, key=lambda cid: (-priority_of[cid], cid))
+                    working[staff_id] = (complaint_id, minute + service[complaint_id])
+                    started_work.append(complaint_id)
+                    started_at[complaint_id] = minute
+            with hostel.immediate_transaction(db):
+                if finished:
+                    hostel.apply_complaint_updates(db, finished, {"status": "Resolved"}, int(time.time()))
+                if started_work:
+                    hostel.apply_complaint_updates(db, started_work, {"status": "In Progress"}, int(time.time()))
+            minute += 1
+        conn.close()
+
+    print(f"== {label}")
+    print(f"backlog resolved after {minute} simulated minutes ({minute / 60:.1f} h)")
+    for name, times in [("staff assigned", assigned_at), ("work started", started_at)]:
+        waits = {}
+        for complaint_id, at in times.items():
+            waits.setdefault(priority_of[complaint_id], []).append(at)
+        for priority in reversed(hostel.ALLOWED_PRIORITIES):
+            samples = waits.get(hostel.PRIORITY_CODES[priority], [0])
+            print(
+                f"until {name:<15} {priority:<6}  p50 {percentile(samples, 0.50):5d} min"
+                f"  p95 {percentile(samples, 0.95):5d} min  max {max(samples):5d} min"
+            )
+    print(f"assigned in the complaint's block  {same_block / len(assigned_at):6.1%}")
+    print(
+        f"engine passes  {len(step_seconds)}  mean {statistics.mean(step_seconds) * 1000:.3f} ms"
+        f"  max {max(step_seconds) * 1000:.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", type=int, default=1000, help="complaints filed at once")
+    parser.add_argument("--threads", type=int, default=8, help="submitting threads in the live run")
+    parser.add_argument("--blocks", type=int, default=4)
+    parser.add_argument("--staff-per-block", type=int, default=2, help="staff per skill in each block")
+    parser.add_argument("--history", type=int, default=50_000, help="resolved complaints seeded first")
+    parser.add_argument("--service-minutes", type=float, default=30.0)
+    parser.add_argument("--max-open", type=int, action="append", help="AUTO_ASSIGN_MAX_OPEN values to simulate")
+    parser.add_argument("--other-block-load", type=int, default=hostel.app.config["AUTO_ASSIGN_OTHER_BLOCK_LOAD"])
+    parser.add_argument("--manual-every", type=int, default=30, help="minutes between manual triage rounds")
+    args = parser.parse_args()
+
+    run_live(args, False)
+    run_live(args, True)
+    for max_open in args.max_open or [hostel.app.config["AUTO_ASSIGN_MAX_OPEN"]]:
+        run_drain(args, f"automatic, at most {max_open} open per staff member", max_open, 1)
+    run_drain(args, f"manual triage every {args.manual_every} minutes", args.burst, args.manual_every)
+
+
+if __name__ == "__main__":
+    main()
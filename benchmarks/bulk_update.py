@@ -0,0 +1,107 @@
+"""Compare triaging N complaints one form post at a time (update, redirect,
+re-render the dashboard) with a single bulk-update request.
+
+    python benchmarks/bulk_update.py --complaints 100 --background 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+
+def seed(count):
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.execute("INSERT INTO staff (name) VALUES ('Plumber Kumar')")
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at
+                )
+                VALUES (?, 'C Block', '210', ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        f"4127{index:06d}",
+                        hostel.CATEGORY_CODES[hostel.ALLOWED_CATEGORIES[index % len(hostel.ALLOWED_CATEGORIES)]],
+                        hostel.PRIORITY_CODES["Medium"],
+                        "Synthetic complaint used for benchmarking.",
+                        hostel.STATUS_CODES["Pending"],
+                        hostel.parse_timestamp("2024-01-01 10:00:00"),
+                    )
+                    for index in range(count)
+                ],
+            )
+        return [
+            row["id"]
+            for row in db.execute(
+                "SELECT id FROM complaints WHERE category = ? ORDER BY id", (hostel.CATEGORY_CODES["Water"],)
+            ).fetchall()
+        ]
+
+
+def admin_client():
+    client = hostel.app.test_client()
+    client.post("/admin/register", data={"username": "bench", "password": "bench1234"})
+    client.post("/admin/login", data={"username": "bench", "password": "bench1234"})
+    return client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--complaints", type=int, default=100, help="complaints to triage per flow")
+    parser.add_argument("--background", type=int, default=20_000, help="rows seeded before the run")
+    args = parser.parse_args()
+
+    water_ids = seed(max(args.background, args.complaints * 10))
+    if len(water_ids) < args.complaints * 2:
+        sys.exit("Not enough seeded water complaints; raise --background.")
+    one_by_one, bulk = water_ids[: args.complaints], water_ids[args.complaints : args.complaints * 2]
+    client = admin_client()
+
+    started = time.perf_counter()
+    for complaint_id in one_by_one:
+        response = client.post(
+            "/admin/dashboard",
+            data={
+                "complaint_id": complaint_id,
+                "status": "In Progress",
+                "priority": "High",
+                "staff_assigned": "Plumber Kumar",
+                "remarks": "Outage triage",
+                "category_filter": "Water",
+            },
+            follow_redirects=True,
+        )
+        assert response.status_code == 200
+    single_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    response = client.post(
+        "/admin/complaints/bulk-update",
+        json={
+            "complaint_ids": bulk,
+            "status": "In Progress",
+            "priority": "High",
+            "staff_assigned": "Plumber Kumar",
+            "remarks": "Outage triage",
+        },
+    )
+    bulk_seconds = time.perf_counter() - started
+    assert response.get_json()["updated"] == len(bulk)
+
+    print(f"one-at-a-time: {args.complaints} posts in {single_seconds * 1000:.1f} ms")
+    print(f"bulk:          1 request in {bulk_seconds * 1000:.1f} ms")
+    print(f"speedup:       {single_seconds / bulk_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
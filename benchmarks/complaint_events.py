@@ -0,0 +1,141 @@
+"""Measure what writing complaint_events adds to the admin update path, and
+time the timeline and SLA queries.
+
+Runs single-complaint updates (the dashboard form) and bulk updates with the
+history trigger in place and with it dropped, on the same data.
+
+    python benchmarks/complaint_events.py --rows 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+STAFF = ["Electrician Ravi", "Plumber Kumar", "Mess Supervisor", "Housekeeping Team"]
+
+
+def seed(rows):
+    rng = random.Random(23)
+    start = datetime.now() - timedelta(days=60)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany("INSERT INTO staff (name) VALUES (?)", [(name,) for name in STAFF])
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    (
+                        f"4127{rng.randrange(20_000):06d}",
+                        rng.choice(["A Block", "B Block", "C Block"]),
+                        str(rng.randrange(100, 400)),
+                        hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                        hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+                        "Window latch is broken and the window will not close.",
+                        hostel.STATUS_CODES["Pending"],
+                        int((start + timedelta(minutes=index)).timestamp()),
+                        int((start + timedelta(minutes=index)).timestamp()),
+                    )
+                    for index in range(rows)
+                ),
+            )
+
+
+def run_updates(rng, rows, singles, bulk_runs, bulk_size):
+    """Return (single update latencies, bulk update latencies) in ms."""
+    single_ms = []
+    bulk_ms = []
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        for _ in range(singles):
+            changes = {
+                "status": rng.choice(hostel.ALLOWED_STATUSES),
+                "priority": rng.choice(hostel.ALLOWED_PRIORITIES),
+                "staff_assigned": rng.choice(STAFF),
+                "remarks": "",
+            }
+            started = time.perf_counter()
+            with hostel.immediate_transaction(db):
+                hostel.apply_complaint_updates(db, [rng.randrange(1, rows + 1)], changes, int(time.time()))
+            single_ms.append((time.perf_counter() - started) * 1000)
+        for _ in range(bulk_runs):
+            ids = rng.sample(range(1, rows + 1), bulk_size)
+            changes = {"status": rng.choice(hostel.ALLOWED_STATUSES), "staff_assigned": rng.choice(STAFF)}
+            started = time.perf_counter()
+            with hostel.immediate_transaction(db):
+                hostel.apply_complaint_updates(db, ids, changes, int(time.time()))
+            bulk_ms.append((time.perf_counter() - started) * 1000)
+    return single_ms, bulk_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--singles", type=int, default=500)
+    parser.add_argument("--bulk-runs", type=int, default=20)
+    parser.add_argument("--bulk-size", type=int, default=1000)
+    args = parser.parse_args()
+    seed(args.rows)
+
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        trigger_sql = db.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'complaint_events_update'"
+        ).fetchone()[0]
+
+    results = {}
+    # Alternate the two setups so drift (WAL growth, cache warm-up) hits both.
+    for round_number in range(2):
+        for label in ["without events", "with events"]:
+            with hostel.app.app_context():
+                db = hostel.get_db()
+                with hostel.immediate_transaction(db):
+                    db.execute("DROP TRIGGER IF EXISTS complaint_events_update")
+                    if label == "with events":
+                        db.execute(trigger_sql)
+            single_ms, bulk_ms = run_updates(
+                random.Random(round_number), args.rows, args.singles, args.bulk_runs, args.bulk_size
+            )
+            totals = results.setdefault(label, ([], []))
+            totals[0].extend(single_ms)
+            totals[1].extend(bulk_ms)
+
+    for label, (single_ms, bulk_ms) in results.items():
+        print(
+            f"{label:<15} single update p50 {statistics.median(single_ms):6.3f} ms "
+            f"p95 {statistics.quantiles(single_ms, n=20)[-1]:6.3f} ms   "
+            f"bulk of {args.bulk_size} p50 {statistics.median(bulk_ms):8.2f} ms"
+        )
+
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        events = db.execute("SELECT COUNT(*) FROM complaint_events").fetchone()[0]
+        busiest = db.execute(
+            "SELECT complaint_id FROM complaint_events GROUP BY complaint_id ORDER BY COUNT(*) DESC LIMIT 1"
+        ).fetchone()[0]
+        started = time.perf_counter()
+        timeline = hostel.fetch_complaint_timeline(db, busiest)
+        timeline_ms = (time.perf_counter() - started) * 1000
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        started = time.perf_counter()
+        hostel.build_sla_metrics(db, today - timedelta(days=29), today)
+        sla_ms = (time.perf_counter() - started) * 1000
+    print(f"{events} events; timeline of {len(timeline)} events {timeline_ms:.3f} ms; 30-day SLA {sla_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
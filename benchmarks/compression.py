@@ -0,0 +1,135 @@
+"""Bytes on the wire and modeled load times per page, uncompressed, gzip and
+brotli (when the brotli package is installed).
+
+Server time is measured in-process, compression included. Network time is
+modeled for the campus Wi-Fi profile on a warm keep-alive connection:
+time to first byte is one round trip plus server time, and the rest of the
+body arrives under TCP slow start (10-segment initial window, doubling each
+round trip) capped by the link bandwidth. Static pages also get a row for
+revalidating a cached copy with If-None-Match.
+
+    python benchmarks/compression.py --rtt-ms 40 --bandwidth-mbps 8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+ADMIN_USERNAME = "compression"
+ADMIN_PASSWORD = "compression1234"
+STUDENT_ROLL = "4127000001"
+SEGMENT_BYTES = 1460
+INITIAL_WINDOW_SEGMENTS = 10
+
+
+def seed(rows):
+    rng = random.Random(31)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        STUDENT_ROLL if index < 30 else f"4127{rng.randrange(20_000):06d}",
+                        rng.choice(["A Block", "B Block", "C Block"]),
+                        str(rng.randrange(100, 400)),
+                        hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                        hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+                        "Mess food served cold at dinner; the heater in the serving area is off.",
+                        hostel.STATUS_CODES["Resolved" if index < 30 else rng.choice(hostel.ALLOWED_STATUSES)],
+                        hostel.parse_timestamp("2024-01-01 10:00:00"),
+                    )
+                    for index in range(rows)
+                ],
+            )
+            db.execute(
+                "INSERT INTO admins (username, password_hash, created_at) VALUES (?, ?, '2024-01-01 10:00:00')",
+                (ADMIN_USERNAME, hostel.generate_password_hash(ADMIN_PASSWORD)),
+            )
+
+
+def transfer_seconds(size, rtt, bandwidth):
+    """Seconds from the first byte to the last under slow start."""
+    rounds = 0
+    window = INITIAL_WINDOW_SEGMENTS * SEGMENT_BYTES
+    sent = window
+    while sent < size:
+        rounds += 1
+        window *= 2
+        sent += window
+    return max(rounds * rtt, size * 8 / bandwidth)
+
+
+def measure(client, path, encoding, repeat, etag=None):
+    headers = {"Accept-Encoding": encoding}
+    if etag:
+        headers["If-None-Match"] = etag
+    response = client.get(path, headers=headers)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        client.get(path, headers=headers)
+    server = (time.perf_counter() - started) / repeat
+    return response, server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--rtt-ms", type=float, default=40.0, help="campus Wi-Fi round trip")
+    parser.add_argument("--bandwidth-mbps", type=float, default=8.0, help="per-client Wi-Fi throughput")
+    args = parser.parse_args()
+    rtt = args.rtt_ms / 1000
+    bandwidth = args.bandwidth_mbps * 1_000_000
+    seed(args.rows)
+
+    anonymous = hostel.app.test_client()
+    student = hostel.app.test_client()
+    with student.session_transaction() as session:
+        session["student_roll"] = STUDENT_ROLL
+    admin = hostel.app.test_client()
+    admin.post("/admin/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    routes = [
+        ("index", anonymous, "/", True),
+        ("student_login", anonymous, "/student/login", True),
+        ("admin_login", anonymous, "/admin/login", True),
+        ("stylesheet", anonymous, f"/assets/style.{hostel.STYLE_DIGEST}.css", True),
+        ("student_dashboard", student, "/student/dashboard", False),
+        ("admin_dashboard", admin, "/admin/dashboard?page_size=100", False),
+        ("api complaints", admin, "/api/v1/complaints?page_size=100", False),
+    ]
+    encodings = ["identity", "gzip"] + (["br"] if hostel.brotli is not None else [])
+
+    print(f"Wi-Fi profile: {args.rtt_ms:.0f} ms RTT, {args.bandwidth_mbps:g} Mbit/s")
+    print(f"{'route':<18} {'encoding':<12} {'bytes':>8} {'server ms':>10} {'TTFB ms':>8} {'load ms':>8}")
+    for name, client, path, static in routes:
+        runs = [(encoding, encoding, None) for encoding in encodings]
+        if static:
+            etag = client.get(path, headers={"Accept-Encoding": encodings[-1]}).headers["ETag"]
+            runs.append((f"{encodings[-1]} 304", encodings[-1], etag))
+        for label, encoding, etag in runs:
+            response, server = measure(client, path, encoding, args.repeat, etag)
+            size = len(response.get_data())
+            ttfb = rtt + server
+            load = ttfb + transfer_seconds(size, rtt, bandwidth)
+            print(
+                f"{name:<18} {label:<12} {size:8d} {server * 1000:10.2f} {ttfb * 1000:8.1f} {load * 1000:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
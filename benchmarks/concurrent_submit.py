@@ -0,0 +1,100 @@
+"""Load test for the complaint submission path.
+
+Fires concurrent submissions from the same roll number and checks that exactly
+MAX_ACTIVE_COMPLAINTS of them are stored and that the per-student counter
+matches the table, then reports submit latency percentiles.
+
+    python benchmarks/concurrent_submit.py --threads 32 --rounds 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+FORM = {
+    "hostel_block": "A Block",
+    "room_number": "101",
+    "category": "Water",
+    "priority": "High",
+    "description": "No water supply on the second floor since morning.",
+}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_round(roll_number, threads):
+    clients = []
+    for _ in range(threads):
+        client = hostel.app.test_client()
+        client.post("/student/login", data={"roll_number": roll_number})
+        clients.append(client)
+
+    barrier = threading.Barrier(threads)
+    latencies = []
+    lock = threading.Lock()
+
+    def submit(client):
+        barrier.wait()
+        started = time.perf_counter()
+        response = client.post("/student/dashboard", data=FORM)
+        elapsed = time.perf_counter() - started
+        assert response.status_code == 302, response.status_code
+        with lock:
+            latencies.append(elapsed)
+
+    workers = [threading.Thread(target=submit, args=(client,)) for client in clients]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        stored = db.execute(
+            "SELECT COUNT(*) FROM complaints WHERE roll_number = ?", (roll_number,)
+        ).fetchone()[0]
+        counter = db.execute(
+            "SELECT active FROM student_active_counts WHERE roll_number = ?", (roll_number,)
+        ).fetchone()[0]
+    return latencies, stored, counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32, help="concurrent submits per round")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds, each with a fresh roll number")
+    args = parser.parse_args()
+
+    all_latencies = []
+    failures = 0
+    for round_number in range(args.rounds):
+        roll_number = f"4127{round_number:06d}"
+        latencies, stored, counter = run_round(roll_number, args.threads)
+        all_latencies.extend(latencies)
+        ok = stored == counter == min(args.threads, hostel.MAX_ACTIVE_COMPLAINTS)
+        failures += not ok
+        print(f"round {round_number}: stored={stored} counter={counter} {'ok' if ok else 'VIOLATION'}")
+
+    print(
+        f"submits={len(all_latencies)} "
+        f"p50={percentile(all_latencies, 0.50) * 1000:.2f}ms "
+        f"p95={percentile(all_latencies, 0.95) * 1000:.2f}ms "
+        f"p99={percentile(all_latencies, 0.99) * 1000:.2f}ms "
+        f"mean={statistics.mean(all_latencies) * 1000:.2f}ms"
+    )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
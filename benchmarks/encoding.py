@@ -0,0 +1,157 @@
+"""Compare the size and scan speed of the complaints table with text labels and
+text timestamps against the compact integer encoding from
+migrate_compact_complaints.
+
+    python benchmarks/encoding.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("HOSTEL_DATABASE", os.path.join(tempfile.mkdtemp(), "import.db"))
+
+import app as hostel  # noqa: E402
+
+COMPACT_MIGRATION = hostel.MIGRATIONS.index(hostel.migrate_compact_complaints)
+START = datetime(2021, 1, 1)
+SPAN_DAYS = 4 * 365
+
+QUERIES = {
+    "status filter page": (
+        "SELECT id FROM complaints WHERE status = ? ORDER BY sort_key ASC LIMIT 51",
+        ("In Progress",),
+    ),
+    "count by category": (
+        "SELECT category, COUNT(*) FROM complaints GROUP BY category",
+        (),
+    ),
+    "30-day date range": (
+        "SELECT COUNT(*) FROM complaints WHERE created_at >= ? AND created_at < ?",
+        (START + timedelta(days=600), START + timedelta(days=630)),
+    ),
+    "newest first page": (
+        "SELECT id FROM complaints ORDER BY created_at DESC LIMIT 51",
+        (),
+    ),
+    "full scan filter": (
+        "SELECT COUNT(*) FROM complaints WHERE priority = ? AND status != ?",
+        ("High", "Resolved"),
+    ),
+}
+
+
+def seed(db, rows, students):
+    rng = random.Random(11)
+
+    def complaint():
+        created = START + timedelta(seconds=rng.randrange(SPAN_DAYS * 86400))
+        updated = created + timedelta(hours=rng.randrange(1, 240))
+        return (
+            f"4127{rng.randrange(students):06d}",
+            rng.choice(["A Block", "B Block", "C Block", "D Block"]),
+            str(rng.randrange(100, 400)),
+            rng.choice(hostel.ALLOWED_CATEGORIES),
+            rng.choice(hostel.ALLOWED_PRIORITIES),
+            "Synthetic complaint used for benchmarking.",
+            rng.choices(hostel.ALLOWED_STATUSES, weights=[2, 1, 7])[0],
+            created.strftime(hostel.TIMESTAMP_FORMAT),
+            updated.strftime(hostel.TIMESTAMP_FORMAT),
+        )
+
+    db.executemany(
+        """
+        INSERT INTO complaints (
+            roll_number, hostel_block, room_number, category, priority,
+            description, status, created_at, updated_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (complaint() for _ in range(rows)),
+    )
+    db.commit()
+
+
+def encoded(value):
+    """A query parameter as stored after migrate_compact_complaints."""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    codes = {**hostel.STATUS_CODES, **hostel.CATEGORY_CODES, **hostel.PRIORITY_CODES}
+    return codes.get(value, value)
+
+
+def as_text(value):
+    if isinstance(value, datetime):
+        return value.strftime(hostel.TIMESTAMP_FORMAT)
+    return value
+
+
+def table_size(db):
+    """Bytes used by the complaints table and by its indexes."""
+    rows = db.execute(
+        """
+        SELECT name = 'complaints', SUM(pgsize)
+        FROM dbstat
+        WHERE name IN (SELECT name FROM sqlite_master WHERE tbl_name = 'complaints')
+        GROUP BY 1
+        """
+    ).fetchall()
+    sizes = dict(rows)
+    return sizes.get(1, 0), sizes.get(0, 0)
+
+
+def report(db, label, rows, repeat, encode):
+    db.execute("VACUUM")
+    table, indexes = table_size(db)
+    print(f"== {label}")
+    print(f"table    {table / 2**20:9.1f} MiB  {table / rows:6.1f} B/row")
+    print(f"indexes  {indexes / 2**20:9.1f} MiB  {indexes / rows:6.1f} B/row")
+    timings = {}
+    for name, (query, params) in QUERIES.items():
+        params = tuple(map(encoded if encode else as_text, params))
+        db.execute(query, params).fetchall()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            db.execute(query, params).fetchall()
+        timings[name] = (time.perf_counter() - started) * 1000 / repeat
+        print(f"{name:<20} {timings[name]:9.3f} ms")
+    return table + indexes, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    db = sqlite3.connect(path, isolation_level=None)
+    # Seed the original schema: the triggers added later already read the code tables.
+    hostel.run_migrations(db, target=1)
+    db.execute("BEGIN")
+    seed(db, args.rows, args.students)
+    hostel.run_migrations(db, target=COMPACT_MIGRATION)
+    text_bytes, text_ms = report(
+        db, f"text (schema version {COMPACT_MIGRATION}, {args.rows} rows)", args.rows, args.repeat, False
+    )
+
+    started = time.perf_counter()
+    version = hostel.run_migrations(db)
+    print(f"migration to schema version {version}: {time.perf_counter() - started:.1f} s")
+    compact_bytes, compact_ms = report(db, f"compact (schema version {version})", args.rows, args.repeat, True)
+
+    print("== compact vs text")
+    print(f"{'size':<20} {compact_bytes / text_bytes:9.2f}x")
+    for name in QUERIES:
+        print(f"{name:<20} {text_ms[name] / compact_ms[name]:9.2f}x speedup")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Stream complaint exports of growing size and report throughput and peak
+Python memory, to check that memory stays flat as the row count grows.
+
+    python benchmarks/export.py --rows 1000 --rows 100000 --rows 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+
+def seed(total):
+    """Top the complaints table up to ``total`` rows."""
+    rng = random.Random(5)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        existing = db.execute("SELECT COUNT(*) FROM complaints").fetchone()[0]
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, remarks, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, '', ?)
+                """,
+                (
+                    (
+                        f"4127{rng.randrange(10_000):06d}",
+                        rng.choice(["A Block", "B Block", "C Block"]),
+                        str(rng.randrange(100, 400)),
+                        hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                        hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+                        "Tap in the corridor bathroom has been leaking since Monday.",
+                        hostel.STATUS_CODES[rng.choice(hostel.ALLOWED_STATUSES)],
+                        hostel.parse_timestamp(f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} 10:00:00"),
+                    )
+                    for _ in range(total - existing)
+                ),
+            )
+
+
+def export(export_format, compress):
+    with hostel.app.app_context():
+        chunks = hostel.iter_complaint_export(
+            hostel.get_db(), export_format, [], [], hostel.app.config["EXPORT_BATCH_ROWS"]
+        )
+        encoded = (chunk.encode("utf-8") for chunk in chunks)
+        size = 0
+        for chunk in hostel.gzip_chunks(encoded) if compress else encoded:
+            size += len(chunk)
+        return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, action="append", help="export sizes (repeatable)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'format':<10} {'MiB out':>8} {'rows/s':>10} {'peak KiB':>9}")
+    for rows in sorted(args.rows or [1000, 100_000]):
+        seed(rows)
+        for export_format, compress in [("csv", False), ("csv", True), ("jsonl", False)]:
+            tracemalloc.start()
+            started = time.perf_counter()
+            size = export(export_format, compress)
+            seconds = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            label = export_format + (".gz" if compress else "")
+            print(
+                f"{rows:>9} {label:<10} {size / 2**20:8.2f} {rows / seconds:10.0f} {peak / 1024:9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Sustained submission throughput and latency with and without group commit.
+
+Every virtual user logs in with its own roll number and submits complaints
+back to back, so the active-complaint limit never rejects anything.
+
+    python benchmarks/group_commit.py --users 64 --per-user 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "import.db")
+
+import app as hostel  # noqa: E402
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(group_commit, users, per_user):
+    hostel.app.config["DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+    hostel.app.config["GROUP_COMMIT_ENABLED"] = group_commit
+    hostel.app.config["DB_POOL_SIZE"] = users
+    with hostel.app.app_context():
+        hostel.init_db()
+
+    clients = []
+    for index in range(users):
+        client = hostel.app.test_client()
+        client.post("/student/login", data={"roll_number": f"4127{index:06d}"})
+        clients.append(client)
+
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(users + 1)
+
+    def user(client):
+        barrier.wait()
+        for number in range(per_user):
+            started = time.perf_counter()
+            response = client.post(
+                "/student/dashboard",
+                data={
+                    "hostel_block": "B Block",
+                    "room_number": "204",
+                    "category": "Food",
+                    "priority": "High",
+                    "description": f"Mess food made students sick, report {number}.",
+                },
+            )
+            elapsed = time.perf_counter() - started
+            assert response.status_code == 302
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=user, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    with hostel.app.app_context():
+        stored = hostel.get_db().execute("SELECT COUNT(*) FROM complaints").fetchone()[0]
+    assert stored == users * per_user, stored
+    label = "group commit" if group_commit else "per-request commit"
+    print(
+        f"{label:<20} {len(latencies) / wall:8.1f} submits/s  "
+        f"p50={percentile(latencies, 0.50) * 1000:7.2f}ms  "
+        f"p99={percentile(latencies, 0.99) * 1000:7.2f}ms"
+    )
+    if group_commit:
+        print(f"{'':<20} writer: {hostel.get_writer().stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--per-user", type=int, default=4)
+    args = parser.parse_args()
+    if args.per_user > hostel.MAX_ACTIVE_COMPLAINTS:
+        sys.exit(f"--per-user must be at most {hostel.MAX_ACTIVE_COMPLAINTS}")
+    run(False, args.users, args.per_user)
+    run(True, args.users, args.per_user)
+
+
+if __name__ == "__main__":
+    main()
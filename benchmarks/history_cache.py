@@ -0,0 +1,115 @@
+"""Student dashboard latency with the history cache off, in process memory
+and in a shared file, under a refresh-heavy load.
+
+A few students refresh far more often than the rest, and a share of the
+requests are admin updates to a random complaint, which invalidate that
+student's cached history.
+
+    python benchmarks/history_cache.py --students 2000 --requests 20000 --write-share 0.02
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+
+def roll(student):
+    return f"4127{student:06d}"
+
+
+def seed(students, per_student):
+    rng = random.Random(43)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        roll(student),
+                        rng.choice(["A Block", "B Block", "C Block"]),
+                        str(rng.randrange(100, 400)),
+                        hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                        hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+                        "Bathroom door lock is broken and the door does not close.",
+                        hostel.STATUS_CODES[rng.choice(hostel.ALLOWED_STATUSES)],
+                        hostel.parse_timestamp("2024-01-01 10:00:00"),
+                    )
+                    for student in range(students)
+                    for _ in range(per_student)
+                ],
+            )
+        return db.execute("SELECT MAX(id) FROM complaints").fetchone()[0]
+
+
+def run(backend, args, last_id):
+    hostel.app.config["HISTORY_CACHE_BACKEND"] = backend
+    hostel.reset_process_state()
+    rng = random.Random(47)
+    clients = {}
+    latencies = []
+    # Zipf-like popularity: student k is picked with weight 1 / (k + 1).
+    weights = [1 / (student + 1) for student in range(args.students)]
+    picks = rng.choices(range(args.students), weights=weights, k=args.requests)
+    for student in picks:
+        if rng.random() < args.write_share:
+            with hostel.app.app_context():
+                db = hostel.get_db()
+                with hostel.immediate_transaction(db):
+                    hostel.apply_complaint_updates(
+                        db,
+                        [rng.randrange(1, last_id + 1)],
+                        {"remarks": f"checked {rng.randrange(10**6)}"},
+                        hostel.parse_timestamp("2024-01-02 10:00:00"),
+                    )
+            continue
+        client = clients.get(student)
+        if client is None:
+            client = clients[student] = hostel.app.test_client()
+            with client.session_transaction() as session:
+                session["student_roll"] = roll(student)
+        started = time.perf_counter()
+        client.get("/student/dashboard")
+        latencies.append((time.perf_counter() - started) * 1000)
+    with hostel.app.app_context():
+        cache = hostel.get_history_cache()
+        stats = cache.stats() if cache is not None else {}
+    return latencies, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--per-student", type=int, default=20, help="complaints in each history")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--write-share", type=float, default=0.02)
+    args = parser.parse_args()
+    last_id = seed(args.students, args.per_student)
+
+    print(f"{'backend':<8} {'p50 ms':>8} {'p95 ms':>8} {'hit ratio':>10} {'entries':>8} {'KiB':>8}")
+    for backend in ["none", "memory", "file"]:
+        latencies, stats = run(backend, args, last_id)
+        ratio = stats.get("hit_ratio")
+        print(
+            f"{backend:<8} {statistics.median(latencies):8.3f} {statistics.quantiles(latencies, n=20)[-1]:8.3f} "
+            f"{'-' if ratio is None else f'{ratio:.3f}':>10} {stats.get('entries', 0):>8} "
+            f"{stats.get('bytes', 0) / 1024:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
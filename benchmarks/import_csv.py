@@ -0,0 +1,108 @@
+"""Measure `flask import-complaints` throughput in rows per second, against
+inserting the same rows one transaction at a time.
+
+    python benchmarks/import_csv.py --rows 200000
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+
+def write_csv(path, rows, invalid_share):
+    rng = random.Random(3)
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(hostel.IMPORT_COLUMNS)
+        for _ in range(rows):
+            category = rng.choice(hostel.ALLOWED_CATEGORIES)
+            if rng.random() < invalid_share:
+                category = "Unknown"
+            created_at = f"20{rng.randrange(15, 24)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} 09:30:00"
+            writer.writerow(
+                [
+                    f"4127{rng.randrange(20_000):06d}",
+                    rng.choice(["A Block", "B Block", "C Block"]),
+                    str(rng.randrange(100, 400)),
+                    category,
+                    rng.choice(hostel.ALLOWED_PRIORITIES),
+                    "Ceiling fan makes a loud noise and stops at high speed.",
+                    rng.choice(hostel.ALLOWED_STATUSES),
+                    "",
+                    "",
+                    created_at,
+                    created_at,
+                ]
+            )
+
+
+def row_at_a_time(path, limit):
+    """The old route: insert_complaint (triggers and all) per row, one commit each."""
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        reference = hostel.get_reference_data(db)
+        with open(path, newline="", encoding="utf-8") as handle:
+            for number, record in enumerate(csv.DictReader(handle)):
+                if number == limit:
+                    break
+                complaint, error = hostel.validate_complaint(record, reference)
+                if error:
+                    continue
+                with hostel.immediate_transaction(db):
+                    # Legacy rows are not subject to the active-complaint limit.
+                    db.execute("DELETE FROM student_active_counts")
+                    hostel.insert_complaint(
+                        db, record["roll_number"], complaint, hostel.parse_timestamp(record["created_at"])
+                    )
+    return limit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--baseline-rows", type=int, default=5000, help="rows for the one-at-a-time run")
+    parser.add_argument("--invalid-share", type=float, default=0.01)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "legacy.csv")
+    write_csv(path, args.rows, args.invalid_share)
+    with hostel.app.app_context():
+        hostel.init_db()
+
+    started = time.perf_counter()
+    row_at_a_time(path, args.baseline_rows)
+    seconds = time.perf_counter() - started
+    print(f"one row per transaction  {args.baseline_rows:>9} rows  {args.baseline_rows / seconds:10.0f} rows/s")
+
+    # The first import outnumbers the table, so its indexes are rebuilt at the
+    # end; the second is smaller than the table and updates them in place.
+    for number, label in enumerate(["import, indexes rebuilt", "import, indexes kept"]):
+        # A second name for the file, since an imported file is not imported twice.
+        copy = os.path.join(directory, f"legacy-{number}.csv")
+        os.link(path, copy)
+        with hostel.app.app_context():
+            started = time.perf_counter()
+            result = hostel.import_complaints(
+                hostel.get_db(),
+                copy,
+                hostel.app.config["IMPORT_BATCH_ROWS"],
+                os.path.join(directory, "rejected.csv"),
+            )
+            seconds = time.perf_counter() - started
+        print(
+            f"{label:<24} {result['records_read']:>9} rows  {result['records_read'] / seconds:10.0f} rows/s"
+            f"  ({result['rejected']} rejected)"
+        )
+
+
+if __name__ == "__main__":
+    main()
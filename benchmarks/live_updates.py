@@ -0,0 +1,292 @@
+"""Open dashboards against a real gunicorn server: live streams versus
+change-version polling.
+
+Starts `gunicorn -c gunicorn.conf.py wsgi:app` on a seeded temporary database
+and opens ``--clients`` real connections, as that many open admin dashboards
+would:
+
+- stream: each client holds GET /admin/events open, as the dashboards did
+  with EventSource
+- poll: each client polls GET /admin/changes every ``--poll-seconds`` with
+  If-None-Match, as the dashboards do now
+
+With the clients connected it reports the server's threads and resident
+memory, the latency of a dashboard request from one more user, and after a
+complaint is updated from outside the workers (as another worker or the
+archiver would) how many clients learned of it within ``--wait`` seconds.
+
+    python benchmarks/live_updates.py --workers 2 --threads 4 --clients 64
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import selectors
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+ADMIN_USERNAME = "live"
+ADMIN_PASSWORD = "live1234"
+
+
+def seed(rows):
+    rng = random.Random(59)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at, updated_at
+                )
+                VALUES (?, 'A Block', '101', ?, ?, 'Mess water cooler is not cooling.', ?, ?, ?)
+                """,
+                (
+                    (
+                        f"4127{rng.randrange(20_000):06d}",
+                        hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                        hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+                        hostel.STATUS_CODES["Pending"],
+                        1704103200 + index,
+                        1704103200 + index,
+                    )
+                    for index in range(rows)
+                ),
+            )
+            db.execute(
+                "INSERT INTO admins (username, password_hash, created_at) VALUES (?, ?, '2024-01-01 10:00:00')",
+                (ADMIN_USERNAME, hostel.generate_password_hash(ADMIN_PASSWORD)),
+            )
+    hostel.close_pools()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, workers, threads):
+    env = dict(
+        os.environ,
+        HOSTEL_BIND=f"127.0.0.1:{port}",
+        HOSTEL_WORKERS=str(workers),
+        HOSTEL_THREADS=str(threads),
+        SECRET_KEY="live-updates-benchmark",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("gunicorn did not start; is it installed (pip install gunicorn)?")
+
+
+def login(port):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    conn.request(
+        "POST",
+        "/admin/login",
+        body=urllib.parse.urlencode({"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}),
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    response = conn.getresponse()
+    response.read()
+    conn.close()
+    cookie = response.getheader("Set-Cookie", "").split(";", 1)[0]
+    if not cookie:
+        raise RuntimeError(f"admin login failed with HTTP {response.status}")
+    return cookie
+
+
+def server_usage(server):
+    """Threads and resident MiB of the gunicorn master and its workers (Linux)."""
+    pids = [server.pid]
+    try:
+        with open(f"/proc/{server.pid}/task/{server.pid}/children") as handle:
+            pids += [int(pid) for pid in handle.read().split()]
+        threads = rss_kib = 0
+        for pid in pids:
+            with open(f"/proc/{pid}/status") as handle:
+                fields = dict(line.split(":", 1) for line in handle)
+            threads += int(fields["Threads"])
+            rss_kib += int(fields["VmRSS"].split()[0])
+    except OSError:
+        return None, None
+    return threads, rss_kib / 1024
+
+
+def dashboard_latency(port, cookie, timeout):
+    """Seconds for one more user's dashboard request, None if it timed out."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    started = time.perf_counter()
+    try:
+        conn.request("GET", "/admin/dashboard", headers={"Cookie": cookie})
+        response = conn.getresponse()
+        response.read()
+        return time.perf_counter() - started if response.status == 200 else None
+    except OSError:
+        return None
+    finally:
+        conn.close()
+
+
+def touch_complaint():
+    """Update a complaint straight in the database, outside every worker."""
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            hostel.apply_complaint_updates(db, [1], {"status": "In Progress"}, int(time.time()))
+    hostel.close_pools()
+
+
+def run_streams(port, cookie, args):
+    selector = selectors.DefaultSelector()
+    request = f"GET /admin/events HTTP/1.1\r\nHost: 127.0.0.1\r\nCookie: {cookie}\r\n\r\n".encode()
+    received = {}
+    for _ in range(args.clients):
+        sock = socket.create_connection(("127.0.0.1", port))
+        sock.sendall(request)
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ)
+        received[sock] = b""
+
+    def read_for(seconds):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for key, _ in selector.select(max(0.0, deadline - time.monotonic())):
+                try:
+                    chunk = key.fileobj.recv(65536)
+                except OSError:
+                    chunk = b""
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                received[key.fileobj] += chunk
+
+    read_for(args.settle)
+    served = sum(1 for data in received.values() if data.startswith(b"HTTP/1.1 200"))
+    threads, rss = server_usage(args.server)
+    latency = dashboard_latency(port, cookie, args.wait)
+    touch_complaint()
+    read_for(args.wait)
+    notified = sum(1 for data in received.values() if b"event: updated" in data)
+    for sock in received:
+        sock.close()
+    return served, threads, rss, latency, notified, None
+
+
+def run_polls(port, cookie, args):
+    running = threading.Event()
+    running.set()
+    start_version = hostel_version()
+    lock = threading.Lock()
+    latencies = []
+    notified = set()
+
+    def client(index):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=args.wait)
+        etag = None
+        # Spread the clients over the interval, as pages opened at different times are.
+        time.sleep(args.poll_seconds * index / args.clients)
+        while running.is_set():
+            headers = {"Cookie": cookie}
+            if etag:
+                headers["If-None-Match"] = etag
+            started = time.perf_counter()
+            conn.request("GET", "/admin/changes", headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+            elapsed = time.perf_counter() - started
+            if response.status == 200:
+                etag = response.getheader("ETag")
+                if json.loads(body)["version"] != start_version:
+                    with lock:
+                        notified.add(index)
+            with lock:
+                latencies.append(elapsed)
+            time.sleep(args.poll_seconds)
+        conn.close()
+
+    clients = [threading.Thread(target=client, args=(index,)) for index in range(args.clients)]
+    for thread in clients:
+        thread.start()
+    time.sleep(args.settle + args.poll_seconds)
+    threads, rss = server_usage(args.server)
+    latency = dashboard_latency(port, cookie, args.wait)
+    touch_complaint()
+    time.sleep(args.wait)
+    running.clear()
+    for thread in clients:
+        thread.join()
+    latencies.sort()
+    poll_ms = (statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95) - 1] * 1000)
+    return args.clients, threads, rss, latency, len(notified), poll_ms
+
+
+def hostel_version():
+    with hostel.app.app_context():
+        version = hostel.get_change_version(hostel.get_db(), "complaints")
+    hostel.close_pools()
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    parser.add_argument("--clients", type=int, default=64, help="open dashboards")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--poll-seconds", type=float, default=2.0, help="poll interval, shortened from LIVE_POLL_SECONDS")
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds to let the clients connect")
+    parser.add_argument("--wait", type=float, default=5.0, help="seconds to wait for a request or a notification")
+    args = parser.parse_args()
+    seed(args.rows)
+
+    print(
+        f"{args.workers} workers x {args.threads} threads, {args.clients} open dashboards, "
+        f"polling every {args.poll_seconds:g}s"
+    )
+    print(f"{'mode':<7} {'served':>7} {'threads':>8} {'RSS MiB':>8} {'dashboard':>11} {'notified':>9} {'poll p50/p95 ms':>16}")
+    for mode, run in [("stream", run_streams), ("poll", run_polls)]:
+        port = free_port()
+        args.server = start_server(port, args.workers, args.threads)
+        try:
+            cookie = login(port)
+            served, threads, rss, latency, notified, poll_ms = run(port, cookie, args)
+        finally:
+            args.server.terminate()
+            args.server.wait()
+        print(
+            f"{mode:<7} {served:>7} {threads or '-':>8} {rss or 0:8.1f} "
+            f"{'timed out' if latency is None else f'{latency * 1000:.1f} ms':>11} "
+            f"{notified:>4}/{args.clients:<4} "
+            f"{'-' if poll_ms is None else f'{poll_ms[0]:.2f}/{poll_ms[1]:.2f}':>16}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Reproducible load test for the main routes.
+
+Seeds a database with synthetic students and complaints, then drives each
+scenario with concurrent virtual users through Flask's test client and prints
+a JSON report (throughput, latency percentiles, SQL vs template time, response
+sizes) that can be diffed between commits.
+
+    python benchmarks/load.py --complaints 50000 --users 16 --requests 50 --output load.json
+
+By default a fresh temporary database is used. Pass --database to seed a
+specific file, for example a copy of hostel_complaints.db.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("HOSTEL_DATABASE", os.path.join(tempfile.mkdtemp(), "import.db"))
+
+import app as hostel  # noqa: E402
+from flask import before_render_template, template_rendered  # noqa: E402
+
+ADMIN_USERNAME = "loadtest"
+ADMIN_PASSWORD = "loadtest123"
+timings = threading.local()
+
+
+def reset_timings():
+    timings.sql = 0.0
+    timings.render = 0.0
+
+
+class TimedConnection(sqlite3.Connection):
+    """Accumulates time spent in execute/executemany (the first row step,
+    not later fetches) for the current thread's request."""
+
+    def execute(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().execute(*args, **kwargs)
+        finally:
+            timings.sql = getattr(timings, "sql", 0.0) + time.perf_counter() - started
+
+    def executemany(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().executemany(*args, **kwargs)
+        finally:
+            timings.sql = getattr(timings, "sql", 0.0) + time.perf_counter() - started
+
+
+def on_before_render(sender, template, context, **extra):
+    timings.render_started = time.perf_counter()
+
+
+def on_rendered(sender, template, context, **extra):
+    timings.render = getattr(timings, "render", 0.0) + time.perf_counter() - timings.render_started
+
+
+def seed(args):
+    rng = random.Random(args.seed)
+    blocks = [f"{chr(ord('A') + index)} Block" for index in range(args.blocks)]
+    weights = [float(part) for part in args.status_mix.split(",")]
+    rows = []
+    for _ in range(args.complaints):
+        rows.append(
+            (
+                f"4127{rng.randrange(args.students):06d}",
+                rng.choice(blocks),
+                str(rng.randrange(100, 500)),
+                hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+                "Synthetic load-test complaint with enough detail to look real.",
+                hostel.STATUS_CODES[rng.choices(hostel.ALLOWED_STATUSES, weights=weights)[0]],
+                hostel.parse_timestamp("2024-01-01 10:00:00"),
+            )
+        )
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+    client = hostel.app.test_client()
+    client.post("/admin/register", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+
+
+def student_client(roll_number):
+    client = hostel.app.test_client()
+    with client.session_transaction() as session:
+        session["student_roll"] = roll_number
+    return client
+
+
+def admin_client():
+    client = hostel.app.test_client()
+    client.post("/admin/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    return client
+
+
+def scenarios(args):
+    rng = random.Random(args.seed + 1)
+    filters = [{}] + [{"status_filter": status} for status in hostel.ALLOWED_STATUSES]
+    filters += [{"category_filter": category} for category in hostel.ALLOWED_CATEGORIES]
+    fresh_roll = iter(range(10**9))
+    fresh_lock = threading.Lock()
+
+    def new_roll():
+        with fresh_lock:
+            return f"4128{next(fresh_roll):08d}"
+
+    def student_login(user):
+        client = hostel.app.test_client()
+        return lambda: client.post(
+            "/student/login", data={"roll_number": f"4127{rng.randrange(args.students):06d}"}
+        )
+
+    def student_dashboard_get(user):
+        client = student_client(f"4127{user % args.students:06d}")
+        return lambda: client.get("/student/dashboard")
+
+    def student_dashboard_post(user):
+        def submit():
+            # A new roll number per submit keeps the active-complaint limit out of the way.
+            client = student_client(new_roll())
+            return client.post(
+                "/student/dashboard",
+                data={
+                    "hostel_block": "A Block",
+                    "room_number": "101",
+                    "category": rng.choice(hostel.ALLOWED_CATEGORIES),
+                    "priority": rng.choice(hostel.ALLOWED_PRIORITIES),
+                    "description": "Load-test submission describing a broken fixture.",
+                },
+            )
+
+        return submit
+
+    def admin_login(user):
+        client = hostel.app.test_client()
+        return lambda: client.post(
+            "/admin/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}
+        )
+
+    def admin_dashboard(user):
+        client = admin_client()
+        return lambda: client.get("/admin/dashboard", query_string=rng.choice(filters))
+
+    return {
+        "student_login": student_login,
+        "student_dashboard_get": student_dashboard_get,
+        "student_dashboard_post": student_dashboard_post,
+        "admin_login": admin_login,
+        "admin_dashboard": admin_dashboard,
+    }
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_scenario(make_request, users, requests_per_user):
+    samples = []
+    errors = 0
+    lock = threading.Lock()
+    barrier = threading.Barrier(users + 1)
+
+    def virtual_user(user):
+        nonlocal errors
+        request = make_request(user)
+        barrier.wait()
+        for _ in range(requests_per_user):
+            reset_timings()
+            started = time.perf_counter()
+            response = request()
+            elapsed = time.perf_counter() - started
+            sample = (elapsed, timings.sql, timings.render, len(response.get_data()))
+            with lock:
+                samples.append(sample)
+                if response.status_code >= 400:
+                    errors += 1
+
+    threads = [threading.Thread(target=virtual_user, args=(user,)) for user in range(users)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    latencies = [sample[0] for sample in samples]
+    count = len(samples)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / wall, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(max(latencies) * 1000, 3),
+        },
+        "mean_sql_ms": round(sum(sample[1] for sample in samples) / count * 1000, 3),
+        "mean_render_ms": round(sum(sample[2] for sample in samples) / count * 1000, 3),
+        "mean_response_bytes": round(sum(sample[3] for sample in samples) / count),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", help="database file to seed (default: new temporary file)")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--complaints", type=int, default=20000)
+    parser.add_argument("--blocks", type=int, default=6)
+    parser.add_argument("--status-mix", default="30,20,50", help="Pending,In Progress,Resolved weights")
+    parser.add_argument("--users", type=int, default=8, help="concurrent virtual users")
+    parser.add_argument("--requests", type=int, default=50, help="requests per virtual user")
+    parser.add_argument("--scenario", action="append", help="run only these scenarios")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--auth-limits", action="store_true", help="keep the admin login rate limits in place"
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    hostel.app.config["DATABASE"] = args.database or os.path.join(tempfile.mkdtemp(), "load.db")
+    hostel.app.config["DB_CONNECTION_FACTORY"] = TimedConnection
+    hostel.app.config["DB_POOL_SIZE"] = max(hostel.app.config["DB_POOL_SIZE"], args.users)
+    if not args.auth_limits:
+        # Every virtual user logs in from the same address as the same admin;
+        # lift the login throttle so admin_login measures the hashing path.
+        for key in ("ADMIN_AUTH_IP_BURST", "ADMIN_AUTH_USER_BURST"):
+            hostel.app.config[key] = 10**9
+    with hostel.app.app_context():
+        hostel.init_db()
+    seed(args)
+    before_render_template.connect(on_before_render, hostel.app)
+    template_rendered.connect(on_rendered, hostel.app)
+
+    available = scenarios(args)
+    selected = args.scenario or list(available)
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "parameters": {
+            key: value for key, value in vars(args).items() if key not in {"output", "database"}
+        },
+        "scenarios": {},
+    }
+    for name in selected:
+        report["scenarios"][name] = run_scenario(available[name], args.users, args.requests)
+        print(f"{name}: {report['scenarios'][name]['throughput_rps']} req/s", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
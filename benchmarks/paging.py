@@ -0,0 +1,151 @@
+"""Walk the admin complaint list and the archive page by page and check the
+keyset cursors.
+
+Seeds complaints over a year and a half and archives the resolved ones older
+than ``--older-than`` days. Every page reached with Next is left with Prev and
+re-entered with Next; both moves must land on the same rows, and the forward
+walk must visit every complaint exactly once in display order. Also times the
+first, middle and last page to show a page costs the same at any depth.
+
+    python benchmarks/paging.py --rows 100000 --page-size 50
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+
+def seed(rows, older_than, batch_rows):
+    rng = random.Random(53)
+    span = 540 * 86400
+    started = int(time.time()) - span
+    step = max(1, span // rows)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at, updated_at
+                )
+                VALUES (?, 'A Block', '101', ?, ?, 'Synthetic complaint used for benchmarking.', ?, ?, ?)
+                """,
+                (
+                    (
+                        f"4127{rng.randrange(20_000):06d}",
+                        hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                        hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+                        hostel.STATUS_CODES[rng.choice(hostel.ALLOWED_STATUSES)],
+                        started + index * step,
+                        started + index * step,
+                    )
+                    for index in range(rows)
+                ),
+            )
+            hostel.rebuild_complaint_rollups(db)
+            db.execute("DELETE FROM student_active_counts")
+        return hostel.archive_complaints(db, older_than, batch_rows)
+
+
+def walk(name, fetch_page, expected):
+    """Page forward through ``fetch_page(after=, before=)`` with a Prev/Next
+    round trip on every page; returns the number of mismatches."""
+    failures = 0
+    seen = []
+    pages = []
+    rows, prev_cursor, next_cursor = fetch_page()
+    while True:
+        ids = [row["id"] for row in rows]
+        pages.append(ids)
+        seen.extend(ids)
+        if len(pages) > 1:
+            back, _, forward = fetch_page(before=prev_cursor)
+            if [row["id"] for row in back] != pages[-2]:
+                failures += 1
+                print(f"{name}: Prev from page {len(pages)} did not return page {len(pages) - 1}")
+            again, _, _ = fetch_page(after=forward)
+            if [row["id"] for row in again] != ids:
+                failures += 1
+                print(f"{name}: Next after Prev from page {len(pages)} did not return it")
+        if next_cursor is None:
+            break
+        rows, prev_cursor, next_cursor = fetch_page(after=next_cursor)
+    if seen != expected:
+        failures += 1
+        print(f"{name}: the forward walk saw {len(seen)} rows, expected {len(expected)} in order")
+    print(f"{name}: {len(pages)} pages, {len(seen)} rows, {'ok' if not failures else f'{failures} FAILURES'}")
+    return failures, pages
+
+
+def time_pages(name, fetch_page, cursors, repeat):
+    for label, cursor in cursors:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fetch_page(after=cursor)
+        print(f"{name} {label:<12} {(time.perf_counter() - started) * 1000 / repeat:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--older-than", type=int, default=180, help="archive complaints resolved this many days ago")
+    args = parser.parse_args()
+    archived = seed(args.rows, args.older_than, hostel.app.config["ARCHIVE_BATCH_ROWS"])
+    print(f"seeded {args.rows} complaints, archived {archived}")
+
+    columns = ", ".join(hostel.COMPLAINT_COLUMNS)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+
+        def complaint_page(after=None, before=None):
+            return hostel.fetch_complaint_page(db, columns, [], [], args.page_size, after=after, before=before)
+
+        expected = [row["id"] for row in db.execute("SELECT id FROM complaints ORDER BY sort_key")]
+        failures, pages = walk("complaints", complaint_page, expected)
+        sort_keys = dict(db.execute("SELECT id, sort_key FROM complaints").fetchall())
+        time_pages(
+            "complaints",
+            complaint_page,
+            [
+                ("first page", None),
+                ("middle page", sort_keys[pages[len(pages) // 2][0]]),
+                ("last page", sort_keys[pages[-1][0]]),
+            ],
+            args.repeat,
+        )
+
+        tables = hostel.get_archive_tables(db)
+
+        def archived_page(after=None, before=None):
+            return hostel.fetch_archived_page(db, tables, [], [], args.page_size, after=after, before=before)
+
+        expected = sorted(
+            (row[0] for table in tables for row in db.execute(f"SELECT id FROM {table}")), reverse=True
+        )
+        archive_failures, pages = walk("archive", archived_page, expected)
+        failures += archive_failures
+        time_pages(
+            "archive",
+            archived_page,
+            [
+                ("first page", None),
+                ("middle page", pages[len(pages) // 2][0] + 1),
+                ("last page", pages[-1][0] + 1),
+            ],
+            args.repeat,
+        )
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Show query plans and timings for the hot complaint queries before and after
+the index migration.
+
+    python benchmarks/query_plans.py --rows 100000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("HOSTEL_DATABASE", os.path.join(tempfile.mkdtemp(), "import.db"))
+
+import app as hostel  # noqa: E402
+
+INDEX_MIGRATION = hostel.MIGRATIONS.index(hostel.migrate_query_indexes)
+
+QUERIES = {
+    "student history": (
+        """
+        SELECT id, hostel_block, room_number, category, priority, description, status,
+               staff_assigned, remarks, created_at, updated_at
+        FROM complaints
+        WHERE roll_number = ?
+        ORDER BY id DESC
+        """,
+        ("4127000042",),
+    ),
+    "active count": (
+        """
+        SELECT COUNT(*) AS total
+        FROM complaints
+        WHERE roll_number = ? AND status IN (?, ?)
+        """,
+        ("4127000042", "Pending", "In Progress"),
+    ),
+    "admin status filter": (
+        "SELECT id FROM complaints WHERE status = ? ORDER BY sort_key ASC LIMIT 51",
+        ("In Progress",),
+    ),
+    "admin category filter": (
+        "SELECT id FROM complaints WHERE category = ? ORDER BY sort_key ASC LIMIT 51",
+        ("Water",),
+    ),
+    "admin priority filter": (
+        "SELECT id FROM complaints WHERE priority = ? ORDER BY sort_key ASC LIMIT 51",
+        ("High",),
+    ),
+}
+
+
+def seed(db, rows, students):
+    random.seed(7)
+    batch = []
+    for _ in range(rows):
+        batch.append(
+            (
+                f"4127{random.randrange(students):06d}",
+                random.choice(["A Block", "B Block", "C Block", "D Block"]),
+                str(random.randrange(100, 400)),
+                random.choice(hostel.ALLOWED_CATEGORIES),
+                random.choice(hostel.ALLOWED_PRIORITIES),
+                "Synthetic complaint used for benchmarking.",
+                random.choices(hostel.ALLOWED_STATUSES, weights=[2, 1, 7])[0],
+                "2024-01-01 10:00:00",
+            )
+        )
+    db.executemany(
+        """
+        INSERT INTO complaints (
+            roll_number, hostel_block, room_number, category, priority,
+            description, status, created_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        batch,
+    )
+    db.commit()
+
+
+def encoded(params):
+    """Label parameters as the codes complaints stores since migrate_compact_complaints."""
+    codes = {**hostel.STATUS_CODES, **hostel.CATEGORY_CODES, **hostel.PRIORITY_CODES}
+    return tuple(codes.get(value, value) for value in params)
+
+
+def report(db, label, repeat, encode=False):
+    print(f"== {label}")
+    for name, (query, params) in QUERIES.items():
+        if encode:
+            params = encoded(params)
+        plan = db.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            db.execute(query, params).fetchall()
+        elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+        print(f"{name:<24} {elapsed_ms:8.3f} ms")
+        for row in plan:
+            print(f"    {row[3]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--students", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    db = sqlite3.connect(path)
+    hostel.run_migrations(db, target=INDEX_MIGRATION)
+    seed(db, args.rows, args.students)
+    report(db, f"before (schema version {INDEX_MIGRATION}, {args.rows} rows)", args.repeat)
+    version = hostel.run_migrations(db)
+    report(db, f"after (schema version {version})", args.repeat, encode=True)
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Compare per-request template cost and response size: compiling the page
+source on every call with inline CSS (the old render_template_string path)
+versus the precompiled template registry with the hashed stylesheet.
+
+    python benchmarks/render.py --rows 50 --repeat 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+from flask import session  # noqa: E402
+
+
+def sample_rows(count):
+    return [
+        {
+            "id": index,
+            "hostel_block": "A Block",
+            "room_number": str(100 + index),
+            "category": hostel.ALLOWED_CATEGORIES[index % len(hostel.ALLOWED_CATEGORIES)],
+            "priority": hostel.ALLOWED_PRIORITIES[index % 3],
+            "description": "Synthetic complaint used for benchmarking.",
+            "status": hostel.ALLOWED_STATUSES[index % 3],
+            "staff_assigned": "Electrician Ravi",
+            "remarks": "",
+            "created_at": 1704103200,
+            "updated_at": 1704103200,
+        }
+        for index in range(count)
+    ]
+
+
+def page_contexts(rows):
+    complaints = sample_rows(rows)
+    return {
+        "index.html": {},
+        "student_login.html": {},
+        "admin_login.html": {},
+        "admin_register.html": {},
+        "student_dashboard.html": {
+            "roll_number": "4127000001",
+            "categories": hostel.ALLOWED_CATEGORIES,
+            "blocks": ["A Block", "B Block", "C Block"],
+            "priorities": hostel.ALLOWED_PRIORITIES,
+            "max_active": hostel.MAX_ACTIVE_COMPLAINTS,
+            "max_description": hostel.MAX_DESCRIPTION_LENGTH,
+            "complaints": complaints,
+        },
+        "admin_dashboard.html": {
+            "complaints": complaints,
+            "summary": {"Pending": 1, "In Progress": 1, "Resolved": 1},
+            "statuses": hostel.ALLOWED_STATUSES,
+            "priorities": hostel.ALLOWED_PRIORITIES,
+            "categories": hostel.ALLOWED_CATEGORIES,
+            "staff": [hostel.StaffMember(1, "Electrician Ravi", 1, 1, "A Block", ["Electrical"])],
+            "status_filter": "All",
+            "category_filter": "All",
+            "priority_filter": "All",
+            "page_sizes": hostel.PAGE_SIZE_OPTIONS,
+            "page_size": hostel.DEFAULT_PAGE_SIZE,
+            "after": None,
+            "before": None,
+            "prev_cursor": None,
+            "next_cursor": None,
+        },
+    }
+
+
+def timed(render, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = render()
+    return (time.perf_counter() - started) * 1000 / repeat, len(body.encode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50, help="complaint rows on dashboards")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    env = hostel.app.jinja_env
+    link_tag = '<link rel="stylesheet" href="{{ url_for(\'stylesheet\', digest=style_digest) }}">'
+    inline_base = hostel.TEMPLATES["base.html"].replace(link_tag, "<style>{{ style }}</style>")
+
+    print(f"{'template':<24} {'before ms':>10} {'after ms':>10} {'before B':>10} {'after B':>10}")
+    with hostel.app.test_request_context("/"):
+        session["admin_username"] = "bench"
+        for name, context in page_contexts(args.rows).items():
+            # "Before": every call re-parses and compiles the full page source.
+            page_source = hostel.TEMPLATES[name].replace(
+                '{% extends "base.html" %}', "{% extends inline_base %}"
+            )
+            inline_template = env.from_string(inline_base)
+
+            def before():
+                return env.from_string(page_source).render(
+                    inline_base=inline_template, style=hostel.STYLE, **context
+                )
+
+            template = env.get_template(name)
+
+            def after():
+                return template.render(**context)
+
+            before_ms, before_bytes = timed(before, args.repeat)
+            after_ms, after_bytes = timed(after, args.repeat)
+            print(
+                f"{name:<24} {before_ms:>10.3f} {after_ms:>10.3f} "
+                f"{before_bytes:>10} {after_bytes:>10}"
+            )
+    print(f"stylesheet: {len(hostel.STYLE_BYTES)} bytes, fetched once per client and cached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Throughput of the admin and student dashboards under the production
+launcher (gunicorn, pre-fork) as the worker count grows.
+
+Starts `gunicorn -c gunicorn.conf.py wsgi:app` once per worker count on a
+seeded temporary database and drives each dashboard with keep-alive HTTP
+clients spread over several client processes. The clients share the machine
+with the server, so leave some cores for them when reading the numbers.
+
+    python benchmarks/scaling.py --workers 1 --workers 2 --workers 4 --duration 10
+"""
+import argparse
+import concurrent.futures
+import http.client
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+ADMIN_USERNAME = "scaling"
+ADMIN_PASSWORD = "scaling1234"
+STUDENT_ROLL = "4127000001"
+
+
+def seed(rows):
+    rng = random.Random(29)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        STUDENT_ROLL if index < 20 else f"4127{rng.randrange(20_000):06d}",
+                        rng.choice(["A Block", "B Block", "C Block"]),
+                        str(rng.randrange(100, 400)),
+                        hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                        hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+                        "Water heater in the shared bathroom trips the breaker.",
+                        hostel.STATUS_CODES["Resolved" if index < 20 else rng.choice(hostel.ALLOWED_STATUSES)],
+                        hostel.parse_timestamp("2024-01-01 10:00:00"),
+                    )
+                    for index in range(rows)
+                ],
+            )
+            db.execute(
+                "INSERT INTO admins (username, password_hash, created_at) VALUES (?, ?, '2024-01-01 10:00:00')",
+                (ADMIN_USERNAME, hostel.generate_password_hash(ADMIN_PASSWORD)),
+            )
+    hostel.close_pools()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, workers, threads):
+    env = dict(
+        os.environ,
+        HOSTEL_BIND=f"127.0.0.1:{port}",
+        HOSTEL_WORKERS=str(workers),
+        HOSTEL_THREADS=str(threads),
+        SECRET_KEY="scaling-benchmark",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("gunicorn did not start; is it installed (pip install gunicorn)?")
+
+
+def login(port, path, form):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request(
+        "POST",
+        path,
+        body=urllib.parse.urlencode(form),
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    response = conn.getresponse()
+    response.read()
+    cookie = response.getheader("Set-Cookie", "").split(";", 1)[0]
+    conn.close()
+    if not cookie:
+        raise RuntimeError(f"login to {path} failed with HTTP {response.status}")
+    return cookie
+
+
+def client_process(port, path, cookie, connections, duration):
+    """Run ``connections`` keep-alive clients for ``duration`` seconds."""
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def run():
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        mine = []
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            conn.request("GET", path, headers={"Cookie": cookie})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f"{path} returned HTTP {response.status}")
+            mine.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=run) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def drive(port, path, cookie, client_processes, connections, duration):
+    with concurrent.futures.ProcessPoolExecutor(client_processes) as executor:
+        per_process = max(1, connections // client_processes)
+        futures = [
+            executor.submit(client_process, port, path, cookie, per_process, duration)
+            for _ in range(client_processes)
+        ]
+        latencies = [value for future in futures for value in future.result()]
+    latencies.sort()
+    return {
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, action="append", help="worker counts to try (repeatable)")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--client-processes", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per route and worker count")
+    args = parser.parse_args()
+    worker_counts = sorted(args.workers or {1, 2, 4, os.cpu_count() or 1})
+
+    seed(args.rows)
+    print(f"{'workers':>7} {'route':<18} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    baseline = {}
+    for workers in worker_counts:
+        port = free_port()
+        server = start_server(port, workers, args.threads)
+        try:
+            routes = {
+                "admin_dashboard": (
+                    "/admin/dashboard",
+                    login(port, "/admin/login", {"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD}),
+                ),
+                "student_dashboard": (
+                    "/student/dashboard",
+                    login(port, "/student/login", {"roll_number": STUDENT_ROLL}),
+                ),
+            }
+            for name, (path, cookie) in routes.items():
+                result = drive(port, path, cookie, args.client_processes, args.connections, args.duration)
+                baseline.setdefault(name, result["rps"])
+                print(
+                    f"{workers:>7} {name:<18} {result['rps']:9.1f} {result['rps'] / baseline[name]:7.2f}x "
+                    f"{result['p50_ms']:8.2f} {result['p99_ms']:8.2f}"
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
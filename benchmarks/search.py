@@ -0,0 +1,104 @@
+"""Compare FTS5 search with a LIKE '%...%' scan over complaint descriptions
+and remarks.
+
+    python benchmarks/search.py --rows 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+
+WORDS = (
+    "fan light switch socket tube wire fuse water tap leak pipe tank motor bucket "
+    "food rice curry mess hygiene stale bathroom drain shower flush door window "
+    "bed cupboard lock wifi noise cleaning broken not working since yesterday"
+).split()
+RARE = ["geyser", "inverter", "ventilator", "cockroach"]
+
+
+def description(rng):
+    words = rng.choices(WORDS, k=rng.randrange(8, 20))
+    if rng.random() < 0.01:
+        words.insert(rng.randrange(len(words)), rng.choice(RARE))
+    return " ".join(words).capitalize() + "."
+
+
+def seed(rows):
+    rng = random.Random(11)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        with hostel.immediate_transaction(db):
+            db.executemany(
+                """
+                INSERT INTO complaints (
+                    roll_number, hostel_block, room_number, category, priority,
+                    description, status, remarks, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        f"4127{rng.randrange(10_000):06d}",
+                        rng.choice(["A Block", "B Block", "C Block"]),
+                        str(rng.randrange(100, 400)),
+                        hostel.CATEGORY_CODES[rng.choice(hostel.ALLOWED_CATEGORIES)],
+                        hostel.PRIORITY_CODES[rng.choice(hostel.ALLOWED_PRIORITIES)],
+                        description(rng),
+                        hostel.STATUS_CODES[rng.choice(hostel.ALLOWED_STATUSES)],
+                        "",
+                        hostel.parse_timestamp("2024-01-01 10:00:00"),
+                    )
+                    for _ in range(rows)
+                ],
+            )
+
+
+def timed(run, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows = run()
+    return (time.perf_counter() - started) * 1000 / repeat, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    seed(args.rows)
+
+    columns = ", ".join(hostel.COMPLAINT_COLUMNS)
+    with hostel.app.app_context():
+        db = hostel.get_db()
+        reference = hostel.get_reference_data(db)
+        for term, category in [("geyser", None), ("geyser", "Water"), ("leak", None)]:
+            where_clauses, params, _ = hostel.build_complaint_filters(reference, "All", category or "All", "All")
+
+            def fts():
+                return hostel.search_complaints(db, term, where_clauses, params, 50)[0]
+
+            def like():
+                query = f"SELECT {columns} FROM complaints WHERE (description LIKE ? OR remarks LIKE ?)"
+                for clause in where_clauses:
+                    query += f" AND {clause}"
+                query += " ORDER BY id DESC LIMIT 51"
+                return db.execute(query, [f"%{term}%", f"%{term}%", *params]).fetchall()
+
+            fts_ms, fts_rows = timed(fts, args.repeat)
+            like_ms, like_rows = timed(like, args.repeat)
+            label = f"{term!r}" + (f" in {category}" if category else "")
+            print(
+                f"{label:<20} fts5 {fts_ms:8.3f} ms ({fts_rows} rows)   "
+                f"LIKE {like_ms:8.3f} ms ({like_rows} rows)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Measure memory per idle live-stream subscriber and the cost of fanning one
+event out to all of them.
+
+Each simulated client is a real /admin/events response generator, started
+and parked at its first yield the way an idle connection would be. Memory for
+the server's socket and worker is not included; benchmarks/live_updates.py
+opens real connections against gunicorn.
+
+    python benchmarks/sse_subscribers.py --subscribers 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["HOSTEL_DATABASE"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+
+import app as hostel  # noqa: E402
+from flask import session  # noqa: E402
+
+
+def open_streams(count):
+    streams = []
+    for index in range(count):
+        category = hostel.ALLOWED_CATEGORIES[index % len(hostel.ALLOWED_CATEGORIES)]
+        with hostel.app.test_request_context(f"/admin/events?category_filter={category}"):
+            session["admin_id"] = 1
+            response = hostel.admin_events()
+        stream = iter(response.response)
+        next(stream)
+        streams.append((response, stream))
+    return streams
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    args = parser.parse_args()
+    hostel.app.config["SSE_MAX_SUBSCRIBERS"] = args.subscribers
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    streams = open_streams(args.subscribers)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_subscriber = (current - baseline) / args.subscribers
+    print(f"subscribers:    {hostel.event_hub.stats()['subscribers']}")
+    print(f"memory:         {(current - baseline) / 1024 / 1024:.2f} MiB total, {per_subscriber:.0f} B per subscriber")
+
+    event = {
+        "type": "updated",
+        "roll_number": "4127000001",
+        "changed": ["status"],
+        "complaint": {"id": 1, "category": "Water", "status": "Resolved", "priority": "High"},
+    }
+    started = time.perf_counter()
+    hostel.event_hub.publish([event])
+    publish_ms = (time.perf_counter() - started) * 1000
+    print(f"publish:        {publish_ms:.2f} ms to fan out one event")
+    print(f"delivered:      {hostel.event_hub.stats()['delivered']} (subscribers filtered on Water)")
+
+    for response, _ in streams:
+        response.close()
+    print(f"after close:    {hostel.event_hub.stats()['subscribers']} subscribers")
+
+
+if __name__ == "__main__":
+    main()
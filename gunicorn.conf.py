@@ -0,0 +1,33 @@
+"""Gunicorn settings for the production launcher.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+HOSTEL_BIND, HOSTEL_WORKERS and HOSTEL_THREADS override the address, the
+number of worker processes (default: one per CPU) and threads per worker.
+HOSTEL_SSE_MAX_STREAMS overrides the open event streams allowed per worker
+(default: half its threads). HOSTEL_PROXY_HOPS is the number of reverse
+proxies in front (default: 1 on a loopback address, 0 otherwise).
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get("HOSTEL_BIND", "127.0.0.1:8000")
+workers = int(os.environ.get("HOSTEL_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("HOSTEL_THREADS", "4"))
+# A loopback bind is only reachable through a reverse proxy on this host, so
+# trust its X-Forwarded-For: the login limiter then sees client addresses.
+os.environ.setdefault("HOSTEL_PROXY_HOPS", "1" if bind.startswith(("127.", "localhost", "[::1]")) else "0")
+worker_class = "gthread"
+# An open /student/events or /admin/events stream holds one of its worker's
+# threads until the client disconnects, so streams are capped below the thread
+# count and page requests always find a free thread; streams past the cap get
+# a 503. The dashboards poll instead of streaming, so this only limits API
+# clients: workers x HOSTEL_SSE_MAX_STREAMS streams in all.
+os.environ.setdefault("HOSTEL_SSE_MAX_STREAMS", str(threads // 2))
+# Import the app once in the master: the schema check and template
+# compilation run there, then workers fork and open their own pools.
+preload_app = True
+# Event streams send a keepalive every SSE_KEEPALIVE_SECONDS.
+timeout = 60
+graceful_timeout = 30
+accesslog = os.environ.get("HOSTEL_ACCESS_LOG")